@@ -1,10 +1,17 @@
 import os
+import json
 import shutil
+import argparse
+from utils.artifact_store import ArtifactStore, ARTIFACT_STORE_DIR, format_size
+
+# Marks a folder in the reset config that is kept with all of its content
+KEPT_FOLDER = "kept"
 
 def reset_folders(config, base_path="."):
     """
     Resets the directory structure based on the provided config dictionary.
-    Deletes all files and subdirectories except for specified files and folders.
+    Deletes all files and subdirectories except for specified files and folders. Folders marked
+    KEPT_FOLDER are created if missing but never cleared.
 
     Parameters:
         config (dict): Dictionary defining folder structure and files/folders to keep.
@@ -28,6 +35,8 @@ def reset_folders(config, base_path="."):
 
             # Recursively process subdirectories AFTER preserving files
             reset_folders(content, folder_path)
+        elif content == KEPT_FOLDER:
+            os.makedirs(folder_path, exist_ok=True)
         elif content is None:  # It's a file
             os.makedirs(os.path.dirname(folder_path), exist_ok=True)
 
@@ -62,28 +71,54 @@ def clear_folder(folder_path, keep_files, keep_folders):
             print(f"Deleting folder: {item_path}")
             shutil.rmtree(item_path)
 
-if __name__ == "__main__":
-    
-    config = {
-        "data": {
-            "processed": {},  
-            "raw": {
-                "raw_match_data.json": None
-            }
-        },
-        "outputs": {
-            "statistics": {},
-            "team_data": {},
-            "visualizations": {},
-            "scouter_leaderboard": {}
+# Folder layout restored by --wipe (files listed here are kept)
+RESET_CONFIG = {
+    "data": {
+        "processed": {},
+        "raw": {
+            "raw_match_data.json": None
         },
-        "config": {
-            "data_generation_config_default_values_config.json": None,
-            "expected_data_structure.json": None
-        }
+        "artifacts": KEPT_FOLDER  # stored generations, pipeline state and caches; garbage-collected with --keep
+    },
+    "outputs": {
+        "statistics": {},
+        "team_data": {},
+        "visualizations": {},
+        "scouter_leaderboard": {}
+    },
+    "config": {
+        "data_generation_config_default_values_config.json": None,
+        "expected_data_structure.json": None
     }
+}
+
+def report_garbage_collection(report, dry_run=False):
+    """Prints kept/removed generations and sizes per stage, and the totals."""
+    verb = "Would free" if dry_run else "Freed"
+    for stage, stats in report.items():
+        print(f"{stage}: kept {stats['kept']} ({format_size(stats['kept_bytes'])}), "
+              f"removed {stats['removed']} ({verb.lower()} {format_size(stats['freed_bytes'])})")
+    kept_bytes = sum(stats["kept_bytes"] for stats in report.values())
+    freed_bytes = sum(stats["freed_bytes"] for stats in report.values())
+    print(f"Artifact store: {format_size(kept_bytes)} kept. {verb} {format_size(freed_bytes)}.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Garbage-collect the artifact store, keeping the latest generations of every stage's outputs."
+    )
+    parser.add_argument("--keep", type=int, default=3, help="Generations to keep per stage (0 empties the store).")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed.")
+    parser.add_argument("--store", default=ARTIFACT_STORE_DIR, help="Artifact store directory.")
+    parser.add_argument("--wipe", action="store_true",
+                        help="Also clear the data and output folders (the old full reset); the artifact store is kept.")
+    args = parser.parse_args(argv)
+
+    report = ArtifactStore(args.store).collect_garbage(keep=args.keep, dry_run=args.dry_run)
+    report_garbage_collection(report, args.dry_run)
+
+    if args.wipe and not args.dry_run:
+        print("Config being used:", json.dumps(RESET_CONFIG, indent=4))
+        reset_folders(RESET_CONFIG)
 
-    import json
-    print("Config being used:", json.dumps(config, indent=4))
-
-    reset_folders(config)
+if __name__ == "__main__":
+    main()
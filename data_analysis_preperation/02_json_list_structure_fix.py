@@ -1,37 +1,41 @@
-import json
 import os
 import traceback
+from utils.json_streaming import JsonRecordReader, JsonArrayWriter
+
+def report_damaged_records(damaged):
+    """Prints a warning for every damaged record that was skipped."""
+    for record in damaged:
+        print(f"[WARNING] Skipped damaged record at byte {record['offset']} ({record['length']} bytes): {record['error']}")
 
 def fix_json_structure(filepath):
     """
     Fixes improperly formatted JSON files where multiple root objects exist
     without being enclosed in a list.
+
+    Accepts a JSON array, NDJSON, or root objects concatenated with any (or no) whitespace
+    between them. Damaged records are reported and skipped instead of failing the whole file.
     """
-    with open(filepath, "r") as infile:
-        content = infile.read().strip()
-        
-        # Ensure the content is formatted as a JSON array
-        if not content.startswith("["):
-            content = "[" + content.replace("}\n{", "},{") + "]"
-        
-        try:
-            json_data = json.loads(content)
-            return json_data
-        except json.JSONDecodeError as e:
-            print(f"[ERROR] JSON Fix Failed: {e}")
-            return None
+    reader = JsonRecordReader(filepath)
+    json_data = list(reader)
+    report_damaged_records(reader.damaged)
+
+    if not json_data and reader.damaged:
+        print("[ERROR] JSON Fix Failed: no record could be decoded")
+        return None
+    return json_data
 
 def save_fixed_json(filepath, output_path):
-    """Reads, fixes, and saves the reformatted JSON."""
+    """Reads, fixes, and saves the reformatted JSON, streaming records straight to the output file."""
     try:
-        fixed_json = fix_json_structure(filepath)
-        if fixed_json is None:
-            raise ValueError("Failed to fix JSON file.")
+        reader = JsonRecordReader(filepath)
+        with JsonArrayWriter(output_path) as writer:
+            for record in reader:
+                writer.write(record)
+        report_damaged_records(reader.damaged)
 
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w") as outfile:
-            json.dump(fixed_json, outfile, indent=4)
-        print(f"[INFO] Fixed JSON saved to {output_path}")
+        if not writer.count and reader.damaged:
+            raise ValueError("Failed to fix JSON file.")
+        print(f"[INFO] Fixed JSON saved to {output_path} ({writer.count} records, {len(reader.damaged)} damaged)")
     except Exception as e:
         print(f"[ERROR] Unexpected error: {e}")
         print(traceback.format_exc())
@@ -1,39 +1,37 @@
 import json
+from utils.raw_preparation import compile_schema, format_entry
 
-# Load the expected data structure to identify valid keys
-with open("config/expected_data_structure.json", "r") as f:
-    expected_structure = json.load(f)
+EXPECTED_DATA_STRUCTURE_PATH = "config/expected_data_structure.json"
+INPUT_PATH = "data/raw/matchapps_data.json"
+OUTPUT_PATH = "data/raw/formatted_match_data.json"
 
-metadata_keys = set(expected_structure["metadata"].keys())
-variable_keys = set(expected_structure["variables"].keys())
 
-# Load the input JSON data
-with open("data/raw/matchapps_data.json", "r") as f:
-    input_data = json.load(f)
+def format_entries(input_data, expected_structure):
+    """
+    Regroups raw entries so expected metadata fields sit under "metadata" and variables under "variables",
+    following the full nested schema (nested or dotted keys such as "autoCoral.L1" are both accepted).
+    """
+    schema = compile_schema(expected_structure)
+    return [format_entry(entry, schema) for entry in input_data]
 
-# Process each entry in the input data
-formatted_data = []
-for entry in input_data:
-    formatted_entry = {"metadata": {}, "variables": {}}
 
-    # Extract metadata fields
-    for key in metadata_keys:
-        if key in entry["metadata"]:
-            formatted_entry["metadata"][key] = entry["metadata"][key]
+def main():
+    # Load the expected data structure to identify valid keys
+    with open(EXPECTED_DATA_STRUCTURE_PATH, "r") as f:
+        expected_structure = json.load(f)
 
-    # Extract variable fields and group them under "variables"
-    for key in variable_keys:
-        if key in entry:
-            formatted_entry["variables"][key] = entry[key]
+    # Load the input JSON data
+    with open(INPUT_PATH, "r") as f:
+        input_data = json.load(f)
 
-    # Preserve `_id` if needed
-    if "_id" in entry:
-        formatted_entry["_id"] = entry["_id"]
+    formatted_data = format_entries(input_data, expected_structure)
 
-    formatted_data.append(formatted_entry)
+    # Save the transformed data to a new JSON file
+    with open(OUTPUT_PATH, "w") as f:
+        json.dump(formatted_data, f, indent=4)
 
-# Save the transformed data to a new JSON file
-with open("data/raw/formatted_match_data.json", "w") as f:
-    json.dump(formatted_data, f, indent=4)
+    print("Conversion complete! The formatted data is saved in 'formatted_match_data.json'.")
 
-print("Conversion complete! The formatted data is saved in 'formatted_match_data.json'.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import argparse
+from utils.raw_preparation import (
+    EXPECTED_DATA_STRUCTURE_PATH,
+    RAW_EXPORT_PATH,
+    FORMATTED_MATCH_DATA_PATH,
+    prepare_raw_data
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Extract matchApp entries, fix the list structure and regroup fields in one pass over the raw export."
+    )
+    parser.add_argument("--input", default=RAW_EXPORT_PATH,
+                        help="Raw export: an app wrapper object, a JSON array, NDJSON or concatenated entries.")
+    parser.add_argument("--output", default=FORMATTED_MATCH_DATA_PATH, help="Formatted match data output file.")
+    parser.add_argument("--expected-structure", default=EXPECTED_DATA_STRUCTURE_PATH)
+    args = parser.parse_args(argv)
+
+    result = prepare_raw_data(args.input, args.output, args.expected_structure)
+
+    for record in result["damaged"]:
+        print(f"[WARNING] Skipped damaged record at byte {record['offset']} ({record['length']} bytes): {record['error']}")
+    print(f"[INFO] {result['entries']} formatted entries saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
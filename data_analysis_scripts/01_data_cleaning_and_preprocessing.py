@@ -1,9 +1,12 @@
+import sys
 import json
+import argparse
 import os
 import traceback
 from utils.seperation_bars import seperation_bar, small_seperation_bar
 from utils.dictionary_manipulation import *
 from utils.logging import log_message
+from utils.script_loader import cached_until_changed
 
 # ===========================
 # CONFIGURATION
@@ -14,11 +17,7 @@ EXPECTED_DATA_STRUCTURE_PATH = 'config/expected_data_structure.json'
 RAW_MATCH_DATA_PATH = "data/raw/formatted_match_data.json"
 CLEANED_MATCH_DATA_PATH = "data/processed/cleaned_match_data.json"
 
-# Load Expected Data Structure
-EXPECTED_DATA_STRUCTURE_DICT = retrieve_json(EXPECTED_DATA_STRUCTURE_PATH)
-
-# Flatten expected variable structure for easy validation
-FLATTENED_EXPECTED_VARIABLES = flatten_vars_in_dict(EXPECTED_DATA_STRUCTURE_DICT["variables"])
+# The expected data structure is loaded on first use (see expected_data_structure), not at import time
 
 # Configurable options
 SHOW_WARNINGS = True
@@ -29,6 +28,16 @@ VOID_MISSING_ENTRIES = True
 # HELPER FUNCTIONS
 # ===========================
 
+@cached_until_changed(EXPECTED_DATA_STRUCTURE_PATH)
+def expected_data_structure():
+    """Loads the expected data structure on first use, and again whenever the file changes."""
+    return retrieve_json(EXPECTED_DATA_STRUCTURE_PATH)
+
+@cached_until_changed(EXPECTED_DATA_STRUCTURE_PATH)
+def flattened_expected_variables():
+    """Flattened expected variable structure for easy validation."""
+    return flatten_vars_in_dict(expected_data_structure()["variables"])
+
 def log_warning(warnings, scouter_warnings, message, scouter=None):
     """Logs a warning and associates it with the scouter."""
     warnings.append(message)
@@ -130,7 +139,7 @@ def validate_and_clean_entry(warnings, voided_entries, entry):
 
     # Validate Metadata
     if "metadata" in entry:
-        validated_metadata = validate_structure(warnings, entry["metadata"], EXPECTED_DATA_STRUCTURE_DICT.get("metadata", {}), scouter)
+        validated_metadata = validate_structure(warnings, entry["metadata"], expected_data_structure().get("metadata", {}), scouter)
         if validated_metadata is None:
             log_voided_entry(voided_entries, entry, "Metadata contained missing or incorrect keys.")
             return None  # Entry is voided
@@ -139,7 +148,7 @@ def validate_and_clean_entry(warnings, voided_entries, entry):
     # Flatten Variables and Validate
     if "variables" in entry:
         flat_variables = flatten_vars_in_dict(entry["variables"])
-        validated_variables = validate_structure(warnings, flat_variables, FLATTENED_EXPECTED_VARIABLES, scouter)
+        validated_variables = validate_structure(warnings, flat_variables, flattened_expected_variables(), scouter)
 
         if validated_variables is None:
             log_voided_entry(voided_entries, entry, "Variables contained missing or incorrect keys.")
@@ -150,38 +159,59 @@ def validate_and_clean_entry(warnings, voided_entries, entry):
     return validated_entry
 
 
+def clean_entries(raw_data):
+    """
+    Validates and cleans a list of formatted entries in memory.
+
+    :return: Tuple of (cleaned entries, warnings, voided entries).
+    """
+    if not isinstance(raw_data, list):
+        raise ValueError("Raw data must be a list of matches.")
+
+    warnings = []
+    voided_entries = []
+    cleaned_data = []
+    for entry in raw_data:
+        cleaned_entry = validate_and_clean_entry(warnings, voided_entries, entry)
+        if cleaned_entry is not None:
+            cleaned_data.append(cleaned_entry)
+
+    return cleaned_data, warnings, voided_entries
+
+def save_cleaned_data(cleaned_data, cleaned_path=CLEANED_MATCH_DATA_PATH):
+    """Saves cleaned entries to the cleaned match data file."""
+    os.makedirs(os.path.dirname(cleaned_path), exist_ok=True)
+    with open(cleaned_path, "w") as outfile:
+        json.dump(cleaned_data, outfile, indent=4)
+
+
 # ===========================
 # MAIN SCRIPT
 # ===========================
 
-def main():
-    warnings = []
-    voided_entries = []
+def main(argv=None):
+    """Cleans the raw match data. Returns 0 on success and 1 on failure."""
+    parser = argparse.ArgumentParser(description="Clean and validate the formatted match data entries.")
+    parser.add_argument("--input", default=RAW_MATCH_DATA_PATH, help="Formatted match data to clean.")
+    parser.add_argument("--output", default=CLEANED_MATCH_DATA_PATH, help="Where to write the cleaned entries.")
+    args = parser.parse_args(argv)
 
     seperation_bar()
+    exit_code = 0
     log_message("INFO", "Script 01: Data Cleaning and Preprocessing Started")
 
     try:
         small_seperation_bar("LOAD DATA")
-        log_message("INFO", f"Loading raw data from: {RAW_MATCH_DATA_PATH}")
+        log_message("INFO", f"Loading raw data from: {args.input}")
 
-        with open(RAW_MATCH_DATA_PATH, "r") as infile:
+        with open(args.input, "r") as infile:
             raw_data = json.load(infile)
 
-        if not isinstance(raw_data, list):
-            raise ValueError("Raw data must be a list of matches.")
-
-        cleaned_data = []
-        for entry in raw_data:
-            cleaned_entry = validate_and_clean_entry(warnings, voided_entries, entry)
-            if cleaned_entry is not None:
-                cleaned_data.append(cleaned_entry)
+        cleaned_data, warnings, voided_entries = clean_entries(raw_data)
 
         small_seperation_bar("SAVE CLEANED DATA")
-        log_message("INFO", f"Saving cleaned data to: {CLEANED_MATCH_DATA_PATH}")
-        os.makedirs(os.path.dirname(CLEANED_MATCH_DATA_PATH), exist_ok=True)
-        with open(CLEANED_MATCH_DATA_PATH, "w") as outfile:
-            json.dump(cleaned_data, outfile, indent=4)
+        log_message("INFO", f"Saving cleaned data to: {args.output}")
+        save_cleaned_data(cleaned_data, args.output)
 
         log_message("INFO", f"Total warnings/errors: {len(warnings)}")
         log_message("INFO", f"Voided Entries: {len(voided_entries)}")
@@ -191,9 +221,11 @@ def main():
         log_message("ERROR", f"An unexpected error occurred: {e}")
         print(traceback.format_exc())
         log_message("ERROR", "Script 01: Failed")
+        exit_code = 1
 
     seperation_bar()
+    return exit_code
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,5 +1,7 @@
 import os
+import sys
 import json
+import argparse
 import traceback
 from utils.seperation_bars import seperation_bar, small_seperation_bar
 from utils.logging import log_message
@@ -17,6 +19,33 @@ TEAM_BASED_MATCH_DATA_PATH = "data/processed/team_based_match_data.json"  # Outp
 # HELPER FUNCTIONS
 # ===========================
 
+def group_matches_by_team(cleaned_data):
+    """
+    Groups cleaned match entries by team, in memory.
+
+    :param cleaned_data: List of cleaned match entries.
+    :return: Dictionary of team -> {"matches": [...]}.
+    """
+    if not isinstance(cleaned_data, list):
+        raise ValueError("Cleaned data must be a list of matches.")
+
+    team_data = {}
+    for match in cleaned_data:
+        team = match["metadata"]["robotTeam"]
+
+        if team not in team_data:
+            team_data[team] = {"matches": []}
+
+        team_data[team]["matches"].append(match)
+
+    return team_data
+
+def save_team_based_data(team_data, team_file_path=TEAM_BASED_MATCH_DATA_PATH):
+    """Saves team-based match data."""
+    os.makedirs(os.path.dirname(team_file_path), exist_ok=True)
+    with open(team_file_path, 'w') as outfile:
+        json.dump(team_data, outfile, indent=4)
+
 def restructure_to_team_based(cleaned_file_path, team_file_path):
     """
     Restructures cleaned match data into a team-based format with advanced statistics.
@@ -33,38 +62,18 @@ def restructure_to_team_based(cleaned_file_path, team_file_path):
             cleaned_data = json.load(infile)
 
         small_seperation_bar("CONVERT TO TEAM-BASED")
-        if not isinstance(cleaned_data, list):
-            raise ValueError("Cleaned data must be a list of matches.")
 
         # Group matches by team
-        team_data = {}
-        total_matches = 0
-
-        for match in cleaned_data:
-            total_matches += 1
-            print(match['metadata'])
-            team = match["metadata"]["robotTeam"]
-
-            if team not in team_data:
-                team_data[team] = {"matches": []}
+        team_data = group_matches_by_team(cleaned_data)
 
-            team_data[team]["matches"].append(match)
-
-        log_message("INFO", f"Total matches processed: {total_matches}")
+        log_message("INFO", f"Total matches processed: {len(cleaned_data)}")
         log_message("INFO", f"Total unique teams identified: {len(team_data)}")
 
-        # Placeholder for advanced statistics calculations
-        for team, data in team_data.items():
-            for match in data["matches"]:
-                # Example: Add any advanced calculations here
-                pass  # Placeholder for custom metrics
-
         # Save team-based data
         small_seperation_bar("SAVE DATA")
         log_message("INFO", f"Saving team-based match data to: {team_file_path}")
 
-        with open(team_file_path, 'w') as outfile:
-            json.dump(team_data, outfile, indent=4)
+        save_team_based_data(team_data, team_file_path)
 
         log_message("INFO", "Data restructuring completed successfully.")
 
@@ -81,17 +90,23 @@ def restructure_to_team_based(cleaned_file_path, team_file_path):
 # MAIN SCRIPT
 # ===========================
 
-def main():
-    """Main function to execute the team-based match data restructuring."""
+def main(argv=None):
+    """Main function to execute the team-based match data restructuring. Returns 0 on success and 1 on failure."""
+    parser = argparse.ArgumentParser(description="Group the cleaned match data entries by team.")
+    parser.add_argument("--input", default=CLEANED_MATCH_DATA_PATH, help="Cleaned match data to group.")
+    parser.add_argument("--output", default=TEAM_BASED_MATCH_DATA_PATH, help="Where to write the team-based data.")
+    args = parser.parse_args(argv)
+
     seperation_bar()
+    exit_code = 0
     log_message("INFO", "Script 02: Team-based Match Data Restructuring Started")
 
     try:
         # Ensure the output directory exists
-        os.makedirs(os.path.dirname(TEAM_BASED_MATCH_DATA_PATH), exist_ok=True)
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
 
         # Restructure data to team-based format
-        restructure_to_team_based(CLEANED_MATCH_DATA_PATH, TEAM_BASED_MATCH_DATA_PATH)
+        restructure_to_team_based(args.input, args.output)
 
         log_message("INFO", "Script 02: Completed Successfully")
 
@@ -99,9 +114,11 @@ def main():
         log_message("ERROR", f"An unexpected error occurred: {e}")
         print(traceback.format_exc())
         log_message("ERROR", "Script 02: Failed")
+        exit_code = 1
 
     seperation_bar()
+    return exit_code
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
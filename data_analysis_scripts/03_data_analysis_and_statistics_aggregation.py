@@ -1,11 +1,12 @@
 import os
+import sys
 import csv
 import json
+import argparse
 import traceback
-import pandas as pd
-import numpy as np
 from utils.seperation_bars import seperation_bar, small_seperation_bar
 from utils.logging import log_message
+from utils.script_loader import cached_until_changed
 
 # ===========================
 # CONFIGURATION
@@ -17,10 +18,6 @@ TEAM_BASED_MATCH_DATA_PATH = "data/processed/team_based_match_data.json"
 TEAM_PERFORMANCE_DATA_PATH_JSON = "outputs/team_data/team_performance_data.json"
 TEAM_PERFORMANCE_DATA_PATH_CSV = "outputs/team_data/team_performance_data.csv"
 
-# Load Expected Data Structure
-with open(EXPECTED_DATA_STRUCTURE_PATH, "r") as f:
-    EXPECTED_DATA_STRUCTURE_DICT = json.load(f)
-
 # ===========================
 # CUSTOM METRICS CLASS
 # ===========================
@@ -36,6 +33,8 @@ class CustomMetrics:
     @staticmethod
     def consistency_score(df):
         """Computes how consistent a team is across all matches."""
+        import numpy as np
+
         consistency_scores = []
         for column in df.columns:
             if df[column].dtype in [np.float64, np.int64]:  # Quantitative
@@ -62,6 +61,8 @@ class CustomMetrics:
     @staticmethod
     def consistency_score(df):
         """Computes how consistent a team is across all matches."""
+        import numpy as np
+
         consistency_scores = []
         for column in df.columns:
             if df[column].dtype in [np.float64, np.int64]:  # Quantitative
@@ -166,10 +167,18 @@ def flatten_expected_vars(dictionary, return_dict=None, prefix=""):
 
     return return_dict
 
-FLATTENED_EXPECTED_VARIABLES = flatten_expected_vars(EXPECTED_DATA_STRUCTURE_DICT.get("variables", {}))
+@cached_until_changed(EXPECTED_DATA_STRUCTURE_PATH)
+def flattened_expected_variables():
+    """Loads and flattens the expected variables on first use rather than at import time, and again when the file changes."""
+    with open(EXPECTED_DATA_STRUCTURE_PATH, "r") as f:
+        expected_data_structure = json.load(f)
+    return flatten_expected_vars(expected_data_structure.get("variables", {}))
 
 def convert_to_serializable(obj):
     """Converts NumPy and Pandas types to standard Python types for JSON serialization."""
+    import numpy as np
+    import pandas as pd
+
     if isinstance(obj, (np.integer, int)):
         return int(obj)
     if isinstance(obj, (np.floating, float)):
@@ -186,7 +195,7 @@ def convert_to_serializable(obj):
 
 def determine_statistical_type(variable_name):
     """Returns the statistical data type (quantitative, categorical, binary) based on the expected structure."""
-    return FLATTENED_EXPECTED_VARIABLES.get(variable_name, {}).get("statistical_data_type", "unknown")
+    return flattened_expected_variables().get(variable_name, {}).get("statistical_data_type", "unknown")
 
 def calculate_team_performance_data(team_data):
     """
@@ -195,6 +204,8 @@ def calculate_team_performance_data(team_data):
     :param team_data: Dictionary containing match data for each team.
     :return: A dictionary with aggregated team statistics.
     """
+    import pandas as pd
+
     all_team_performance_data = {}
 
     for team, data in team_data.items():
@@ -242,19 +253,51 @@ def calculate_team_performance_data(team_data):
     return all_team_performance_data
 
 
+def save_team_performance_data(team_performance_data, json_path=TEAM_PERFORMANCE_DATA_PATH_JSON, csv_path=TEAM_PERFORMANCE_DATA_PATH_CSV):
+    """Saves team performance data as JSON and CSV."""
+    # Save JSON
+    log_message("INFO", f"Saving JSON team performance data to: {json_path}")
+    os.makedirs(os.path.dirname(json_path), exist_ok=True)
+    with open(json_path, 'w') as json_file:
+        json.dump(convert_to_serializable(team_performance_data), json_file, indent=4)
+
+    # Save CSV
+    log_message("INFO", f"Saving CSV team performance data to: {csv_path}")
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+
+    with open(csv_path, 'w', newline='') as csv_file:
+        csv_writer = csv.writer(csv_file)
+
+        all_headers = sorted({key for team in team_performance_data.values() for key in team.keys()})
+        all_headers.insert(0, "team")
+        csv_writer.writerow(all_headers)
+
+        for team, metrics in team_performance_data.items():
+            row = [team] + [convert_to_serializable(metrics.get(k, "")) for k in all_headers[1:]]
+            csv_writer.writerow(row)
+
+
 # ===========================
 # MAIN SCRIPT
 # ===========================
 
-def main():
+def main(argv=None):
+    """Aggregates the team statistics. Returns 0 on success and 1 on failure."""
+    parser = argparse.ArgumentParser(description="Aggregate per-team statistics from the team-based match data.")
+    parser.add_argument("--input", default=TEAM_BASED_MATCH_DATA_PATH, help="Team-based match data to aggregate.")
+    parser.add_argument("--output-json", default=TEAM_PERFORMANCE_DATA_PATH_JSON, help="Where to write the statistics as JSON.")
+    parser.add_argument("--output-csv", default=TEAM_PERFORMANCE_DATA_PATH_CSV, help="Where to write the statistics as CSV.")
+    args = parser.parse_args(argv)
+
     seperation_bar()
+    exit_code = 0
     log_message("INFO", "Script 03: Data Analysis & Statistics Aggregation Started")
 
     try:
         small_seperation_bar("LOAD DATA")
         log_message("INFO", "Loading team-based match data.")
 
-        with open(TEAM_BASED_MATCH_DATA_PATH, 'r') as infile:
+        with open(args.input, 'r') as infile:
             team_data = json.load(infile)
 
         team_performance_data = calculate_team_performance_data(team_data)
@@ -264,26 +307,7 @@ def main():
         small_seperation_bar("LOG TEAMS WITH 16 CORAL")
         log_teams_with_16_coral(team_data)
         
-        # Save JSON
-        log_message("INFO", f"Saving JSON team performance data to: {TEAM_PERFORMANCE_DATA_PATH_JSON}")
-        os.makedirs(os.path.dirname(TEAM_PERFORMANCE_DATA_PATH_JSON), exist_ok=True)
-        with open(TEAM_PERFORMANCE_DATA_PATH_JSON, 'w') as json_file:
-            json.dump(convert_to_serializable(team_performance_data), json_file, indent=4)
-
-        # Save CSV
-        log_message("INFO", f"Saving CSV team performance data to: {TEAM_PERFORMANCE_DATA_PATH_CSV}")
-        os.makedirs(os.path.dirname(TEAM_PERFORMANCE_DATA_PATH_CSV), exist_ok=True)
-
-        with open(TEAM_PERFORMANCE_DATA_PATH_CSV, 'w', newline='') as csv_file:
-            csv_writer = csv.writer(csv_file)
-
-            all_headers = sorted({key for team in team_performance_data.values() for key in team.keys()})
-            all_headers.insert(0, "team")
-            csv_writer.writerow(all_headers)
-
-            for team, metrics in team_performance_data.items():
-                row = [team] + [convert_to_serializable(metrics.get(k, "")) for k in all_headers[1:]]
-                csv_writer.writerow(row)
+        save_team_performance_data(team_performance_data, args.output_json, args.output_csv)
 
         small_seperation_bar("SUMMARY")
         log_message("INFO", f"Total teams processed: {len(team_performance_data)}")
@@ -293,9 +317,11 @@ def main():
     except Exception as e:
         log_message("ERROR", f"An unexpected error occurred: {e}")
         print(traceback.format_exc())
+        exit_code = 1
 
     seperation_bar()
+    return exit_code
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,16 +1,19 @@
 import os
+import sys
 import json
+import argparse
 import traceback
-import pandas as pd
-import matplotlib.pyplot as plt
-from pandas.plotting import parallel_coordinates
 from utils.logging import log_message
+from utils.chart_rendering import (render_charts, chart_job, DEFAULT_RENDER_WORKERS, BAR_CHART, GROUPED_BAR_CHART,
+                                   STACKED_BAR_CHART, PARALLEL_COORDINATES_PLOT, BOXPLOT, VIOLIN_PLOT, HISTOGRAM)
+from utils.match_table import build_long_table, split_by_variable, team_distribution, value_distribution
 
 # ===========================
 # CONFIGURATION SECTION
 # ===========================
 
 TEAM_PERFORMANCE_DATA_PATH_JSON = "outputs/team_data/team_performance_data.json"
+TEAM_BASED_MATCH_DATA_PATH = "data/processed/team_based_match_data.json"
 VISUALIZATIONS_DIR = "outputs/visualizations"
 
 # Bar Chart Configuration
@@ -21,9 +24,12 @@ BAR_CHART_CONFIG = {
     }
 }
 
-# Boxplot Configuration
-BOXPLOT_CONFIG = {
-    "Boxplot Tele L4 Coral": ["teleCoral.L4"]
+# Distribution Chart Configuration (per-match values of any number of variables)
+DISTRIBUTION_CHART_CONFIG = {
+    "Tele L4 Coral": {
+        "variables": ["teleCoral.L4"],
+        "visualizations": ["boxplot", "violin_plot", "histogram"]
+    }
 }
 
 # ===========================
@@ -39,6 +45,15 @@ def load_team_performance_data():
     with open(TEAM_PERFORMANCE_DATA_PATH_JSON, "r") as infile:
         return json.load(infile)
 
+def load_team_based_match_data():
+    """Loads the per-match data grouped by team."""
+    if not os.path.exists(TEAM_BASED_MATCH_DATA_PATH):
+        log_message("ERROR", f"Team-based match data file not found: {TEAM_BASED_MATCH_DATA_PATH}")
+        return None
+
+    with open(TEAM_BASED_MATCH_DATA_PATH, "r") as infile:
+        return json.load(infile)
+
 def ensure_directory_exists(directory):
     """Ensures that a directory exists."""
     os.makedirs(directory, exist_ok=True)
@@ -49,120 +64,105 @@ def extract_metric_data(team_data, metric_list):
 
     :param team_data: The dictionary containing team statistics.
     :param metric_list: List of metric names to extract.
-    :return: A DataFrame containing the extracted metrics.
+    :return: Chart data {"teams": [...], "metrics": {metric: [value per team]}}.
     """
-    extracted_data = []
-
-    for team, stats in team_data.items():
-        row = {"team": team}
-        for metric in metric_list:
-            row[metric] = stats.get(metric, 0)  # Default to 0 if metric is missing
-        extracted_data.append(row)
-
-    return pd.DataFrame(extracted_data)
+    teams = list(team_data)
+    metrics = {
+        metric: [team_data[team].get(metric, 0) for team in teams]  # Default to 0 if metric is missing
+        for metric in metric_list
+    }
+    return {"teams": teams, "metrics": metrics}
 
 # ===========================
-# BAR CHART VISUALIZATION FUNCTIONS
+# CHART JOBS
 # ===========================
 
-def generate_bar_chart(df, title, save_path):
-    """Generates a simple bar chart for a single metric comparison."""
-    metric = df.columns[1]  # Assuming "team" is the first column
-    df.set_index("team")[metric].plot(kind="bar", figsize=(10, 5), color="skyblue", edgecolor="black")
-
-    plt.title(title)
-    plt.xlabel("Teams")
-    plt.ylabel(metric)
-    plt.xticks(rotation=45, ha="right")
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
-
-    plt.savefig(save_path, bbox_inches="tight")
-    plt.close()
-    log_message("INFO", f"Bar Chart saved: {save_path}")
-
-def generate_grouped_bar_chart(df, title, save_path):
-    """Generates a grouped bar chart comparing teams for each variable metric."""
-    df.set_index("team").plot(kind="bar", figsize=(12, 6), colormap="viridis")
-
-    plt.title(title)
-    plt.xlabel("Teams")
-    plt.ylabel("Values")
-    plt.xticks(rotation=45, ha="right")
-    plt.legend(title="Metrics")
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
-
-    plt.savefig(save_path, bbox_inches="tight")
-    plt.close()
-    log_message("INFO", f"Grouped Bar Chart saved: {save_path}")
-
-def generate_stacked_bar_chart(df, title, save_path):
-    """Generates a stacked bar chart comparing teams across multiple metrics."""
-    df.set_index("team").plot(kind="bar", stacked=True, figsize=(12, 6), colormap="plasma")
-
-    plt.title(title)
-    plt.xlabel("Teams")
-    plt.ylabel("Values")
-    plt.xticks(rotation=45, ha="right")
-    plt.legend(title="Metrics")
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
-
-    plt.savefig(save_path, bbox_inches="tight")
-    plt.close()
-    log_message("INFO", f"Stacked Bar Chart saved: {save_path}")
-
-def generate_parallel_coordinates_plot(df, title, save_path):
-    """Generates a parallel coordinates plot to compare multiple metrics per team."""
-    df_normalized = df.copy()
-    df_normalized[df.columns[1:]] = df_normalized[df.columns[1:]].apply(lambda x: (x - x.min()) / (x.max() - x.min()))
-
-    plt.figure(figsize=(12, 6))
-    parallel_coordinates(df_normalized, class_column="team", colormap=plt.get_cmap("tab10"), linewidth=2)
-
-    plt.title(title)
-    plt.xticks(rotation=45, ha="right")
-    plt.xlabel("Metrics")
-    plt.ylabel("Normalized Values (0-1)")
-    plt.legend(title="Teams", bbox_to_anchor=(1.05, 1), loc="upper left")
-
-    plt.savefig(save_path, bbox_inches="tight")
-    plt.close()
-    log_message("INFO", f"Parallel Coordinates Plot saved: {save_path}")
+# Visualization name -> (chart kind, check on the number of metrics)
+BAR_CHART_KINDS = {
+    "bar_chart": (BAR_CHART, lambda count: count == 1),
+    "grouped_bar_chart": (GROUPED_BAR_CHART, lambda count: count > 1),
+    "stacked_bar_chart": (STACKED_BAR_CHART, lambda count: count > 1),
+    "parallel_coordinates_plot": (PARALLEL_COORDINATES_PLOT, lambda count: count > 1),
+}
 
-# ===========================
-# BOXPLOT VISUALIZATION FUNCTION
-# ===========================
+# Distribution visualization name -> chart kind, for charts drawn once per variable
+PER_VARIABLE_KINDS = {
+    "boxplot": BOXPLOT,
+    "violin_plot": VIOLIN_PLOT,
+}
 
-def generate_boxplot(team_data, variable, save_path):
+def build_chart_jobs(team_performance_data, match_table=None, output_dir=VISUALIZATIONS_DIR):
     """
-    Generates a boxplot for a single variable across teams.
-
-    :param team_data: Dictionary containing team performance data.
-    :param variable: Variable name for the boxplot.
-    :param save_path: Path to save the plot.
+    Turns the chart configuration into render jobs, each holding only the data slice its chart needs.
+    Distribution charts slice the long-format table of per-match values (see utils.match_table);
+    they are skipped when no table is given.
     """
-    df = extract_metric_data(team_data, [variable])
-
-    if df.empty:
-        log_message("WARNING", f"No valid data for {variable}, skipping boxplot.")
-        return
-
-    plt.figure(figsize=(10, 6))
-    df.boxplot(column=variable, by="team", grid=False)
-
-    plt.title(f"Boxplot for {variable} across Teams")
-    plt.xlabel("Teams")
-    plt.ylabel(variable.replace("_", " ").title())
-    plt.xticks(rotation=45, ha="right")
+    jobs = []
+
+    # Bar charts
+    for title, config in BAR_CHART_CONFIG.items():
+        variable_metrics = config["variable_metrics"]
+        log_message("INFO", f"Processing {title}: {variable_metrics}")
+
+        data = extract_metric_data(team_performance_data, variable_metrics)
+        if not data["teams"]:
+            log_message("WARNING", f"No data found for {title}. Skipping...")
+            continue
+
+        for vis in config["visualizations"]:
+            kind, accepts = BAR_CHART_KINDS[vis]
+            if accepts(len(variable_metrics)):
+                jobs.append(chart_job(kind, title, data, os.path.join(output_dir, f"{title}_{vis}.png")))
+
+    # Distribution charts
+    if match_table is None:
+        log_message("WARNING", "No per-match data available, skipping distribution charts.")
+        return jobs
+
+    rows_by_variable = split_by_variable(match_table)
+    for title, config in DISTRIBUTION_CHART_CONFIG.items():
+        variables = [variable for variable in config["variables"] if variable in rows_by_variable]
+        for variable in set(config["variables"]) - set(variables):
+            log_message("WARNING", f"No valid data for {variable}, skipping its distribution charts.")
+        if not variables:
+            continue
+
+        for vis in config["visualizations"]:
+            if vis == "histogram":
+                jobs.append(chart_job(HISTOGRAM, f"Histogram of {title}", value_distribution(rows_by_variable, variables),
+                                      os.path.join(output_dir, f"{title}_histogram.png"), figsize=(10, 6)))
+                continue
+            label = vis.replace("_", " ").title()
+            for variable in variables:
+                data = team_distribution(rows_by_variable[variable], variable)
+                width = max(10, 0.25 * len(data["groups"]))  # room for a box or violin per team
+                jobs.append(chart_job(PER_VARIABLE_KINDS[vis], f"{label} for {variable} across Teams", data,
+                                      os.path.join(output_dir, f"{variable}_{vis}.png"), figsize=(width, 6)))
 
-    plt.savefig(save_path, bbox_inches="tight")
-    plt.close()
-    log_message("INFO", f"Boxplot saved: {save_path}")
+    return jobs
 
 # ===========================
 # MAIN FUNCTION
 # ===========================
 
-def main():
+def generate_visualizations(team_performance_data, output_dir=VISUALIZATIONS_DIR, workers=DEFAULT_RENDER_WORKERS, force=False,
+                            team_data=None):
+    """
+    Generates every configured bar chart from in-memory team performance data, and every
+    distribution chart from the per-match team data, which is turned into a long-format table
+    once for all of them. Charts are rendered in a process pool; charts whose data and settings
+    didn't change since their last render are kept as they are.
+    """
+    ensure_directory_exists(output_dir)
+    match_table = build_long_table(team_data) if team_data is not None else None
+    return render_charts(build_chart_jobs(team_performance_data, match_table, output_dir), output_dir, workers, force)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the configured charts from the team performance data.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_RENDER_WORKERS, help="Processes rendering charts.")
+    parser.add_argument("--force", action="store_true", help="Render every chart, even unchanged ones.")
+    args = parser.parse_args(argv)
+
     log_message("INFO", "Script 04: Visualizations Started")
 
     try:
@@ -170,44 +170,16 @@ def main():
         if team_performance_data is None:
             raise ValueError("No team performance data available.")
 
-        ensure_directory_exists(VISUALIZATIONS_DIR)
-
-        # Process bar charts
-        for title, config in BAR_CHART_CONFIG.items():
-            variable_metrics = config["variable_metrics"]
-            visualizations = config["visualizations"]
-
-            log_message("INFO", f"Processing {title}: {variable_metrics}")
-
-            df = extract_metric_data(team_performance_data, variable_metrics)
-            if df.empty:
-                log_message("WARNING", f"No data found for {title}. Skipping...")
-                continue
-
-            for vis in visualizations:
-                save_path = os.path.join(VISUALIZATIONS_DIR, f"{title}_{vis}.png")
-
-                if vis == "bar_chart" and len(variable_metrics) == 1:
-                    generate_bar_chart(df, title, save_path)
-                elif vis == "grouped_bar_chart" and len(variable_metrics) > 1:
-                    generate_grouped_bar_chart(df, title, save_path)
-                elif vis == "stacked_bar_chart" and len(variable_metrics) > 1:
-                    generate_stacked_bar_chart(df, title, save_path)
-                elif vis == "parallel_coordinates_plot" and len(variable_metrics) > 1:
-                    generate_parallel_coordinates_plot(df, title, save_path)
-
-        # Process boxplots
-        for title, variables in BOXPLOT_CONFIG.items():
-            for variable in variables:
-                log_message("INFO", f"Generating boxplot for {variable}")
-                save_path = os.path.join(VISUALIZATIONS_DIR, f"{variable}_boxplot.png")
-                generate_boxplot(team_performance_data, variable, save_path)
+        generate_visualizations(team_performance_data, workers=args.workers, force=args.force,
+                                team_data=load_team_based_match_data())
 
         log_message("INFO", "Script 04: Completed Successfully")
+        return 0
 
     except Exception as e:
         log_message("ERROR", f"Unexpected error: {e}")
         print(traceback.format_exc())
+        return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import os
+import json
+import time
+import argparse
+import traceback
+from utils.logging import log_message
+from utils.team_report import render_team_reports, DEFAULT_REPORT_WORKERS, DEFAULT_CLIMB_VALUES, CLIMB_VARIABLE
+
+# ===========================
+# CONFIGURATION SECTION
+# ===========================
+
+TEAM_BASED_MATCH_DATA_PATH = "data/processed/team_based_match_data.json"
+EXPECTED_DATA_STRUCTURE_PATH = "config/expected_data_structure.json"
+TEAM_REPORTS_PATH = "outputs/team_reports/team_reports.pdf"
+
+# ===========================
+# HELPER FUNCTIONS
+# ===========================
+
+def load_json(path):
+    """Loads a JSON file, or returns None if it doesn't exist."""
+    if not os.path.exists(path):
+        log_message("ERROR", f"File not found: {path}")
+        return None
+
+    with open(path, "r") as infile:
+        return json.load(infile)
+
+def climb_values(expected_data_structure):
+    """The climb values listed in the expected data structure, in their order."""
+    variable = (expected_data_structure or {}).get("variables", {}).get(CLIMB_VARIABLE, {})
+    return variable.get("values", DEFAULT_CLIMB_VALUES)
+
+# ===========================
+# MAIN FUNCTION
+# ===========================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a one-page summary of every team to a single PDF.")
+    parser.add_argument("--output", default=TEAM_REPORTS_PATH, help="PDF to write.")
+    parser.add_argument("--teams", nargs="+", help="Only report these teams (in the order given).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_REPORT_WORKERS,
+                        help="Processes rendering team ranges, merged in order into one PDF.")
+    args = parser.parse_args(argv)
+
+    log_message("INFO", "Script 05: Team Reports Started")
+
+    try:
+        team_data = load_json(TEAM_BASED_MATCH_DATA_PATH)
+        if team_data is None:
+            raise ValueError("No team-based match data available.")
+
+        if args.teams:
+            missing = [team for team in args.teams if team not in team_data]
+            if missing:
+                log_message("WARNING", f"No match data for teams: {', '.join(missing)}")
+            team_data = {team: team_data[team] for team in args.teams if team in team_data}
+
+        start = time.perf_counter()
+        pages = render_team_reports(team_data, args.output, climb_values(load_json(EXPECTED_DATA_STRUCTURE_PATH)),
+                                    args.workers)
+        log_message("INFO", f"Wrote {pages} team pages to {args.output} in {time.perf_counter() - start:.2f}s")
+
+        log_message("INFO", "Script 05: Completed Successfully")
+
+    except Exception as e:
+        log_message("ERROR", f"Unexpected error: {e}")
+        print(traceback.format_exc())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import time
+import argparse
+from utils.logging import log_message
+from utils.seperation_bars import seperation_bar
+from utils.multi_event import EVENTS_DATA_DIR, EVENTS_OUTPUT_DIR, SEASON_OUTPUT_DIR, run_events
+
+
+
+# CONFIGURATION
+
+SEASON_RELATIVE_FILE_NAME = "season_scouter_penalties_relative.json"
+EVENT_RESULTS_FILE_NAME = "event_results.json"
+
+
+
+# CLI
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the scouter leaderboard (and optionally team analysis) for many events in parallel. "
+                    "Each event reads data/events/<event_key>/processed/cleaned_match_data.json and writes "
+                    "to outputs/events/<event_key>/."
+    )
+    parser.add_argument("event_keys", nargs="*", help="TBA event keys, e.g. 2025caph 2025casj.")
+    parser.add_argument("--events-file", help="Text file with one event key per line.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--analysis", action="store_true", help="Also compute team statistics per event.")
+    parser.add_argument("--data-dir", default=EVENTS_DATA_DIR, help="Root of the per-event input partitions.")
+    parser.add_argument("--output-dir", default=EVENTS_OUTPUT_DIR, help="Root of the per-event output partitions.")
+    parser.add_argument("--season-output-dir", default=SEASON_OUTPUT_DIR, help="Directory for the merged season leaderboard.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start_time = time.time()
+
+    event_keys = list(args.event_keys)
+    if args.events_file:
+        with open(args.events_file, "r") as f:
+            event_keys.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not event_keys:
+        print("No event keys given.")
+        return 1
+    if not os.getenv("TBA_KEY"):
+        print("Please set the TBA_KEY environment variable.")
+        return 1
+
+    seperation_bar()
+    log_message("INFO", f"Multi-event run started for {len(set(event_keys))} events")
+
+    results, season = run_events(event_keys, args.workers, args.analysis, data_dir=args.data_dir, output_dir=args.output_dir)
+
+    os.makedirs(args.season_output_dir, exist_ok=True)
+    season_path = os.path.join(args.season_output_dir, SEASON_RELATIVE_FILE_NAME)
+    with open(season_path, "w") as f:
+        json.dump(season, f, indent=4)
+    log_message("INFO", f"Season scouter leaderboard saved to {season_path}")
+
+    results_path = os.path.join(args.season_output_dir, EVENT_RESULTS_FILE_NAME)
+    with open(results_path, "w") as f:
+        json.dump([{k: v for k, v in r.items() if k not in ("penalties", "total_entries")} for r in results], f, indent=4)
+
+    failed = [r["event_key"] for r in results if r["status"] != "ok"]
+    if failed:
+        log_message("WARNING", f"Failed events: {failed}")
+    log_message("INFO", f"Multi-event run completed in {time.time() - start_time:.2f} seconds")
+    seperation_bar()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+import sys
+import argparse
+from utils.logging import log_message
+from utils.seperation_bars import seperation_bar
+from utils.pipeline import run_pipeline, PIPELINE_STATE_PATH, DEFAULT_WORKERS, FAILED, BLOCKED
+
+
+
+# CLI
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the whole pipeline once in one process. Stages pass results in memory, stages whose "
+                    "inputs didn't change since the last run (see " + PIPELINE_STATE_PATH + ") are skipped, "
+                    "and independent stages such as visualizations and the leaderboard run in parallel."
+    )
+    parser.add_argument("--event-key", default="2025caph", help="TBA event key, e.g. 2025caph.")
+    parser.add_argument("--no-results", action="store_true", help="Don't fetch TBA results; skips the leaderboard.")
+    parser.add_argument("--force", action="store_true", help="Run every stage, even if its inputs didn't change.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Stages that may run at the same time.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    context = {}
+    if not args.no_results:
+        from utils.scouter_leaderboard import create_tba_client, make_match_fetcher
+        from utils.multi_event import event_year
+
+        try:
+            tba = create_tba_client()
+        except ValueError as e:
+            print(e)
+            return 1
+        year = event_year(args.event_key)
+        context = {"event_key": args.event_key, "year": year, "fetch_match": make_match_fetcher(tba, args.event_key, year)}
+
+    seperation_bar()
+    summary = run_pipeline(context, workers=max(1, args.workers), force=args.force)
+    seperation_bar()
+    for stage in summary:
+        log_message("INFO", f"{stage['name']:<20} {stage['status']:<12} {stage['seconds']}s")
+
+    return 1 if any(stage["status"] in (FAILED, BLOCKED) for stage in summary) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
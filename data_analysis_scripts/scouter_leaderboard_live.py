@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import time
+import argparse
+from utils.scouter_leaderboard import (
+    DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT,
+    create_tba_client,
+    make_match_fetcher
+)
+from utils.leaderboard_state import run_incremental_update
+
+
+
+# CONFIGURATION
+
+SCOUTING_FILE = os.path.join("data", "processed", "cleaned_match_data.json")  # Raw scouting entries
+OUTPUT_DIR = os.path.join("outputs", "scouter_leaderboard")
+
+# TBA configuration
+EVENT_KEY = "2025caph"
+YEAR = 2025
+
+
+
+# CLI
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally update the scouter leaderboard with new matches.")
+    parser.add_argument("--scouting-file", default=SCOUTING_FILE, help="Cleaned scouting entries JSON.")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Directory for the leaderboard state and outputs.")
+    parser.add_argument("--event-key", default=EVENT_KEY, help="TBA event key, e.g. 2025caph.")
+    parser.add_argument("--year", type=int, default=YEAR, help="Event year.")
+    parser.add_argument("--attributes", type=int, default=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT,
+                        help="Number of attributes compared per entry.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start_time = time.time()
+
+    try:
+        tba = create_tba_client()
+    except ValueError as e:
+        print(e)
+        return 1
+
+    with open(args.scouting_file, "r") as f:
+        scouting_data = json.load(f)
+
+    _, changes = run_incremental_update(
+        scouting_data,
+        make_match_fetcher(tba, args.event_key, args.year),
+        args.output_dir,
+        args.event_key,
+        args.year,
+        args.attributes
+    )
+
+    print(f"Processed matches: {changes['processed']}")
+    print(f"Matches waiting on TBA results: {changes['pending']}")
+    print(f"Matches removed from scouting data: {changes['removed']}")
+    print(f"Leaderboard outputs saved to {args.output_dir}")
+
+    end_time = time.time()
+    print(f"Incremental update completed in {end_time - start_time:.2f} seconds.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,58 @@
-import tbapy
-import json
 import os
-
-TBA_KEY = os.getenv("TBA_KEY")
-
-tba = tbapy.TBA(TBA_KEY)
-event_key = "2025caph"
-year = 2025
-
-match_num = 10
-
-colors = ['red', 'blue']
-robots = ['endGameRobot1', 'endGameRobot2', 'endGameRobot3']
-
-data = {}
-
-for match in range(1, match_num + 1):
-
-    tba_match = tba.match(year=year, event=event_key, number=match)
-
-    data[str(match)] = {}
-    
-    for color in colors:
-        
-        data[str(match)][color] = {}
-        
-        for robot in robots:
-            data[str(match)][color][robot] = tba_match['score_breakdown'][color][robot]
-
-with open('outputs\scouter_leaderboard\multiple_atch_data_tba.json', "w") as f:
-    json.dump(data, f, indent=4)
\ No newline at end of file
+import sys
+import time
+import argparse
+from utils.logging import log_message
+from utils.scouter_leaderboard import create_tba_client
+from utils.multi_event import event_year
+from utils.tba_retrieval import parse_match_range, list_event_match_numbers, fetch_match_range, index_path_for
+
+OUTPUT_DIR = os.path.join("outputs", "scouter_leaderboard")
+OUTPUT_FILE_NAME = "multiple_match_data_tba.ndjson"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bulk-download full TBA match data to NDJSON (one match per line). "
+                    "Rerunning resumes from the matches already saved."
+    )
+    parser.add_argument("--event-key", default="2025caph", help="TBA event key, e.g. 2025caph.")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--matches", default="1-10", help="Qualification matches to fetch, e.g. 1-40 or 1,3,7-9.")
+    selection.add_argument("--all", action="store_true", help="Fetch every qualification match of the event.")
+    parser.add_argument("--workers", type=int, default=8, help="Maximum concurrent TBA requests.")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per match before it is reported as failed.")
+    parser.add_argument("--output", default=os.path.join(OUTPUT_DIR, f"{{event_key}}_{OUTPUT_FILE_NAME}"),
+                        help="NDJSON output path; {event_key} is substituted.")
+    parser.add_argument("--restart", action="store_true", help="Discard previous progress and fetch everything again.")
+    args = parser.parse_args(argv)
+
+    try:
+        tba = create_tba_client()
+    except ValueError as e:
+        print(e)
+        return 1
+
+    output_path = args.output.format(event_key=args.event_key)
+    if args.restart:
+        for path in (output_path, index_path_for(output_path)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    match_numbers = list_event_match_numbers(tba, args.event_key) if args.all else parse_match_range(args.matches)
+
+    start_time = time.time()
+    log_message("INFO", f"Retrieving {len(match_numbers)} matches for {args.event_key} into {output_path}")
+    summary = fetch_match_range(tba, args.event_key, event_year(args.event_key), match_numbers,
+                                output_path, args.workers, args.retries)
+
+    log_message("INFO", f"Fetched: {len(summary['fetched'])}, already saved: {len(summary['skipped'])}, "
+                        f"not played yet: {len(summary['unplayed'])}, failed: {len(summary['failed'])}")
+    if summary["failed"]:
+        log_message("WARNING", f"Failed matches (rerun to resume): {sorted(summary['failed'])}")
+    log_message("INFO", f"Retrieval completed in {time.time() - start_time:.2f} seconds")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,33 @@
-import tbapy
-import json
 import os
+import sys
+import json
+import argparse
+from utils.scouter_leaderboard import create_tba_client
+from utils.multi_event import event_year
+
+OUTPUT_DIR = os.path.join("outputs", "scouter_leaderboard")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Save the full TBA data for a single qualification match.")
+    parser.add_argument("--event-key", default="2025caph", help="TBA event key, e.g. 2025caph.")
+    parser.add_argument("--match", type=int, default=5, help="Qualification match number.")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Directory for the saved match JSON.")
+    args = parser.parse_args(argv)
 
-TBA_KEY = os.getenv("TBA_KEY")
+    try:
+        tba = create_tba_client()
+    except ValueError as e:
+        print(e)
+        return 1
 
-tba = tbapy.TBA(TBA_KEY)
-event_key = "2025caph"
-year = 2025
+    tba_match = tba.match(year=event_year(args.event_key), event=args.event_key, number=args.match)
 
-match_num = 5
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, f"match_{args.match}_single_match_data_tba.json"), "w") as f:
+        json.dump(tba_match, f, indent=4)
+    return 0
 
-tba_match = tba.match(year=year, event=event_key, number=match_num)
 
-with open(f'outputs\scouter_leaderboard\match_{match_num}_single_match_data_tba.json', "w") as f:
-    json.dump(tba_match, f, indent=4)
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import sys
+import argparse
+from utils.logging import log_message
+from utils.watcher import PipelineWatcher, tba_finished_matches, LATENCY_LOG_PATH
+from utils.artifact_store import ArtifactStore, ARTIFACT_STORE_DIR
+
+
+
+# CLI
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Watch data/raw/ and TBA match results, rerunning only the affected pipeline stages "
+                    "in one warm process. Latency per update is appended to " + LATENCY_LOG_PATH + "."
+    )
+    parser.add_argument("--event-key", default="2025caph", help="TBA event key, e.g. 2025caph.")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between raw folder checks.")
+    parser.add_argument("--results-interval", type=float, default=15.0, help="Seconds between TBA result checks.")
+    parser.add_argument("--no-results", action="store_true", help="Don't poll TBA; only react to raw file changes.")
+    parser.add_argument("--run-on-start", action="store_true", help="Run every stage once before watching.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always rerun stages instead of reusing stored outputs from " + ARTIFACT_STORE_DIR + ".")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    context = {}
+    match_source = None
+    if not args.no_results:
+        from utils.scouter_leaderboard import create_tba_client, make_match_fetcher
+        from utils.multi_event import event_year
+
+        try:
+            tba = create_tba_client()
+        except ValueError as e:
+            print(e)
+            return 1
+        year = event_year(args.event_key)
+        context = {"event_key": args.event_key, "year": year, "fetch_match": make_match_fetcher(tba, args.event_key, year)}
+        match_source = tba_finished_matches(tba, args.event_key)
+    else:
+        log_message("INFO", "Result polling disabled; the leaderboard stage will be skipped.")
+
+    watcher = PipelineWatcher(context, match_source, poll_interval=args.poll_interval,
+                              results_poll_interval=args.results_interval,
+                              artifact_store=None if args.no_cache else ArtifactStore())
+    watcher.run_forever(run_on_start=args.run_on_start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import json
 from utils.seperation_bars import *
 from utils.dictionary_manipulation import *
+from utils.config_validation import validate_generation_config, format_error, has_errors
 
 # ===========================
 # CONFIGURATION SECTION
@@ -81,9 +82,14 @@ for key, var in expected_data_structure_variables.items():
     if var_statistical_data_type == 'quantitative':
         data_generation_config_dict['variables'][key] = quantitative_var_default
         
-    # Categorical Var
+    # Categorical Var (the default distribution is spread evenly over the variable's expected values)
     elif var_statistical_data_type == 'categorical':
         data_generation_config_dict['variables'][key] = categorical_var_default
+        if 'values' in var:
+            data_generation_config_dict['variables'][key] = {
+                **categorical_var_default,
+                'unfair_distribution': [{value: 1 / len(var['values']) for value in var['values']}]
+            }
     
     # Binary Var
     elif var_statistical_data_type == 'binary':
@@ -97,6 +103,15 @@ print(json.dumps(data_generation_config_dict, indent=4))
 with open("config/data_generation_config.json", "w") as file:
     json.dump(data_generation_config_dict, file, indent=4)
 
+# Validate the new config right away (cached, so 05_data_generation.py doesn't repeat the work)
+small_seperation_bar("Data Generation Config Validation")
+
+validation_errors = validate_generation_config(data_generation_config_dict, expected_data_structure_dict)
+for error in validation_errors:
+    print(format_error(error))
+if not has_errors(validation_errors):
+    print("[INFO] Data generation config is valid")
+
 # END OF SCRIPT
 
 seperation_bar()
\ No newline at end of file
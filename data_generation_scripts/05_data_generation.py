@@ -1,9 +1,15 @@
+import sys
 import json
-import copy
+import time
 import random
+import argparse
 import numpy as np
 from utils.seperation_bars import *
 from utils.dictionary_manipulation import *
+from utils.json_streaming import write_json_array
+from utils.data_generation import generate_chunks, SCHEDULERS, BALANCED_SCHEDULER, DEFAULT_CHUNK_SIZE
+from utils.config_validation import validate_generation_config, format_error, has_errors
+from utils.generation_output import write_chunks, chunk_encoder, OUTPUT_FORMATS, JSON_FORMAT
 
 # ===========================
 # CONFIGURATION SECTION
@@ -13,6 +19,11 @@ data_generation_config_path = 'config/data_generation_config.json'
 expected_data_structure_path = 'config/expected_data_structure.json'
 output_generated_data_path = 'data/raw/generated_raw_match_data.json'
 
+# Generation modes
+LOOP_MODE = 'loop'
+VECTORIZED_MODE = 'vectorized'
+GENERATION_MODES = [LOOP_MODE, VECTORIZED_MODE]
+
 # ===========================
 # HELPER FUNCTIONS SECTION
 # ===========================
@@ -120,66 +131,39 @@ def generate_binary_variable(var_config):
     return random.choices(choices, probabilities)[0]  # Select based on unfair distribution
 
 
-# ===========================
-# MAIN SCRIPT SECTION
-# ===========================
+def generate_loop(data_generation_config_dict, expected_data_structure_variables, robot_positions):
+    """
+    Original generator: one random draw per variable, per team, per match.
+
+    Returns:
+        list: The generated entries.
+    """
+    num_teams = data_generation_config_dict['data_quantity']['number_of_teams']
+    num_matches_per_team = data_generation_config_dict['data_quantity']['number_of_matches_per_team']
+    teams_per_match = data_generation_config_dict['data_quantity']['teams_per_match']
+    scouters = data_generation_config_dict['scouter_names']
+    data_generation_config_variables = data_generation_config_dict['variables']
+
+    # Simulation Setup Vars
+    output_data_list = []  # Initializing output JSON as a list
+    min_matches_for_team = 0
+    match_number = 0
+    matches_per_team = {team: 0 for team in range(1, num_teams + 1)}
 
-seperation_bar()
-print("Script 04: Data Generation\n")
-
-# Retrieve JSON Data
-small_seperation_bar("RETRIEVE expected_data_structure.json")
-
-# Retrieve Expected Data Structure JSON as Dict
-expected_data_structure_dict = retrieve_json(expected_data_structure_path)
-print("\nExpected Data Structure JSON:")
-print(json.dumps(expected_data_structure_dict, indent=4))
-
-# Retrieve Data Generation Config Default Values JSON as Dict
-data_generation_config_dict = retrieve_json(data_generation_config_path)
-print("\nData Generation Config JSON:")
-print(json.dumps(data_generation_config_dict, indent=4))
-
-# Retrieve Expected Data Structure Settings
-robot_positions = expected_data_structure_dict['metadata']['robotPosition']['values']
-expected_data_structure_variables = flatten_vars_in_dict(expected_data_structure_dict["variables"], return_dict={})
-
-# Retrieve Data Generation settings
-running_data_generation = data_generation_config_dict['running_data_generation']
-num_teams = data_generation_config_dict['data_quantity']['number_of_teams']
-num_matches_per_team = data_generation_config_dict['data_quantity']['number_of_matches_per_team']
-teams_per_match = data_generation_config_dict['data_quantity']['teams_per_match']
-scouters = data_generation_config_dict['scouter_names']
-data_generation_config_variables = data_generation_config_dict['variables']
-
-# Simulation Setup Vars
-output_data_list = []  # Initializing output JSON as a list
-min_matches_for_team = 0
-match_number = 0
-matches_per_team = {team: 0 for team in range(1, num_teams + 1)}
-
-# COMPETITION LOOP/RUN
-if running_data_generation:
-    
     # MATCH LOOP
     while min_matches_for_team < num_matches_per_team:
-        
+
         match_number += 1
-        
+
         match_scouters = random.sample(scouters, teams_per_match)
-        
+
         lowest_teams = find_lowest_teams_list(matches_per_team, teams_per_match)
-        
-        print(lowest_teams)
-        
+
         # TEAM PERFORMANCE LOOP
         for current_robot_index, team in enumerate(lowest_teams):
-            
+
             team_robot_position = robot_positions[current_robot_index]
-            
-            # Create a deep copy of the expected structure for each team
-            team_performance = copy.deepcopy(expected_data_structure_dict)
-            
+
             # Assign the team number to the structure
             team_performance_metadata = {
                 "scouterName": match_scouters[current_robot_index],
@@ -192,42 +176,135 @@ if running_data_generation:
 
             # TEAM PERFORMANCE VARIABLES LOOP
             for var_key, var_config in data_generation_config_variables.items():
-                # print(expected_data_structure_variables)
                 var_statistical_data_type = expected_data_structure_variables[var_key]['statistical_data_type']
-                
+
                 if var_statistical_data_type == 'quantitative':
                     team_performance_variables[var_key] = generate_quantitative_variable(var_config)
-                
+
                 elif var_statistical_data_type == 'categorical':
                     team_performance_variables[var_key] = generate_categorical_variable(var_config)
-                
+
                 elif var_statistical_data_type == 'binary':
                     team_performance_variables[var_key] = generate_binary_variable(var_config)
-                
+
                 else:
                     print(f"[MAJOR ERROR] INVALID STATISTICAL DATA TYPE")
-            
+
             team_performance = {
                 'metadata': team_performance_metadata,
                 'variables': team_performance_variables
                 }
-            
+
             # Append to output list
             output_data_list.append(team_performance)
-            
+
             # Update the matches played count
             matches_per_team[team] += 1
 
         min_matches_for_team = min(matches_per_team.values())  # Update minimum match count
 
-else:
-    print("[INFO] Running Data Generation Set OFF")
+    return output_data_list
 
-# Print the final generated data
-# print("\nGenerated Output Data List:")
-# print(json.dumps(output_data_list, indent=4))
 
-with open(output_generated_data_path, "w") as outfile:
-    json.dump(output_data_list, outfile, indent=4)
+# ===========================
+# MAIN SCRIPT SECTION
+# ===========================
 
-seperation_bar()
\ No newline at end of file
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic raw match data from config/data_generation_config.json.")
+    parser.add_argument("--mode", choices=GENERATION_MODES, default=VECTORIZED_MODE,
+                        help="vectorized: draw every variable for all rows at once (fast, for large datasets); "
+                             "loop: the original per-value generator.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible output.")
+    parser.add_argument("--scheduler", choices=SCHEDULERS, default=BALANCED_SCHEDULER,
+                        help="Vectorized mode schedule: balanced (partner/opponent repeat limits, turnaround gap, "
+                             "red/blue balance; see the config's 'schedule' section) or round_robin (fastest).")
+    parser.add_argument("--teams", type=int, default=None, help="Override data_quantity.number_of_teams.")
+    parser.add_argument("--matches-per-team", type=int, default=None,
+                        help="Override data_quantity.number_of_matches_per_team.")
+    parser.add_argument("--output", default=output_generated_data_path,
+                        help="Output file (a folder for --format npy).")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=JSON_FORMAT,
+                        help="Vectorized mode output: json array, ndjson (one entry per line), npy "
+                             "(a folder with one .npy file per column and chunk), or a raw app export to load "
+                             "test the preparation scripts: raw ({matchApp, superApp} wrapper) or "
+                             "raw_concatenated (root objects one after another), with the corruption of the "
+                             "config's 'raw_export' section. The text formats spend most of their time "
+                             "formatting floats (about 25 microseconds per entry and worker, so 10M entries take minutes); "
+                             "npy is about ten times faster, use it or --workers for datasets that large.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Vectorized mode: entries generated and written at a time. Bounds memory use; "
+                             "the same seed and chunk size give the same data.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Vectorized mode: processes generating chunks in parallel. The output for a "
+                             "seed does not depend on the number of workers.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    seperation_bar()
+    print("Script 04: Data Generation\n")
+
+    # Retrieve JSON Data
+    small_seperation_bar("RETRIEVE expected_data_structure.json")
+
+    # Retrieve Expected Data Structure JSON as Dict
+    expected_data_structure_dict = retrieve_json(expected_data_structure_path)
+    print("\nExpected Data Structure JSON:")
+    print(json.dumps(expected_data_structure_dict, indent=4))
+
+    # Retrieve Data Generation Config Default Values JSON as Dict
+    data_generation_config_dict = retrieve_json(data_generation_config_path)
+    print("\nData Generation Config JSON:")
+    print(json.dumps(data_generation_config_dict, indent=4))
+
+    if args.teams is not None:
+        data_generation_config_dict['data_quantity']['number_of_teams'] = args.teams
+    if args.matches_per_team is not None:
+        data_generation_config_dict['data_quantity']['number_of_matches_per_team'] = args.matches_per_team
+
+    # Validate the config as it will be used (cached: near free if 03 or 04 already validated it)
+    if data_generation_config_dict.get('running_data_generation'):
+        validation_errors = validate_generation_config(data_generation_config_dict, expected_data_structure_dict)
+        for error in validation_errors:
+            print(format_error(error))
+        if has_errors(validation_errors):
+            print("[MAJOR ERROR] Invalid data generation config, nothing generated")
+            seperation_bar()
+            return 1
+
+    # Retrieve Expected Data Structure Settings
+    robot_positions = expected_data_structure_dict['metadata']['robotPosition']['values']
+    expected_data_structure_variables = flatten_vars_in_dict(expected_data_structure_dict["variables"], return_dict={})
+
+    if not data_generation_config_dict['running_data_generation']:
+        print("[INFO] Running Data Generation Set OFF")
+        write_json_array(args.output, [])
+
+    elif args.mode == LOOP_MODE:
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+        output_data_list = generate_loop(data_generation_config_dict, expected_data_structure_variables, robot_positions)
+
+        with open(args.output, "w") as outfile:
+            json.dump(output_data_list, outfile, indent=4)
+
+    else:
+        start_time = time.time()
+        variable_types = {key: var['statistical_data_type'] for key, var in expected_data_structure_variables.items()}
+        chunks = generate_chunks(data_generation_config_dict, variable_types, robot_positions, seed=args.seed,
+                                 chunk_size=max(1, args.chunk_size), scheduler=args.scheduler,
+                                 workers=args.workers,
+                                 encode=chunk_encoder(args.format, data_generation_config_dict, args.seed))
+
+        # Chunks are written in match order as they arrive, never all held at once
+        count = write_chunks(chunks, args.output, args.format, data_generation_config_dict, args.seed)
+        print(f"[INFO] Generated and wrote {count} entries to '{args.output}' in {time.time() - start_time:.2f} seconds")
+
+    seperation_bar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
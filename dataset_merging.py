@@ -1,5 +1,18 @@
 import json
 import os
+import argparse
+from utils.join_engine import (
+    ONE_TO_ONE,
+    JOIN_MODES,
+    MATCH,
+    UNMATCHED_LEFT,
+    UNMATCHED_RIGHT,
+    DUPLICATE_LEFT,
+    DUPLICATE_RIGHT,
+    hash_join
+)
+from utils.fuzzy_join import DEFAULT_THRESHOLD, fuzzy_join
+from utils.json_streaming import JsonArrayWriter
 
 # File paths
 EXPECTED_DATA_STRUCTURE_FILE = "config/expected_data_structure.json"
@@ -7,6 +20,13 @@ INPUT_FILE = "data/raw/raw_data.json"
 OUTPUT_COMBINED_FILE = "data/raw/combined_data.json"
 OUTPUT_VOIDED_FILE = "data/raw/voided_entries.json"
 
+VOID_REASONS = {
+    UNMATCHED_LEFT: "No matching superApp entry found",
+    UNMATCHED_RIGHT: "No matching matchApp entry found",
+    DUPLICATE_LEFT: "Duplicate matchApp entry for merge key",
+    DUPLICATE_RIGHT: "Duplicate superApp entry for merge key"
+}
+
 def load_json(filepath):
     """Loads JSON data from a file."""
     with open(filepath, "r") as file:
@@ -18,43 +38,75 @@ def save_json(filepath, data):
         json.dump(data, file, indent=4)
 
 def get_metadata_fields(expected_structure):
-    """Extracts required metadata fields from expected data structure."""
-    return set(expected_structure.get("metadata", {}).keys())
-
-def match_entries(match_data, super_data, metadata_fields):
+    """Extracts required metadata fields from expected data structure, in their declared order."""
+    return list(expected_structure.get("metadata", {}).keys())
+
+def iter_merged_entries(match_data, super_data, metadata_fields, mode=ONE_TO_ONE, tolerant=False, threshold=DEFAULT_THRESHOLD):
+    """
+    Streams the merge of matchApp and superApp entries on the metadata fields.
+
+    Yields ("combined", entry) for every joined pair and ("voided", entry) for every entry
+    that could not be joined (no partner, or a duplicate merge key in one_to_one mode).
+
+    With tolerant=True, entries left without a partner by the exact join get a second chance:
+    they are blocked on (matchNumber, robotPosition) and paired when scouterName and robotTeam
+    are close enough. Those combined entries carry a "matchScore" below 1.
+    """
+    unmatched_match, unmatched_super = [], []
+
+    for event, key, match_entry, super_entry in hash_join(match_data, super_data, metadata_fields, mode):
+        if event == MATCH:
+            yield "combined", {
+                "metadata": dict(zip(metadata_fields, key)),
+                "matchData": match_entry,
+                "superData": super_entry
+            }
+        elif tolerant and event == UNMATCHED_LEFT:
+            unmatched_match.append(match_entry)
+        elif tolerant and event == UNMATCHED_RIGHT:
+            unmatched_super.append(super_entry)
+        else:
+            yield "voided", {"entry": match_entry if match_entry is not None else super_entry, "reason": VOID_REASONS[event]}
+
+    if not tolerant:
+        return
+
+    matches, unmatched_match, unmatched_super = fuzzy_join(unmatched_match, unmatched_super, threshold)
+    for score, match_entry, super_entry in matches:
+        yield "combined", {
+            "metadata": {field: match_entry["metadata"].get(field, None) for field in metadata_fields},
+            "matchData": match_entry,
+            "superData": super_entry,
+            "matchScore": score
+        }
+    for match_entry in unmatched_match:
+        yield "voided", {"entry": match_entry, "reason": VOID_REASONS[UNMATCHED_LEFT]}
+    for super_entry in unmatched_super:
+        yield "voided", {"entry": super_entry, "reason": VOID_REASONS[UNMATCHED_RIGHT]}
+
+def match_entries(match_data, super_data, metadata_fields, mode=ONE_TO_ONE, tolerant=False, threshold=DEFAULT_THRESHOLD):
     """Matches entries between matchApp and superApp based on metadata fields."""
     combined_data = []
     voided_entries = []
 
-    # Create a lookup dictionary for superApp data using only expected metadata fields
-    super_lookup = {
-        tuple(entry["metadata"].get(field, None) for field in metadata_fields): entry
-        for entry in super_data
-    }
-
-    for match_entry in match_data:
-        key = tuple(match_entry["metadata"].get(field, None) for field in metadata_fields)
-
-        if key in super_lookup:
-            # Merge the data
-            combined_entry = {
-                "metadata": {field: match_entry["metadata"].get(field, None) for field in metadata_fields},
-                "matchData": match_entry,
-                "superData": super_lookup[key]
-            }
-            combined_data.append(combined_entry)
+    for kind, entry in iter_merged_entries(match_data, super_data, metadata_fields, mode, tolerant, threshold):
+        if kind == "combined":
+            combined_data.append(entry)
         else:
-            # Log as voided if no matching superApp entry is found
-            voided_entries.append({"entry": match_entry, "reason": "No matching superApp entry found"})
-
-    # Check for unmatched superApp entries
-    for key, super_entry in super_lookup.items():
-        if key not in {tuple(entry["metadata"].get(field, None) for field in metadata_fields) for entry in match_data}:
-            voided_entries.append({"entry": super_entry, "reason": "No matching matchApp entry found"})
+            voided_entries.append(entry)
 
     return combined_data, voided_entries
 
 def main():
+    parser = argparse.ArgumentParser(description="Merge matchApp and superApp entries on their metadata fields.")
+    parser.add_argument("--mode", choices=JOIN_MODES, default=ONE_TO_ONE,
+                        help="one_to_one reports repeated merge keys as duplicates; one_to_many joins every pair.")
+    parser.add_argument("--tolerant", action="store_true",
+                        help="Pair leftover entries in the same match and position despite typos in scouterName or robotTeam.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum fuzzy match score (0-1) in tolerant mode.")
+    args = parser.parse_args()
+
     # Load data
     data = load_json(INPUT_FILE)
     expected_structure = load_json(EXPECTED_DATA_STRUCTURE_FILE)
@@ -65,12 +117,16 @@ def main():
     # Get required metadata fields from the expected data structure
     metadata_fields = get_metadata_fields(expected_structure)
 
-    # Match entries and identify voided entries
-    combined_data, voided_entries = match_entries(match_data, super_data, metadata_fields)
+    # Match entries and stream combined and voided entries straight to their output files
+    os.makedirs(os.path.dirname(OUTPUT_COMBINED_FILE), exist_ok=True)
+    with JsonArrayWriter(OUTPUT_COMBINED_FILE) as combined_writer, JsonArrayWriter(OUTPUT_VOIDED_FILE) as voided_writer:
+        for kind, entry in iter_merged_entries(match_data, super_data, metadata_fields, args.mode, args.tolerant, args.threshold):
+            if kind == "combined":
+                combined_writer.write(entry)
+            else:
+                voided_writer.write(entry)
 
-    # Save output files
-    save_json(OUTPUT_COMBINED_FILE, combined_data)
-    save_json(OUTPUT_VOIDED_FILE, voided_entries)
+    print(f"Combined entries: {combined_writer.count}, voided entries: {voided_writer.count}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
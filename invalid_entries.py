@@ -1,81 +1,52 @@
 import json
-from collections import defaultdict
+import argparse
+from utils.deduplication import DEDUP_POLICIES, DEFAULT_POLICY, deduplicate
+from utils.json_streaming import READ_MODES, STREAM_MODE, iter_subtree_items
 
 # File paths
 INPUT_FILE = "data/raw/lar_data_raw.json"  # Replace with actual path
 OUTPUT_FILE_CLEANED = "data/raw/cleaned_backup.json"
 OUTPUT_FILE_INVALID = "data/raw/invalid_entries.json"
-
-# Expected robot positions per match
-EXPECTED_POSITIONS = {"red_1", "red_2", "red_3", "blue_1", "blue_2", "blue_3"}
-
-def is_valid_entry(entry):
-    """Checks if an entry has all required metadata keys."""
-    required_keys = {"scouterName", "matchNumber", "robotTeam", "robotPosition"}
-    if "metadata" not in entry:
-        return False, "Missing metadata"
-    metadata = entry["metadata"]
-    
-    missing_keys = [key for key in required_keys if key not in metadata]
-    if missing_keys:
-        return False, f"Missing metadata keys: {', '.join(missing_keys)}"
-    
-    return True, None
+OUTPUT_FILE_DUPLICATES = "data/raw/duplicate_entries.json"
 
 def validate_matches(data):
-    """Filters out invalid entries and returns cleaned data & invalid data with reasons."""
-    match_dict = defaultdict(list)
-
-    # Organize entries by match number
-    for entry in data:
-        is_valid, reason = is_valid_entry(entry)
-        if is_valid:
-            match_dict[entry["metadata"]["matchNumber"]].append(entry)
-        else:
-            entry["removal_reason"] = reason
-
-    cleaned_data = []
-    invalid_data = []
-
-    for match_number, entries in match_dict.items():
-        teams = set()
-        positions = set()
-        match_valid = True
-        removal_reasons = []
-
-        if len(entries) != 6:
-            match_valid = False
-            removal_reasons.append(f"Match {match_number} does not have exactly 6 teams (found {len(entries)})")
-
-        for entry in entries:
-            metadata = entry["metadata"]
-            team = metadata["robotTeam"]
-            position = metadata["robotPosition"]
-
-            if team in teams:
-                match_valid = False
-                removal_reasons.append(f"Duplicate team {team} in match {match_number}")
-
-            if position in positions:
-                match_valid = False
-                removal_reasons.append(f"Duplicate position {position} in match {match_number}")
-
-            teams.add(team)
-            positions.add(position)
-
-        if match_valid:
-            cleaned_data.extend(entries)
-        else:
-            for entry in entries:
-                entry["removal_reason"] = "; ".join(removal_reasons)
-                invalid_data.append(entry)
+    """
+    Filters out invalid entries and returns cleaned data & invalid data with reasons.
+
+    Matches are checked column-wise (see utils.match_integrity); the input entries are not
+    modified, and invalid entries are returned as copies carrying their "removal_reason".
+    """
+    import numpy as np
+    from utils.match_integrity import check_match_integrity, removal_reasons
+
+    integrity = check_match_integrity(data)
+    reasons = removal_reasons(data, integrity)
+
+    # Entry order grouped per match, matches in order of their first appearance
+    order = np.argsort(integrity["entry_match_codes"], kind="stable")
+    entry_indices = integrity["entry_indices"][order]
+    entry_match_codes = integrity["entry_match_codes"][order]
+    entry_valid = integrity["reason_codes"][entry_match_codes] == 0
+
+    cleaned_data = [data[index] for index in entry_indices[entry_valid]]
+    invalid_data = [
+        {**data[index], "removal_reason": "; ".join(reasons[match_code])}
+        for index, match_code in zip(entry_indices[~entry_valid], entry_match_codes[~entry_valid])
+    ]
 
     return cleaned_data, invalid_data
 
-def main():
-    # Load the data
-    with open(INPUT_FILE, "r") as infile:
-        data = json.load(infile)["matchApp"]  # Extract match data
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Remove duplicate submissions, then void matches with invalid entries.")
+    parser.add_argument("--dedup-policy", choices=DEDUP_POLICIES, default=DEFAULT_POLICY,
+                        help="How resubmitted entries (same _id, or same match, position and scouter) are resolved.")
+    parser.add_argument("--mode", choices=READ_MODES, default=STREAM_MODE,
+                        help="Read the export in chunks (stream) or through a memory map (mmap).")
+    args = parser.parse_args(argv)
+
+    # Stream only the match data out of the export, resolving resubmitted duplicates on the way
+    # so they do not void otherwise complete matches
+    data, duplicates = deduplicate(iter_subtree_items(INPUT_FILE, "matchApp", args.mode), args.dedup_policy)
 
     # Validate and clean data
     cleaned_data, invalid_data = validate_matches(data)
@@ -88,5 +59,9 @@ def main():
     with open(OUTPUT_FILE_INVALID, "w") as outfile:
         json.dump({"invalidEntries": invalid_data}, outfile, indent=4)
 
+    # Save how duplicates were resolved
+    with open(OUTPUT_FILE_DUPLICATES, "w") as outfile:
+        json.dump({"duplicateEntries": duplicates}, outfile, indent=4)
+
 if __name__ == "__main__":
     main()
@@ -1,9 +1,12 @@
 import json
 import os
+import argparse
+from utils.json_streaming import READ_MODES, STREAM_MODE, JsonArrayWriter, iter_subtree_items
 
 EXPECTED_DATA_STRUCTURE_FILE = "config/expected_data_structure.json"
 INPUT_FILE = "data/raw/lar_data_raw.json"
 OUTPUT_COMBINED_FILE = "data/raw/matchapps_data.json"
+MATCH_APP_KEY = "matchApp"
 
 
 def load_json(filepath):
@@ -19,14 +22,26 @@ def save_json(filepath, data):
         json.dump(data, file, indent=4)
 
 
-# Load JSON data
-data = load_json(INPUT_FILE)
+def extract_match_app_data(data):
+    """Returns the "matchApp" entries from a raw app export."""
+    return data.get(MATCH_APP_KEY, [])
 
-# Extract "matchApp" data
-new_data = data.get("matchApp", [])
 
-# Print JSON (Optional)
-print(json.dumps(new_data, indent=4))
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract the matchApp entries from the raw app export.")
+    parser.add_argument("--mode", choices=READ_MODES, default=STREAM_MODE,
+                        help="Read the export in chunks (stream) or through a memory map (mmap).")
+    parser.add_argument("--print", dest="print_data", action="store_true",
+                        help="Also print the extracted entries to stdout.")
+    args = parser.parse_args(argv)
 
-# Save extracted data to the new file
-save_json(OUTPUT_COMBINED_FILE, new_data)
+    # Stream only the "matchApp" entries to the new file; superApp is skipped without being decoded
+    with JsonArrayWriter(OUTPUT_COMBINED_FILE) as writer:
+        for entry in iter_subtree_items(INPUT_FILE, MATCH_APP_KEY, args.mode):
+            writer.write(entry)
+            if args.print_data:
+                print(json.dumps(entry, indent=4))
+
+
+if __name__ == "__main__":
+    main()
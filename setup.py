@@ -5,4 +5,9 @@ setup(
     version="0.1",
     packages=find_packages(),  # Automatically finds "utils/"
     install_requires=[],  # List dependencies here if needed
+    entry_points={
+        "console_scripts": [
+            "reefscape=utils.cli:main",  # e.g. `reefscape pipeline`, `reefscape --help`
+        ],
+    },
 )
\ No newline at end of file
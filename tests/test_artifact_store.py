@@ -0,0 +1,69 @@
+import os
+import pytest
+from utils.artifact_store import ArtifactStore, artifact_key
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(str(tmp_path / "artifacts"))
+
+
+def test_run_cached_stores_and_restores_outputs(tmp_path, store):
+    source, output = str(tmp_path / "input.json"), str(tmp_path / "out" / "output.json")
+    write(source, "1")
+    calls = []
+
+    def run():
+        calls.append(1)
+        write(output, "computed from " + read(source))
+
+    assert store.run_cached("stage", run, [source], [output]) is False
+    os.remove(output)
+    assert store.run_cached("stage", run, [source], [output]) is True
+    assert read(output) == "computed from 1"
+    assert len(calls) == 1
+
+
+def test_run_cached_does_not_store_outputs_a_failed_run_left_behind(tmp_path, store):
+    source, output = str(tmp_path / "input.json"), str(tmp_path / "output.json")
+    write(source, "1")
+    write(output, "stale output of an earlier input")
+
+    def failing_run():
+        # Like a stage main that logs and swallows its own error
+        pass
+
+    with pytest.raises(RuntimeError):
+        store.run_cached("stage", failing_run, [source], [output])
+    assert store.lookup("stage", artifact_key("stage", [source])) is None
+    assert read(output) == "stale output of an earlier input"
+
+
+def test_run_cached_requires_every_output(tmp_path, store):
+    written, missing = str(tmp_path / "written.json"), str(tmp_path / "missing.json")
+
+    with pytest.raises(RuntimeError):
+        store.run_cached("stage", lambda: write(written, "ok"), [], [written, missing])
+    assert store.lookup("stage", artifact_key("stage")) is None
+
+
+def test_restore_replaces_output_directory(tmp_path, store):
+    source, output_dir = str(tmp_path / "input.json"), str(tmp_path / "charts")
+    write(source, "1")
+    store.run_cached("stage", lambda: write(os.path.join(output_dir, "a.png"), "a"), [source], [output_dir])
+
+    # A later generation adds a file, then the first generation's inputs come back
+    write(os.path.join(output_dir, "b.png"), "b")
+    assert store.run_cached("stage", lambda: None, [source], [output_dir]) is True
+    assert sorted(os.listdir(output_dir)) == ["a.png"]
@@ -0,0 +1,29 @@
+import json
+import numpy as np
+import pytest
+from utils.data_generation import iter_batch_entries
+from utils.generation_output import encode_ndjson_chunk, encode_json_chunk
+
+
+def make_batch(rows):
+    return {
+        "scouterName": np.array(['scouter "1", ok', "scouter\x002", "é"][:rows], dtype=object),
+        "matchNumber": np.arange(1, rows + 1),
+        "robotTeam": np.array([254, 1678, 4414][:rows], dtype=np.int32),
+        "robotPosition": np.array(["red_1", "blue_2", "red_3"][:rows], dtype=object),
+        "variables": {
+            "auto.score": np.array([1.5, np.nan, -np.inf][:rows]),
+            "auto.moved": np.array(["true", False, None][:rows], dtype=object),
+            "notes%s": np.array(["a\nb", 3, ""][:rows], dtype=object)
+        }
+    }
+
+
+@pytest.mark.parametrize("rows", [0, 1, 3])
+def test_text_encoders_match_json_dumps_per_entry(rows):
+    batch = make_batch(rows)
+    entries = list(iter_batch_entries(batch))
+
+    assert encode_ndjson_chunk(batch) == "".join(json.dumps(entry) + "\n" for entry in entries)
+    assert encode_json_chunk(batch) == ",".join(
+        "\n    " + json.dumps(entry, indent=4).replace("\n", "\n    ") for entry in entries)
@@ -0,0 +1,48 @@
+import io
+import pytest
+from utils.json_streaming import JsonRecordReader
+
+
+class RecordingFile(io.BytesIO):
+    """BytesIO remembering the largest read requested, i.e. how much the reader tried to buffer."""
+
+    largest_read = 0
+
+    def read(self, size=-1):
+        self.largest_read = max(self.largest_read, size)
+        return super().read(size)
+
+
+def read_all(data, chunk_size, **kwargs):
+    reader = JsonRecordReader(io.BytesIO(data), chunk_size, **kwargs)
+    return list(reader), reader.damaged
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 10))
+@pytest.mark.parametrize("data, expected", [
+    (b"[1.5, 2]", [1.5, 2]),
+    (b"[1e5, -2.25E-3]", [1e5, -2.25e-3]),
+    (b"1.5\n2.5\n", [1.5, 2.5]),
+    (b'["ab", true, null, 12]', ["ab", True, None, 12]),
+])
+def test_scalars_cut_by_chunk_boundaries_decode_whole(data, expected, chunk_size):
+    assert read_all(data, chunk_size) == (expected, [])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 64])
+def test_scalar_without_delimiter_is_damaged(chunk_size):
+    records, damaged = read_all(b'{"a": 1}\n1.x\n{"b": 2}\n', chunk_size)
+    assert records == [{"a": 1}, {"b": 2}]
+    assert len(damaged) == 1
+
+
+def test_unterminated_string_buffering_is_capped():
+    # The string lost its closing quote; the next quote is 200 KB further on
+    infile = RecordingFile(b'{"a": 1}\n{"b": "' + b"x" * 200_000 + b' {"c": 1}\n{"d": 2}\n')
+
+    reader = JsonRecordReader(infile, 256, max_string_length=4096)
+    records = list(reader)
+
+    assert records == [{"a": 1}, {"d": 2}]
+    assert len(reader.damaged) == 1
+    assert infile.largest_read <= 2 * 4096 + 256
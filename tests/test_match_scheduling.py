@@ -0,0 +1,17 @@
+from collections import Counter
+import numpy as np
+import pytest
+from utils.match_scheduling import schedule_matches
+
+
+@pytest.mark.parametrize("num_teams, matches_per_team", [(45, 10), (46, 10), (47, 7), (30, 12), (8, 12), (7, 5)])
+@pytest.mark.parametrize("seed", range(3))
+def test_every_team_plays_matches_per_team_and_only_the_last_match_is_padded(num_teams, matches_per_team, seed):
+    schedule = schedule_matches(num_teams, matches_per_team, 6, np.random.default_rng(seed))
+    counts = Counter(schedule.ravel().tolist())
+
+    assert len(schedule) == -(-num_teams * matches_per_team // 6)
+    assert sorted(counts) == list(range(1, num_teams + 1))
+    assert min(counts.values()) == matches_per_team
+    assert max(counts.values()) <= matches_per_team + 1
+    assert all(len(set(match)) == 6 for match in schedule.tolist())
@@ -0,0 +1,33 @@
+import os
+from utils.artifact_store import ArtifactStore, ARTIFACT_STORE_DIR, artifact_key
+from utils.script_loader import load_script
+
+RESET_SCRIPT = os.path.join("data_analysis_preperation", "01_reset_all_folders.py")
+
+
+def write(path, text="{}"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_wipe_keeps_artifact_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = os.path.join("data", "processed", "cleaned_match_data.json")
+    write(output, "[1, 2, 3]")
+    key = artifact_key("cleaning", code=[output])
+    ArtifactStore().save("cleaning", key, [output])
+    write(os.path.join(ARTIFACT_STORE_DIR, "pipeline_state.json"))
+    write(os.path.join(ARTIFACT_STORE_DIR, "config_validation_cache.json"))
+    write(os.path.join("data", "raw", "raw_match_data.json"))
+    write(os.path.join("outputs", "visualizations", "chart.png"), "")
+
+    load_script(RESET_SCRIPT).main(["--wipe"])
+
+    assert ArtifactStore().lookup("cleaning", key) is not None
+    assert os.path.exists(os.path.join(ARTIFACT_STORE_DIR, "pipeline_state.json"))
+    assert os.path.exists(os.path.join(ARTIFACT_STORE_DIR, "config_validation_cache.json"))
+    assert os.path.exists(os.path.join("data", "raw", "raw_match_data.json"))
+    # Everything else is still wiped
+    assert not os.path.exists(output)
+    assert not os.path.exists(os.path.join("outputs", "visualizations", "chart.png"))
@@ -0,0 +1,35 @@
+import json
+from utils.script_loader import load_script, cached_until_changed
+
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_load_script_reloads_an_edited_script(tmp_path):
+    script = tmp_path / "stage.py"
+    write(script, "VALUE = 1\n")
+    first = load_script(str(script))
+
+    assert load_script(str(script)) is first
+    write(script, "VALUE = 22\n")
+    assert load_script(str(script)).VALUE == 22
+
+
+def test_cached_until_changed_reloads_an_edited_config(tmp_path):
+    config = tmp_path / "config.json"
+    write(config, json.dumps({"variables": ["a"]}))
+    loads = []
+
+    @cached_until_changed(str(config))
+    def load_config():
+        loads.append(1)
+        with open(config) as f:
+            return json.load(f)
+
+    assert load_config() == load_config() == {"variables": ["a"]}
+    assert len(loads) == 1
+    write(config, json.dumps({"variables": ["a", "b"]}))
+    assert load_config() == {"variables": ["a", "b"]}
+    assert len(loads) == 2
@@ -0,0 +1,24 @@
+import pytest
+from utils.cli import measure_startup, check_startup, STARTUP_CHECK_COMMANDS, DEFAULT_STARTUP_BUDGET_MS
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """Import time of a bare interpreter start, which lightweight commands are measured against."""
+    return measure_startup([])
+
+
+@pytest.mark.parametrize("command", STARTUP_CHECK_COMMANDS, ids=" ".join)
+def test_lightweight_command_starts_within_budget(command, baseline):
+    result = measure_startup(command)
+
+    assert result["returncode"] == 0
+    assert result["heavy"] == [], f"reefscape {result['command']} imports {result['heavy']}"
+    added_ms = result["import_ms"] - baseline["import_ms"]
+    assert added_ms <= DEFAULT_STARTUP_BUDGET_MS, \
+        f"reefscape {result['command']} adds {added_ms:.1f} ms of imports (budget {DEFAULT_STARTUP_BUDGET_MS} ms)"
+
+
+def test_check_startup_passes(capsys):
+    assert check_startup() == 0
+    assert "[FAIL]" not in capsys.readouterr().out
@@ -0,0 +1,43 @@
+import os
+from utils.watcher import PipelineWatcher
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def make_watcher(tmp_path, run):
+    raw_dir = str(tmp_path / "raw")
+    export, formatted = os.path.join(raw_dir, "export.json"), os.path.join(raw_dir, "formatted.json")
+    cleaned = str(tmp_path / "processed" / "cleaned.json")
+    stages = [
+        {"name": "prepare", "inputs": [export], "outputs": [formatted], "run": run},
+        {"name": "clean", "inputs": [formatted], "outputs": [cleaned], "run": lambda context: write(cleaned, "[]")},
+    ]
+    watcher = PipelineWatcher(stages=stages, raw_dir=raw_dir, latency_log_path=str(tmp_path / "latency.ndjson"))
+    return watcher, export, formatted
+
+
+def test_own_outputs_are_not_new_changes(tmp_path):
+    watcher, export, formatted = make_watcher(tmp_path, lambda context: write(formatted, "[]"))
+    write(export, "[1]")
+
+    record = watcher.poll_once()
+    assert [stage["name"] for stage in record["stages"]] == ["prepare", "clean"]
+    assert watcher.detect_file_changes() == {}
+
+
+def test_export_landing_during_update_is_processed_next_poll(tmp_path):
+    export_path = str(tmp_path / "raw" / "export.json")
+
+    def prepare_while_new_export_lands(context):
+        write(formatted, "[]")
+        write(export_path, "[1, 2]")
+
+    watcher, export, formatted = make_watcher(tmp_path, prepare_while_new_export_lands)
+    write(export, "[1]")
+    watcher.poll_once()
+
+    assert list(watcher.detect_file_changes()) == [export]
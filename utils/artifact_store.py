@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+ARTIFACT_STORE_DIR = os.path.join("data", "artifacts")
+MANIFEST_FILE_NAME = "manifest.json"
+FILES_DIR_NAME = "files"
+
+# Bump to invalidate every stored artifact (e.g. when the storage layout changes)
+STORE_VERSION = 1
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+# ===========================
+# HASHING
+# ===========================
+
+_file_hash_cache = {}
+
+
+def file_hash(path):
+    """sha256 of a file's content (or of a directory's files and names), cached per (path, mtime, size)."""
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode("utf-8"))
+                digest.update(file_hash(file_path).encode("ascii"))
+        return digest.hexdigest()
+
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if cache_key not in _file_hash_cache:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        _file_hash_cache[cache_key] = digest.hexdigest()
+    return _file_hash_cache[cache_key]
+
+
+def artifact_key(stage, inputs=(), configs=(), code=(), params=None):
+    """
+    Key of a stage's outputs: a hash of the stage name, the content of its input files, the
+    relevant config files, the code files implementing it and any extra parameters.
+    Missing files hash as None, so creating them later changes the key.
+    """
+    description = {
+        "store_version": STORE_VERSION,
+        "stage": stage,
+        "inputs": {path: file_hash(path) for path in inputs},
+        "configs": {path: file_hash(path) for path in configs},
+        "code": {path: file_hash(path) for path in code},
+        "params": params
+    }
+    encoded = json.dumps(description, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def output_signature(path):
+    """What identifies one version of an output: (mtime, size) of a file, or of every file in a directory."""
+    if os.path.isdir(path):
+        signature = []
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                stat = os.stat(os.path.join(root, name))
+                signature.append((os.path.relpath(os.path.join(root, name), path), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def directory_size(path):
+    """Total size in bytes of the files under path."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+def format_size(size):
+    """Human readable byte count, e.g. 1536 -> '1.5 KB'."""
+    for unit in ["B", "KB", "MB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+# ===========================
+# ARTIFACT STORE
+# ===========================
+
+class ArtifactStore:
+    """
+    Content-addressed store of stage outputs. Each saved set of outputs (a "generation") lives in
+    <root>/<stage>/<key>/ with a manifest, so rerunning a stage with unchanged inputs, configs and
+    code restores its outputs instead of recomputing them.
+    """
+
+    def __init__(self, root=ARTIFACT_STORE_DIR):
+        self.root = root
+
+    def _artifact_dir(self, stage, key):
+        return os.path.join(self.root, stage, key)
+
+    def lookup(self, stage, key):
+        """Returns the manifest of a stored artifact, or None if there is none."""
+        manifest_path = os.path.join(self._artifact_dir(stage, key), MANIFEST_FILE_NAME)
+        try:
+            with open(manifest_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save(self, stage, key, outputs):
+        """Copies the output files/directories of a stage run into the store."""
+        artifact_dir = self._artifact_dir(stage, key)
+        tmp_dir = f"{artifact_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(os.path.join(tmp_dir, FILES_DIR_NAME))
+
+        stored = []
+        for index, path in enumerate(outputs):
+            if not os.path.exists(path):
+                continue
+            target = os.path.join(tmp_dir, FILES_DIR_NAME, str(index))
+            if os.path.isdir(path):
+                shutil.copytree(path, target)
+            else:
+                shutil.copy(path, target)
+            stored.append({"path": path, "stored_as": str(index), "is_dir": os.path.isdir(path)})
+
+        manifest = {"stage": stage, "key": key, "created": time.time(), "outputs": stored}
+        with open(os.path.join(tmp_dir, MANIFEST_FILE_NAME), "w") as f:
+            json.dump(manifest, f, indent=4)
+
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+        os.replace(tmp_dir, artifact_dir)
+        return manifest
+
+    def restore(self, manifest):
+        """Copies a stored artifact's outputs back to their original paths."""
+        artifact_dir = self._artifact_dir(manifest["stage"], manifest["key"])
+        for output in manifest["outputs"]:
+            source = os.path.join(artifact_dir, FILES_DIR_NAME, output["stored_as"])
+            directory = os.path.dirname(output["path"])
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Plain copies (fresh mtimes) so restored files never look like stale cached hashes
+            if output["is_dir"]:
+                # Replace the directory, so files of another generation don't linger next to the restored ones
+                shutil.rmtree(output["path"], ignore_errors=True)
+                shutil.copytree(source, output["path"], copy_function=shutil.copy)
+            else:
+                shutil.copy(source, output["path"])
+
+        # Mark the generation as recently used so garbage collection keeps it
+        os.utime(os.path.join(artifact_dir, MANIFEST_FILE_NAME))
+
+    def run_cached(self, stage, run, inputs=(), outputs=(), configs=(), code=(), params=None):
+        """
+        Restores the stage's outputs if an artifact with the same key exists, otherwise runs it
+        and stores the outputs. Returns True when the outputs came from the store.
+
+        Outputs are only stored when the run rewrote every one of them: a stage that swallowed its
+        own error would otherwise leave stale or missing outputs stored under the new key. Such a
+        run raises RuntimeError instead.
+        """
+        key = artifact_key(stage, inputs, configs, code, params)
+        manifest = self.lookup(stage, key)
+        if manifest is not None:
+            self.restore(manifest)
+            return True
+
+        before = {path: output_signature(path) for path in outputs}
+        run()
+        stale = [path for path in outputs if output_signature(path) in (None, (), before[path])]
+        if stale:
+            raise RuntimeError(f"Stage {stage} did not write {stale}; its outputs were not stored.")
+        self.save(stage, key, outputs)
+        return False
+
+    # ----- garbage collection -----
+
+    def generations(self, stage):
+        """Stored artifacts of a stage as (last used time, key, path), most recent first."""
+        stage_dir = os.path.join(self.root, stage)
+        found = []
+        for key in os.listdir(stage_dir):
+            manifest_path = os.path.join(stage_dir, key, MANIFEST_FILE_NAME)
+            if os.path.isfile(manifest_path):
+                found.append((os.path.getmtime(manifest_path), key, os.path.join(stage_dir, key)))
+            elif ".tmp-" in key:
+                # Leftover of an interrupted save
+                found.append((0.0, key, os.path.join(stage_dir, key)))
+        return sorted(found, reverse=True)
+
+    def stages(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def collect_garbage(self, keep=3, dry_run=False):
+        """
+        Deletes all but the `keep` most recently used generations of every stage.
+
+        :return: Dict of stage -> {"kept", "removed", "kept_bytes", "freed_bytes"}.
+        """
+        report = {}
+        for stage in self.stages():
+            kept, removed = [], []
+            for rank, (_, key, path) in enumerate(self.generations(stage)):
+                (kept if rank < keep and ".tmp-" not in key else removed).append(path)
+
+            freed = sum(directory_size(path) for path in removed)
+            if not dry_run:
+                for path in removed:
+                    shutil.rmtree(path, ignore_errors=True)
+            report[stage] = {
+                "kept": len(kept),
+                "removed": len(removed),
+                "kept_bytes": sum(directory_size(path) for path in kept),
+                "freed_bytes": freed
+            }
+        return report
@@ -0,0 +1,256 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from utils.logging import log_message
+from utils.artifact_store import file_hash
+
+# matplotlib is only imported inside the drawing functions, in the processes that render
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+RENDER_MANIFEST_FILENAME = ".render_manifest.json"
+DEFAULT_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+DPI = 100
+
+# Chart kinds
+BAR_CHART = "bar_chart"
+GROUPED_BAR_CHART = "grouped_bar_chart"
+STACKED_BAR_CHART = "stacked_bar_chart"
+PARALLEL_COORDINATES_PLOT = "parallel_coordinates_plot"
+BOXPLOT = "boxplot"
+VIOLIN_PLOT = "violin_plot"
+HISTOGRAM = "histogram"
+
+
+# ===========================
+# DRAWING
+# ===========================
+# Every drawing function fills the axes of an explicit Figure from a job's JSON-serializable
+# "data"; nothing touches pyplot's global state, so charts can be drawn in any process or thread.
+# Bar charts take {"teams": [...], "metrics": {metric: [value per team]}}; distribution charts
+# take the per-match values sliced from the long-format table (see utils.match_table).
+
+def _style_team_axis(ax, teams, ylabel):
+    ax.set_xticks(range(len(teams)))
+    ax.set_xticklabels(teams, rotation=45, ha="right")
+    ax.set_xlabel("Teams")
+    ax.set_ylabel(ylabel)
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+    ax.set_axisbelow(True)
+
+
+def draw_bar_chart(fig, data, title):
+    """A simple bar chart for a single metric comparison."""
+    ax = fig.add_subplot()
+    (metric, values), = data["metrics"].items()
+    ax.bar(range(len(data["teams"])), values, color="skyblue", edgecolor="black")
+    ax.set_title(title)
+    _style_team_axis(ax, data["teams"], metric)
+
+
+def draw_grouped_bar_chart(fig, data, title):
+    """A grouped bar chart comparing teams for each variable metric."""
+    import numpy as np
+    from matplotlib import colormaps
+
+    ax = fig.add_subplot()
+    positions = np.arange(len(data["teams"]))
+    width = 0.8 / len(data["metrics"])
+    colors = colormaps["viridis"](np.linspace(0, 1, len(data["metrics"])))
+    for index, (metric, values) in enumerate(data["metrics"].items()):
+        ax.bar(positions - 0.4 + width * (index + 0.5), values, width, label=metric, color=colors[index])
+    ax.set_title(title)
+    ax.legend(title="Metrics")
+    _style_team_axis(ax, data["teams"], "Values")
+
+
+def draw_stacked_bar_chart(fig, data, title):
+    """A stacked bar chart comparing teams across multiple metrics."""
+    import numpy as np
+    from matplotlib import colormaps
+
+    ax = fig.add_subplot()
+    positions = np.arange(len(data["teams"]))
+    bottom = np.zeros(len(positions))
+    colors = colormaps["plasma"](np.linspace(0, 1, len(data["metrics"])))
+    for index, (metric, values) in enumerate(data["metrics"].items()):
+        values = np.asarray(values, dtype=float)
+        ax.bar(positions, values, 0.5, bottom=bottom, label=metric, color=colors[index])
+        bottom += values
+    ax.set_title(title)
+    ax.legend(title="Metrics")
+    _style_team_axis(ax, data["teams"], "Values")
+
+
+def draw_parallel_coordinates_plot(fig, data, title):
+    """A parallel coordinates plot comparing the metrics of every team, each scaled to 0-1."""
+    import numpy as np
+    from matplotlib import colormaps
+
+    ax = fig.add_subplot()
+    metrics = list(data["metrics"])
+    table = np.array([data["metrics"][metric] for metric in metrics], dtype=float)
+    spread = table.max(axis=1, keepdims=True) - table.min(axis=1, keepdims=True)
+    normalized = (table - table.min(axis=1, keepdims=True)) / np.where(spread == 0, 1, spread)
+
+    colors = colormaps["tab10"]
+    for index, team in enumerate(data["teams"]):
+        ax.plot(range(len(metrics)), normalized[:, index], linewidth=2, color=colors(index % 10), label=team)
+    for position in range(len(metrics)):
+        ax.axvline(position, color="black", linewidth=1)
+    ax.set_xticks(range(len(metrics)))
+    ax.set_xticklabels(metrics, rotation=45, ha="right")
+    ax.set_title(title)
+    ax.set_xlabel("Metrics")
+    ax.set_ylabel("Normalized Values (0-1)")
+    ax.grid(True)
+    ax.legend(title="Teams", bbox_to_anchor=(1.05, 1), loc="upper left")
+
+
+def draw_boxplot(fig, data, title):
+    """Boxplots of a variable per team; data is {"variable", "groups": {team: [values]}}."""
+    ax = fig.add_subplot()
+    teams = list(data["groups"])
+    ax.boxplot([data["groups"][team] for team in teams])
+    ax.set_xticks(range(1, len(teams) + 1))
+    ax.set_xticklabels(teams, rotation=45, ha="right")
+    ax.set_title(title)
+    ax.set_xlabel("Teams")
+    ax.set_ylabel(data["variable"].replace("_", " ").title())
+
+
+def draw_violin_plot(fig, data, title):
+    """Violin plots of a variable per team; teams with fewer than two values are drawn as points."""
+    ax = fig.add_subplot()
+    teams = list(data["groups"])
+    spread = [(position, values) for position, values in enumerate(data["groups"].values(), start=1)
+              if len(set(values)) > 1]
+    if spread:
+        ax.violinplot([values for _, values in spread], positions=[position for position, _ in spread],
+                      showmedians=True)
+    for position, values in enumerate(data["groups"].values(), start=1):
+        if 0 < len(set(values)) <= 1:
+            ax.plot([position] * len(values), values, "o", color="tab:blue")
+    ax.set_xticks(range(1, len(teams) + 1))
+    ax.set_xticklabels(teams, rotation=45, ha="right")
+    ax.set_title(title)
+    ax.set_xlabel("Teams")
+    ax.set_ylabel(data["variable"].replace("_", " ").title())
+
+
+def draw_histogram(fig, data, title):
+    """Overlaid histograms of every match value of each variable; data is {"variables": {variable: [values]}}."""
+    ax = fig.add_subplot()
+    for variable, values in data["variables"].items():
+        ax.hist(values, bins=data.get("bins", 20), alpha=0.6, edgecolor="black", label=variable)
+    ax.set_title(title)
+    ax.set_xlabel("Value")
+    ax.set_ylabel("Matches")
+    ax.legend(title="Variables")
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+    ax.set_axisbelow(True)
+
+
+CHART_DRAWERS = {
+    BAR_CHART: draw_bar_chart,
+    GROUPED_BAR_CHART: draw_grouped_bar_chart,
+    STACKED_BAR_CHART: draw_stacked_bar_chart,
+    PARALLEL_COORDINATES_PLOT: draw_parallel_coordinates_plot,
+    BOXPLOT: draw_boxplot,
+    VIOLIN_PLOT: draw_violin_plot,
+    HISTOGRAM: draw_histogram,
+}
+
+
+# ===========================
+# JOBS
+# ===========================
+
+def chart_job(kind, title, data, save_path, figsize=(12, 6)):
+    """A chart to render: everything the drawing function needs, so it can be hashed and pickled."""
+    if kind not in CHART_DRAWERS:
+        raise ValueError(f"Invalid chart kind '{kind}': must be one of {sorted(CHART_DRAWERS)}.")
+    return {"kind": kind, "title": title, "data": data, "path": save_path, "figsize": list(figsize)}
+
+
+def job_hash(job):
+    """Hash of a chart's data slice, its settings and the drawing code."""
+    description = {key: job[key] for key in ("kind", "title", "data", "figsize")}
+    description["code"] = file_hash(__file__)
+    return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def render_chart(job):
+    """Draws one chart on its own Agg-backed Figure and saves it. Returns the saved path."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=job["figsize"], dpi=DPI)
+    FigureCanvasAgg(fig)
+    CHART_DRAWERS[job["kind"]](fig, job["data"], job["title"])
+    fig.savefig(job["path"], bbox_inches="tight")
+    return job["path"]
+
+
+# ===========================
+# RENDERING
+# ===========================
+
+def load_render_manifest(manifest_path):
+    """Saved path -> hash of the chart it holds."""
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_render_manifest(manifest, manifest_path):
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def render_charts(jobs, output_dir, workers=DEFAULT_RENDER_WORKERS, force=False):
+    """
+    Renders chart jobs into output_dir, skipping every chart whose file still exists and whose
+    data slice, settings and drawing code hash the same as when it was last rendered (recorded in
+    output_dir/.render_manifest.json). Charts left to render are spread over a process pool.
+
+    :return: Dict with the "rendered" and "skipped" paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, RENDER_MANIFEST_FILENAME)
+    manifest = {} if force else load_render_manifest(manifest_path)
+
+    stale, skipped = [], []
+    for job in jobs:
+        key = job_hash(job)
+        if manifest.get(job["path"]) == key and os.path.exists(job["path"]):
+            skipped.append(job["path"])
+        else:
+            stale.append((job, key))
+
+    rendered = []
+    try:
+        if workers <= 1 or len(stale) <= 1:
+            for job, key in stale:
+                rendered.append(render_chart(job))
+                manifest[job["path"]] = key
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(stale))) as executor:
+                for (job, key), path in zip(stale, executor.map(render_chart, [job for job, _ in stale])):
+                    rendered.append(path)
+                    manifest[job["path"]] = key
+    finally:
+        # Charts rendered before a failure stay recorded
+        save_render_manifest(manifest, manifest_path)
+
+    for path in rendered:
+        log_message("INFO", f"Chart saved: {path}")
+    log_message("INFO", f"Rendered {len(rendered)} charts, {len(skipped)} unchanged")
+    return {"rendered": rendered, "skipped": skipped}
@@ -0,0 +1,171 @@
+import os
+import sys
+import argparse
+
+# Only a few standard library modules are imported here: every stage script (and with it pandas,
+# numpy or matplotlib) is loaded when its subcommand runs, so `reefscape --help` and other light
+# commands start in milliseconds.
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+# Subcommand -> (script relative to the repository root, help text)
+COMMANDS = {
+    "reset": ("data_analysis_preperation/01_reset_all_folders.py",
+              "Garbage-collect stored artifacts, or wipe the data folders with --wipe."),
+    "prepare": ("data_analysis_preperation/fused_raw_data_preparation.py",
+                "Turn the raw export into formatted match data in one pass."),
+    "validate-matches": ("invalid_entries.py", "Remove duplicate submissions and void invalid matches."),
+    "extract-match-apps": ("matchapps_data.py", "Extract the matchApp entries of the raw export."),
+    "clean": ("data_analysis_scripts/01_data_cleaning_and_preprocessing.py", "01: Clean and validate entries."),
+    "restructure": ("data_analysis_scripts/02_team_based_match_data_restructuring.py",
+                    "02: Group cleaned entries by team."),
+    "stats": ("data_analysis_scripts/03_data_analysis_and_statistics_aggregation.py",
+              "03: Aggregate team statistics."),
+    "visualize": ("data_analysis_scripts/04_visualizations.py", "04: Render the configured charts."),
+    "report": ("data_analysis_scripts/05_team_reports.py", "05: Write a one-page summary of every team to one PDF."),
+    "pipeline": ("data_analysis_scripts/run_pipeline.py", "Run every stage once, skipping unchanged ones."),
+    "watch": ("data_analysis_scripts/watch_pipeline.py", "Rerun affected stages whenever raw data changes."),
+    "leaderboard": ("data_analysis_scripts/scouter_leaderboard.py", "Build the scouter accuracy leaderboard."),
+    "leaderboard-live": ("data_analysis_scripts/scouter_leaderboard_live.py",
+                         "Update the scouter leaderboard incrementally."),
+    "multi-event": ("data_analysis_scripts/multi_event_runner.py", "Run the leaderboard across several events."),
+}
+
+# Modules that must never be imported by a lightweight command
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "scipy"]
+# Import time a lightweight command may add on top of a bare interpreter start
+DEFAULT_STARTUP_BUDGET_MS = 100.0
+STARTUP_CHECK_COMMANDS = [["--help"], ["pipeline", "--help"], ["watch", "--help"], ["prepare", "--help"],
+                          ["clean", "--help"], ["restructure", "--help"], ["stats", "--help"]]
+
+IMPORTTIME_PATTERN = r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)"
+
+
+# ===========================
+# DISPATCH
+# ===========================
+
+def run_script(relative_path, argv):
+    """Loads a stage script and runs its main(), passing argv through if main accepts it."""
+    import inspect
+    from utils.script_loader import load_script
+
+    module = load_script(relative_path)
+    # Scripts that parse sys.argv themselves see the subcommand's arguments
+    sys.argv = [relative_path] + list(argv)
+    if inspect.signature(module.main).parameters:
+        return module.main(list(argv))
+    if argv:
+        print(f"{relative_path} takes no arguments, got {argv}")
+        return 2
+    return module.main()
+
+
+# ===========================
+# STARTUP CHECK
+# ===========================
+
+def measure_startup(command):
+    """
+    Runs `reefscape <command>` in a fresh interpreter under -X importtime. An empty command
+    measures a bare interpreter start instead.
+
+    :return: Dict with the "wall_ms" of the process, the cumulative "import_ms" of all top-level
+             imports and the "heavy" modules that were imported.
+    """
+    import re
+    import time
+    import subprocess
+
+    code = "import sys; from utils.cli import main; sys.exit(main(sys.argv[1:]))" if command else "pass"
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code, *command],
+                               capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    import_us = 0
+    imported = set()
+    for match in re.finditer(IMPORTTIME_PATTERN, completed.stderr):
+        imported.add(match.group(4).split(".")[0])
+        # Nested imports are indented; top-level ones already include their children
+        if len(match.group(3)) == 1:
+            import_us += int(match.group(2))
+
+    return {
+        "command": " ".join(command),
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(import_us / 1000, 1),
+        "heavy": sorted(imported.intersection(HEAVY_MODULES)),
+        "returncode": completed.returncode
+    }
+
+
+def check_startup(budget_ms=DEFAULT_STARTUP_BUDGET_MS, commands=STARTUP_CHECK_COMMANDS):
+    """
+    Fails (returns 1) if a lightweight command imports a heavy library or adds more import time
+    than the budget on top of a bare interpreter start (site packages, encodings, ...).
+    Import time is checked rather than wall time, which mostly depends on the machine.
+    """
+    baseline = measure_startup([])
+    print(f"[INFO] Bare interpreter: {baseline['import_ms']} ms imports, {baseline['wall_ms']} ms wall")
+
+    failed = False
+    for command in commands:
+        result = measure_startup(command)
+        added_ms = round(result["import_ms"] - baseline["import_ms"], 1)
+        problems = []
+        if result["returncode"] != 0:
+            problems.append(f"exit code {result['returncode']}")
+        if result["heavy"]:
+            problems.append(f"imports {', '.join(result['heavy'])}")
+        if added_ms > budget_ms:
+            problems.append(f"adds {added_ms} ms of imports > {budget_ms} ms")
+        failed = failed or bool(problems)
+
+        status = "FAIL" if problems else "OK"
+        print(f"[{status}] reefscape {result['command']}: +{added_ms} ms imports, "
+              f"{result['wall_ms']} ms wall" + (f" ({'; '.join(problems)})" if problems else ""))
+    return 1 if failed else 0
+
+
+# ===========================
+# CLI
+# ===========================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="reefscape", description="Reefscape scouting data pipeline.")
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+    for name, (_, help_text) in COMMANDS.items():
+        # Arguments are parsed by the stage script itself
+        subparsers.add_parser(name, help=help_text, add_help=False)
+
+    startup = subparsers.add_parser("check-startup", help="Check that lightweight commands start fast.")
+    startup.add_argument("--budget-ms", type=float, default=DEFAULT_STARTUP_BUDGET_MS,
+                         help="Maximum import time a lightweight command may add to a bare interpreter start.")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 0
+    if args.command == "check-startup":
+        if rest:
+            parser.error(f"unrecognized arguments: {' '.join(rest)}")
+        return check_startup(args.budget_ms)
+
+    # Stage scripts use paths relative to the repository root
+    from utils.script_loader import REPO_ROOT
+    if not os.path.isdir(os.path.join(os.getcwd(), "config")) and os.path.isdir(os.path.join(REPO_ROOT, "config")):
+        print(f"[WARNING] No config/ folder in {os.getcwd()}; run reefscape from the repository root.")
+    return run_script(COMMANDS[args.command][0], rest) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
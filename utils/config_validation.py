@@ -0,0 +1,422 @@
+import os
+import json
+import math
+import hashlib
+from utils.artifact_store import file_hash
+from utils.dictionary_manipulation import flatten_vars_in_dict
+from utils.match_scheduling import DEFAULT_SCHEDULE_CONFIG
+from utils.raw_export import DEFAULT_RAW_EXPORT_CONFIG
+from utils.data_generation import (DEFAULT_SCOUTER_ERROR_MODEL, STATISTICAL_DATA_TYPES, QUANTITATIVE, CATEGORICAL,
+                                   BINARY, correlation_groups)
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+VALIDATION_CACHE_PATH = os.path.join("data", "artifacts", "config_validation_cache.json")
+# Results kept in the cache file; older ones are dropped first
+MAX_CACHED_RESULTS = 32
+
+ERROR = "ERROR"
+WARNING = "WARNING"
+
+SCOUTER_ERROR_CHANCES = ["missing_values_chance", "flip_chance"]
+DEFAULT_SCOUTER_ERROR_MODEL_NAME = "default"
+
+
+class ConfigValidationError(ValueError):
+    """Raised by require_valid_generation_config; `errors` holds the structured errors."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("\n".join(format_error(error) for error in errors))
+
+
+def _error(path, message, level=ERROR):
+    return {"level": level, "path": path, "message": message}
+
+
+def format_error(error):
+    return f"[{error['level']}] {error['path']}: {error['message']}"
+
+
+def has_errors(errors):
+    """True if any error (not just warnings) was found."""
+    return any(error["level"] == ERROR for error in errors)
+
+
+# ===========================
+# PRIMITIVE CHECKS
+# ===========================
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_number(errors, parent, key, path, minimum=None, maximum=None, integer=False, required=True):
+    """Checks parent[key] is a number (an int if integer) within [minimum, maximum]; returns it or None."""
+    if not isinstance(parent, dict) or key not in parent:
+        if required:
+            errors.append(_error(path, "missing key"))
+        return None
+    value = parent[key]
+    if integer and (not isinstance(value, int) or isinstance(value, bool)):
+        errors.append(_error(path, f"invalid data type '{type(value).__name__}': must be 'int'"))
+        return None
+    if not _is_number(value):
+        errors.append(_error(path, f"invalid data type '{type(value).__name__}': must be 'int' or 'float'"))
+        return None
+    if minimum is not None and value < minimum or maximum is not None and value > maximum:
+        bounds = f"between {minimum} and {maximum}" if minimum is not None and maximum is not None else \
+            f">= {minimum}" if minimum is not None else f"<= {maximum}"
+        errors.append(_error(path, f"invalid value {value}: must be {bounds}"))
+        return None
+    return value
+
+
+def _check_unknown_keys(errors, section, allowed, path):
+    for key in section:
+        if key not in allowed:
+            errors.append(_error(f"{path}.{key}", f"unknown key: must be one of {sorted(allowed)}", WARNING))
+
+
+def _check_distribution(errors, distribution, expected_values, path):
+    """An unfair_distribution: chances between 0 and 1 summing to 1, over exactly the expected values."""
+    if not isinstance(distribution, dict) or not distribution:
+        errors.append(_error(path, "must be a non-empty object of value -> chance"))
+        return
+    total = 0
+    for value, chance in distribution.items():
+        if _check_number(errors, distribution, value, f"{path}.{value}", 0, 1) is not None:
+            total += chance
+    if not math.isclose(total, 1, abs_tol=1e-9):
+        errors.append(_error(path, f"chances sum to {total}: must sum to 1"))
+    if expected_values is not None and set(distribution) != set(expected_values):
+        errors.append(_error(path, f"values {sorted(distribution)} must match the expected values {sorted(expected_values)}"))
+
+
+# ===========================
+# COMPILED VARIABLE CHECKS
+# ===========================
+
+def _quantitative_checks(errors, var_config, path):
+    deviation = var_config.get("data_deviation")
+    if not isinstance(deviation, list) or not deviation or not isinstance(deviation[0], dict):
+        errors.append(_error(f"{path}.data_deviation", "must be a list holding one {mean, standard_deviation} object"))
+    else:
+        _check_number(errors, deviation[0], "mean", f"{path}.data_deviation.mean")
+        _check_number(errors, deviation[0], "standard_deviation", f"{path}.data_deviation.standard_deviation", minimum=0)
+    _check_number(errors, var_config, "missing_values_filler", f"{path}.missing_values_filler")
+    _check_number(errors, var_config, "positive_outliers_chance", f"{path}.positive_outliers_chance", 0, 1)
+    amount = _check_number(errors, var_config, "positive_outliers_amount_of_std_devs",
+                           f"{path}.positive_outliers_amount_of_std_devs")
+    if amount is not None and amount <= 0:
+        errors.append(_error(f"{path}.positive_outliers_amount_of_std_devs", f"invalid value {amount}: must be > 0"))
+    _check_number(errors, var_config, "skill_effect", f"{path}.skill_effect", required=False)
+
+
+def _choice_checks(expected_values, filler_type):
+    def check(errors, var_config, path):
+        fair = var_config.get("fair_distribution")
+        if not isinstance(fair, bool):
+            errors.append(_error(f"{path}.fair_distribution", "must be 'bool' (true/false)"))
+        distribution = var_config.get("unfair_distribution")
+        # The generator always samples from unfair_distribution, so it must be valid either way
+        if not isinstance(distribution, list) or not distribution:
+            errors.append(_error(f"{path}.unfair_distribution", "must be a list holding one value -> chance object"))
+        else:
+            _check_distribution(errors, distribution[0], expected_values, f"{path}.unfair_distribution")
+        if "missing_values_filler" not in var_config:
+            errors.append(_error(f"{path}.missing_values_filler", "missing key"))
+        elif not isinstance(var_config["missing_values_filler"], filler_type):
+            errors.append(_error(f"{path}.missing_values_filler", f"invalid data type "
+                                 f"'{type(var_config['missing_values_filler']).__name__}': must be '{filler_type.__name__}'"))
+    return check
+
+
+_binary_choice_checks = _choice_checks(["true", "false"], bool)
+
+
+def _binary_checks(errors, var_config, path):
+    _binary_choice_checks(errors, var_config, path)
+    _check_number(errors, var_config, "skill_effect", f"{path}.skill_effect", required=False)
+
+
+def _categorical_checks(expected_values):
+    choice_checks = _choice_checks(expected_values, str)
+
+    def check(errors, var_config, path):
+        choice_checks(errors, var_config, path)
+        if "skill_effect" in var_config:
+            errors.append(_error(f"{path}.skill_effect", "has no effect on categorical variables", WARNING))
+    return check
+
+
+def compile_variable_checks(expected_data_structure):
+    """
+    Builds the checks of every expected variable once: variable name -> (statistical data type,
+    check(errors, var_config, path)). Invalid expected data structure entries compile to None.
+    """
+    checks = {}
+    for var_key, properties in flatten_vars_in_dict(expected_data_structure.get("variables", {})).items():
+        statistical_data_type = properties.get("statistical_data_type") if isinstance(properties, dict) else None
+        if statistical_data_type == QUANTITATIVE:
+            check = _quantitative_checks
+        elif statistical_data_type == BINARY:
+            check = _binary_checks
+        elif statistical_data_type == CATEGORICAL:
+            check = _categorical_checks(properties.get("values"))
+        else:
+            check = None
+        checks[var_key] = (statistical_data_type, check)
+    return checks
+
+
+_compiled_checks = {}
+
+
+def _variable_checks(expected_data_structure, structure_hash):
+    if structure_hash not in _compiled_checks:
+        _compiled_checks[structure_hash] = compile_variable_checks(expected_data_structure)
+    return _compiled_checks[structure_hash]
+
+
+# ===========================
+# SECTION CHECKS
+# ===========================
+
+def _check_quantity(errors, config, expected_data_structure):
+    quantity = config.get("data_quantity")
+    if not isinstance(quantity, dict):
+        errors.append(_error("data_quantity", "missing key"))
+        return None
+    teams_per_match = _check_number(errors, quantity, "teams_per_match", "data_quantity.teams_per_match", 2, integer=True)
+    if teams_per_match is not None and teams_per_match % 2:
+        errors.append(_error("data_quantity.teams_per_match", f"invalid value {teams_per_match}: must be even (two alliances)"))
+    number_of_teams = _check_number(errors, quantity, "number_of_teams", "data_quantity.number_of_teams", 1, integer=True)
+    _check_number(errors, quantity, "number_of_matches_per_team", "data_quantity.number_of_matches_per_team", 1, integer=True)
+
+    if teams_per_match is None:
+        return None
+    if number_of_teams is not None and number_of_teams < teams_per_match:
+        errors.append(_error("data_quantity.number_of_teams",
+                             f"invalid value {number_of_teams}: must be >= teams_per_match ({teams_per_match})"))
+    positions = expected_data_structure.get("metadata", {}).get("robotPosition", {}).get("values", [])
+    if len(positions) < teams_per_match:
+        errors.append(_error("data_quantity.teams_per_match", f"only {len(positions)} robot positions are expected "
+                             f"(expected_data_structure metadata.robotPosition): must be >= teams_per_match"))
+    return teams_per_match
+
+
+def _check_scouters(errors, config, teams_per_match):
+    scouters = config.get("scouter_names")
+    if not isinstance(scouters, list) or not all(isinstance(name, str) for name in scouters):
+        errors.append(_error("scouter_names", "must be a list of names"))
+        return []
+    if len(set(scouters)) != len(scouters):
+        errors.append(_error("scouter_names", "contains duplicate names"))
+    if teams_per_match is not None and len(scouters) < teams_per_match:
+        errors.append(_error("scouter_names", f"{len(scouters)} scouters: must be >= teams_per_match ({teams_per_match}) "
+                             "so every robot of a match has its own scouter"))
+    return scouters
+
+
+def _check_schedule(errors, config):
+    schedule = config.get("schedule", {})
+    if not isinstance(schedule, dict):
+        errors.append(_error("schedule", "must be an object"))
+        return
+    _check_unknown_keys(errors, schedule, DEFAULT_SCHEDULE_CONFIG, "schedule")
+    for key in DEFAULT_SCHEDULE_CONFIG:
+        _check_number(errors, schedule, key, f"schedule.{key}", 0, integer=True, required=False)
+
+
+def _check_team_model(errors, config):
+    team_model = config.get("team_model", {})
+    if not isinstance(team_model, dict):
+        errors.append(_error("team_model", "must be an object"))
+        return
+    _check_unknown_keys(errors, team_model, ["skill_standard_deviation"], "team_model")
+    _check_number(errors, team_model, "skill_standard_deviation", "team_model.skill_standard_deviation", 0, required=False)
+
+
+def _check_scouter_error_models(errors, config, scouters):
+    models = config.get("scouter_error_models", {})
+    if not isinstance(models, dict):
+        errors.append(_error("scouter_error_models", "must be an object of scouter name -> error model"))
+        return
+    for name, model in models.items():
+        path = f"scouter_error_models.{name}"
+        if name != DEFAULT_SCOUTER_ERROR_MODEL_NAME and name not in scouters:
+            errors.append(_error(path, "not in scouter_names; the model is never used", WARNING))
+        if not isinstance(model, dict):
+            errors.append(_error(path, "must be an object"))
+            continue
+        _check_unknown_keys(errors, model, DEFAULT_SCOUTER_ERROR_MODEL, path)
+        _check_number(errors, model, "bias", f"{path}.bias", required=False)
+        _check_number(errors, model, "noise_standard_deviation", f"{path}.noise_standard_deviation", 0, required=False)
+        for key in SCOUTER_ERROR_CHANCES:
+            _check_number(errors, model, key, f"{path}.{key}", 0, 1, required=False)
+
+
+def _check_raw_export(errors, config):
+    raw_export = config.get("raw_export", {})
+    if not isinstance(raw_export, dict):
+        errors.append(_error("raw_export", "must be an object"))
+        return
+    _check_unknown_keys(errors, raw_export, DEFAULT_RAW_EXPORT_CONFIG, "raw_export")
+    if not isinstance(raw_export.get("super_app", True), bool):
+        errors.append(_error("raw_export.super_app", "must be 'bool' (true/false)"))
+    corruption = raw_export.get("corruption", {})
+    if not isinstance(corruption, dict):
+        errors.append(_error("raw_export.corruption", "must be an object"))
+        return
+    _check_unknown_keys(errors, corruption, DEFAULT_RAW_EXPORT_CONFIG["corruption"], "raw_export.corruption")
+    for key in DEFAULT_RAW_EXPORT_CONFIG["corruption"]:
+        _check_number(errors, corruption, key, f"raw_export.corruption.{key}", 0, 1, required=False)
+
+
+def _check_correlations(errors, config, variable_types):
+    correlations = config.get("correlations", [])
+    if not isinstance(correlations, list):
+        errors.append(_error("correlations", "must be a list of {variables, coefficient} objects"))
+        return
+    valid = True
+    for index, correlation in enumerate(correlations):
+        path = f"correlations.{index}"
+        keys = correlation.get("variables") if isinstance(correlation, dict) else None
+        if not isinstance(keys, list) or len(keys) < 2:
+            errors.append(_error(f"{path}.variables", "must list at least two variables"))
+            valid = False
+            continue
+        for key in keys:
+            if variable_types.get(key) != QUANTITATIVE:
+                errors.append(_error(f"{path}.variables", f"'{key}' is not a quantitative variable of the config"))
+                valid = False
+        if _check_number(errors, correlation, "coefficient", f"{path}.coefficient", -1, 1) is None:
+            valid = False
+
+    # Coefficients that are fine one by one can still contradict each other
+    if valid and correlations:
+        try:
+            correlation_groups(config, variable_types)
+        except ValueError as e:
+            errors.append(_error("correlations", str(e)))
+
+
+def _check_variables(errors, config, variable_checks):
+    variables = config.get("variables")
+    if not isinstance(variables, dict):
+        errors.append(_error("variables", "missing key"))
+        return {}
+
+    # Keys are already flattened ("autoCoral.L4"), as written by 03_data_generation_config_json_creation.py
+    variable_types = {}
+    for var_key, var_config in variables.items():
+        path = f"variables.{var_key}"
+        if var_key not in variable_checks:
+            errors.append(_error(path, "not a variable of the expected data structure"))
+            continue
+        statistical_data_type, check = variable_checks[var_key]
+        if check is None:
+            errors.append(_error(path, f"invalid statistical data type '{statistical_data_type}' in the expected "
+                                 f"data structure: must be one of {STATISTICAL_DATA_TYPES}"))
+            continue
+        if not isinstance(var_config, dict):
+            errors.append(_error(path, "must be an object"))
+            continue
+        _check_number(errors, var_config, "missing_values_chance", f"{path}.missing_values_chance", 0, 1)
+        check(errors, var_config, path)
+        variable_types[var_key] = statistical_data_type
+
+    for var_key in variable_checks:
+        if var_key not in variables:
+            errors.append(_error(f"variables.{var_key}", "expected variable is not generated", WARNING))
+    return variable_types
+
+
+# ===========================
+# VALIDATION
+# ===========================
+
+def _content_hash(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def run_validation(config, expected_data_structure, structure_hash=None):
+    """Validates a data generation config without the cache; returns a list of structured errors."""
+    if not isinstance(config, dict):
+        return [_error("config", "must be a JSON object")]
+    if not isinstance(config.get("running_data_generation"), bool):
+        return [_error("running_data_generation", "must be 'bool' (true/false)")]
+    if not config["running_data_generation"]:
+        return []
+
+    structure_hash = structure_hash or _content_hash(expected_data_structure)
+    errors = []
+    teams_per_match = _check_quantity(errors, config, expected_data_structure)
+    scouters = _check_scouters(errors, config, teams_per_match)
+    _check_schedule(errors, config)
+    _check_team_model(errors, config)
+    _check_scouter_error_models(errors, config, scouters)
+    _check_raw_export(errors, config)
+    variable_types = _check_variables(errors, config, _variable_checks(expected_data_structure, structure_hash))
+    _check_correlations(errors, config, variable_types)
+    return errors
+
+
+_result_cache = {}
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_cache(cache, cache_path):
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def validate_generation_config(config, expected_data_structure, cache_path=VALIDATION_CACHE_PATH):
+    """
+    Validates a data generation config against the expected data structure and returns a list of
+    {"level", "path", "message"} errors (empty if valid).
+
+    Results are cached in memory and in cache_path (None to disable the file), keyed by the hashes
+    of the config, the expected data structure and this module, so a config that was already
+    validated costs two hashes and a lookup.
+    """
+    structure_hash = _content_hash(expected_data_structure)
+    key = hashlib.sha256(f"{_content_hash(config)}:{structure_hash}:{file_hash(__file__)}".encode("ascii")).hexdigest()
+    if key in _result_cache:
+        return _result_cache[key]
+
+    cache = _load_cache(cache_path) if cache_path else {}
+    if key in cache:
+        _result_cache[key] = cache[key]
+        return cache[key]
+
+    errors = run_validation(config, expected_data_structure, structure_hash)
+    _result_cache[key] = errors
+    if cache_path:
+        # dicts keep insertion order, so the oldest results are the first ones
+        cache[key] = errors
+        _save_cache(dict(list(cache.items())[-MAX_CACHED_RESULTS:]), cache_path)
+    return errors
+
+
+def require_valid_generation_config(config, expected_data_structure, cache_path=VALIDATION_CACHE_PATH):
+    """Like validate_generation_config, but raises ConfigValidationError on errors; returns the warnings."""
+    errors = validate_generation_config(config, expected_data_structure, cache_path)
+    if has_errors(errors):
+        raise ConfigValidationError(errors)
+    return errors
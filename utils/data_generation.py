@@ -0,0 +1,467 @@
+import heapq
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from utils.match_scheduling import schedule_matches, DEFAULT_SCHEDULE_CONFIG
+
+# ===========================
+# CONSTANTS
+# ===========================
+
+QUANTITATIVE = "quantitative"
+CATEGORICAL = "categorical"
+BINARY = "binary"
+STATISTICAL_DATA_TYPES = [QUANTITATIVE, CATEGORICAL, BINARY]
+
+# Schedulers
+BALANCED_SCHEDULER = "balanced"        # realistic: repeat, turnaround and red/blue constraints (utils.match_scheduling)
+ROUND_ROBIN_SCHEDULER = "round_robin"  # fastest: random permutation rounds, for load testing
+SCHEDULERS = [BALANCED_SCHEDULER, ROUND_ROBIN_SCHEDULER]
+
+# Entries generated (and written) at a time by generate_chunks
+DEFAULT_CHUNK_SIZE = 100_000
+# Matches checked at a time for duplicate teams in round_robin_schedule
+DUPLICATE_CHECK_BLOCK = 1 << 20
+
+
+# ===========================
+# SCHEDULE
+# ===========================
+
+def _repair_duplicate_rows(slots, teams_per_match):
+    """
+    Swaps teams so no match contains the same team twice. Duplicates only appear where one
+    permutation round ends and the next begins, so only a few rows are touched.
+    """
+    matches = slots.reshape(-1, teams_per_match)
+    # Sorted in blocks so detecting duplicates doesn't need a second copy of the whole schedule
+    pending = []
+    for start in range(0, len(matches), DUPLICATE_CHECK_BLOCK):
+        ordered = np.sort(matches[start:start + DUPLICATE_CHECK_BLOCK], axis=1)
+        pending.extend((start + np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))).tolist())
+    heapq.heapify(pending)
+
+    while pending:
+        row = heapq.heappop(pending)
+        seen = set()
+        for column in range(teams_per_match):
+            team = matches[row, column]
+            if team not in seen:
+                seen.add(team)
+                continue
+            # Swap with the closest later slot whose team is not in this match yet, preferring
+            # matches that don't contain the duplicate team (otherwise that match is repaired next)
+            fallback = None
+            for later in range((row + 1) * teams_per_match, slots.size):
+                candidate = slots[later]
+                if candidate in seen or candidate in matches[row, column + 1:]:
+                    continue
+                if team not in matches[later // teams_per_match]:
+                    break
+                if fallback is None:
+                    fallback = later
+            else:
+                later = fallback
+            if later is None:
+                continue
+            if team in matches[later // teams_per_match]:
+                heapq.heappush(pending, later // teams_per_match)
+            matches[row, column], slots[later] = slots[later], team
+            seen.add(matches[row, column])
+    return matches
+
+
+def round_robin_schedule(num_teams, num_matches_per_team, teams_per_match, rng):
+    """
+    Fills matches from consecutive random permutations of all teams, so every team plays
+    num_matches_per_team matches (a few play one more to fill the last match).
+
+    :return: int32 array of shape (matches, teams_per_match) with team numbers starting at 1.
+    """
+    if teams_per_match > num_teams:
+        raise ValueError(f"teams_per_match ({teams_per_match}) cannot be greater than total teams ({num_teams}).")
+
+    # Extra rounds pad the last match and give the duplicate repair room to swap
+    rounds = num_matches_per_team + 2
+    slots = np.tile(np.arange(1, num_teams + 1, dtype=np.int32), (rounds, 1))
+    rng.permuted(slots, axis=1, out=slots)
+    slots = slots.ravel()[:slots.size - slots.size % teams_per_match]
+    num_matches = -(-num_teams * num_matches_per_team // teams_per_match)
+    return _repair_duplicate_rows(slots, teams_per_match)[:num_matches]
+
+
+def build_schedule(generation_config, rng, scheduler=BALANCED_SCHEDULER):
+    """Schedule for the config's data_quantity, using the config's "schedule" section for the balanced scheduler."""
+    quantity = generation_config["data_quantity"]
+    if scheduler == ROUND_ROBIN_SCHEDULER:
+        return round_robin_schedule(quantity["number_of_teams"], quantity["number_of_matches_per_team"],
+                                    quantity["teams_per_match"], rng)
+    if scheduler == BALANCED_SCHEDULER:
+        schedule_config = {**DEFAULT_SCHEDULE_CONFIG, **generation_config.get("schedule", {})}
+        return schedule_matches(quantity["number_of_teams"], quantity["number_of_matches_per_team"],
+                                quantity["teams_per_match"], rng, **schedule_config)
+    raise ValueError(f"Invalid scheduler '{scheduler}': must be one of {SCHEDULERS}.")
+
+
+# ===========================
+# TEAM AND SCOUTER MODELS
+# ===========================
+
+# Scouter error model used for scouters without their own entry in "scouter_error_models"
+DEFAULT_SCOUTER_ERROR_MODEL = {
+    "bias": 0.0,                      # added to quantitative values, in standard deviations of the variable
+    "noise_standard_deviation": 0.0,  # extra noise on quantitative values, in standard deviations of the variable
+    "missing_values_chance": 0.0,     # extra chance of a missing value
+    "flip_chance": 0.0                # chance a categorical/binary value is replaced by a random choice
+}
+
+
+def sample_team_skill(generation_config, num_teams, rng):
+    """
+    Latent skill of every team, drawn once per dataset from N(0, skill_standard_deviation).
+    Index 0 is unused so the array can be indexed by team number.
+    """
+    skill_sd = generation_config.get("team_model", {}).get("skill_standard_deviation", 0.0)
+    skill = np.zeros(num_teams + 1)
+    if skill_sd:
+        skill[1:] = rng.normal(0.0, skill_sd, num_teams)
+    return skill
+
+
+def scouter_error_arrays(generation_config):
+    """Dict of error model field -> array with one value per scouter (in scouter_names order)."""
+    models = generation_config.get("scouter_error_models", {})
+    default = {**DEFAULT_SCOUTER_ERROR_MODEL, **models.get("default", {})}
+    per_scouter = [{**default, **models.get(name, {})} for name in generation_config["scouter_names"]]
+    return {field: np.array([model[field] for model in per_scouter], dtype=float) for field in DEFAULT_SCOUTER_ERROR_MODEL}
+
+
+def correlation_groups(generation_config, variable_types):
+    """
+    Groups the quantitative variables linked by "correlations" entries
+    ({"variables": [a, b], "coefficient": r}) into independent blocks.
+
+    :return: List of (variable names, Cholesky factor of the block's correlation matrix).
+    """
+    correlations = generation_config.get("correlations", [])
+    parent = {}
+
+    def find(key):
+        while parent.setdefault(key, key) != key:
+            key = parent[key]
+        return key
+
+    for correlation in correlations:
+        for key in correlation["variables"]:
+            if variable_types.get(key) != QUANTITATIVE or key not in generation_config["variables"]:
+                raise ValueError(f"Correlated variable '{key}' must be a quantitative variable of the config.")
+        first, second = correlation["variables"]
+        parent[find(first)] = find(second)
+
+    blocks = {}
+    for key in generation_config["variables"]:
+        if key in parent:
+            blocks.setdefault(find(key), []).append(key)
+
+    groups = []
+    for keys in blocks.values():
+        index = {key: position for position, key in enumerate(keys)}
+        matrix = np.eye(len(keys))
+        for correlation in correlations:
+            first, second = correlation["variables"]
+            if first in index:
+                matrix[index[first], index[second]] = matrix[index[second], index[first]] = correlation["coefficient"]
+        try:
+            groups.append((keys, np.linalg.cholesky(matrix)))
+        except np.linalg.LinAlgError:
+            raise ValueError(f"Correlations between {keys} do not form a valid correlation matrix.")
+    return groups
+
+
+def build_generation_model(generation_config, variable_types, rng):
+    """
+    Everything shared by all rows of a dataset: team skills, scouter error models and the
+    correlation structure of the quantitative variables.
+    """
+    return {
+        "team_skill": sample_team_skill(generation_config, generation_config["data_quantity"]["number_of_teams"], rng),
+        "scouter_errors": scouter_error_arrays(generation_config),
+        "correlation_groups": correlation_groups(generation_config, variable_types)
+    }
+
+
+# ===========================
+# BATCH SAMPLING
+# ===========================
+
+def _apply_missing(values, missing, filler):
+    if not isinstance(filler, (int, float)) or isinstance(filler, bool):
+        values = values.astype(object)
+        values[missing] = filler
+    else:
+        np.copyto(values, filler, where=missing)
+    return values
+
+
+def sample_quantitative(var_config, size, rng, standard_normal=None, skill=None, scouter_errors=None):
+    """
+    Draws `size` values at once; outliers and missing values are applied as masks.
+
+    :param standard_normal: Pre-drawn (e.g. correlated) standard normal values, drawn here if None.
+    :param skill: Latent skill of each row's team, shifting its mean by skill_effect standard deviations.
+    :param scouter_errors: Error model field -> value per row (see DEFAULT_SCOUTER_ERROR_MODEL),
+                           plus "noise_scale" = sqrt(1 + noise_standard_deviation ** 2).
+    """
+    mean = var_config["data_deviation"][0]["mean"]
+    std_dev = var_config["data_deviation"][0]["standard_deviation"]
+    has_noise = scouter_errors is not None and scouter_errors["noise_standard_deviation"].any()
+
+    # Work in standard deviations of the variable, in place, and scale once at the end
+    if standard_normal is None:
+        values = rng.standard_normal(size)
+        if has_noise:
+            # Scouter noise is independent of the value, so both normals combine into one wider normal
+            values *= scouter_errors["noise_scale"]
+    else:
+        values = standard_normal.copy()
+        if has_noise:
+            values += scouter_errors["noise_standard_deviation"] * rng.standard_normal(size)
+    skill_effect = var_config.get("skill_effect", 0.0)
+    if skill is not None and skill_effect:
+        values += skill_effect * skill
+    if scouter_errors is not None and scouter_errors["bias"].any():
+        values += scouter_errors["bias"]
+    values *= std_dev
+    values += mean
+
+    outliers = rng.random(size, dtype=np.float32) < var_config["positive_outliers_chance"]
+    np.add(values, var_config["positive_outliers_amount_of_std_devs"] * std_dev, out=values, where=outliers)
+
+    missing = rng.random(size, dtype=np.float32) < var_config["missing_values_chance"]
+    if scouter_errors is not None and scouter_errors["missing_values_chance"].any():
+        missing |= rng.random(size, dtype=np.float32) < scouter_errors["missing_values_chance"]
+
+    return _apply_missing(values, missing, var_config["missing_values_filler"])
+
+
+def sample_choices(var_config, size, rng, team_skill=None, teams=None, scouter_errors=None):
+    """
+    Draws `size` categorical or binary values at once from the variable's unfair distribution.
+    With a skill_effect, the log-odds of the first choice (e.g. "true") move by skill_effect per
+    unit of the team's skill (team_skill indexed by the row's team in teams); the other choices
+    keep their relative weights.
+    """
+    distribution = var_config["unfair_distribution"][0]
+    choices = np.empty(len(distribution), dtype=object)
+    choices[:] = list(distribution.keys())
+    probabilities = np.array(list(distribution.values()), dtype=float)
+    probabilities /= probabilities.sum()
+    cumulative = np.cumsum(probabilities)
+
+    draws = rng.random(size, dtype=np.float32)
+    skill_effect = var_config.get("skill_effect", 0.0)
+    if team_skill is not None and skill_effect and 0 < probabilities[0] < 1:
+        # Probability of the first choice per team, looked up per row; the rest of the CDF is rescaled around it
+        log_odds = np.log(probabilities[0] / (1 - probabilities[0])) + skill_effect * team_skill
+        first = (1.0 / (1.0 + np.exp(-log_odds))).astype(np.float32)[teams]
+        rest_scale = (1 - first) / (1 - probabilities[0])
+        boundaries = [first] + [first + np.float32(boundary - probabilities[0]) * rest_scale
+                                for boundary in cumulative[1:-1]]
+    else:
+        boundaries = cumulative[:-1]
+
+    # Inverse CDF sampling: a value's index is the number of bucket boundaries below its draw.
+    # Comparing against each boundary beats a binary search for the handful of choices a variable has.
+    indices = np.zeros(size, dtype=np.intp)
+    for boundary in boundaries:
+        indices += draws >= boundary
+
+    if scouter_errors is not None and scouter_errors["flip_chance"].any():
+        flipped = rng.random(size, dtype=np.float32) < scouter_errors["flip_chance"]
+        indices[flipped] = rng.integers(0, len(choices), int(flipped.sum()))
+    values = choices[indices]
+
+    missing = rng.random(size, dtype=np.float32) < var_config["missing_values_chance"]
+    if scouter_errors is not None and scouter_errors["missing_values_chance"].any():
+        missing |= rng.random(size, dtype=np.float32) < scouter_errors["missing_values_chance"]
+    values[missing] = var_config["missing_values_filler"]
+    return values
+
+
+def sample_scouter_indices(scouters, num_matches, teams_per_match, rng):
+    """Distinct scouters within every match, as indices into scouters of shape (matches, teams_per_match)."""
+    if teams_per_match > len(scouters):
+        raise ValueError(f"teams_per_match ({teams_per_match}) cannot be greater than the number of scouters ({len(scouters)}).")
+    order = rng.permuted(np.tile(np.arange(len(scouters)), (num_matches, 1)), axis=1)
+    return order[:, :teams_per_match]
+
+
+def sample_variables(generation_config, variable_types, model, teams, scouter_indices, rng):
+    """
+    Draws every variable for all rows at once.
+
+    :param model: Output of build_generation_model.
+    :param teams: Team number of each row.
+    :param scouter_indices: Index into scouter_names of each row's scouter.
+    :return: Dict of variable name -> array of values.
+    """
+    size = len(teams)
+    team_skill = model["team_skill"] if model["team_skill"].any() else None
+    skill = team_skill[teams] if team_skill is not None else None
+
+    # Per-row scouter error parameters, only for the fields some scouter actually uses
+    errors = model["scouter_errors"]
+    scouter_errors = None
+    if any(values.any() for values in errors.values()):
+        scouter_errors = {field: values[scouter_indices] if values.any() else np.zeros(1)
+                          for field, values in errors.items()}
+        scouter_errors["noise_scale"] = np.sqrt(1.0 + errors["noise_standard_deviation"] ** 2)[scouter_indices]
+
+    # Correlated variables are drawn together, one multivariate normal block at a time
+    standard_normals = {}
+    for keys, cholesky in model["correlation_groups"]:
+        draws = rng.standard_normal((size, len(keys))) @ cholesky.T
+        standard_normals.update((key, draws[:, position]) for position, key in enumerate(keys))
+
+    variables = {}
+    for var_key, var_config in generation_config["variables"].items():
+        statistical_data_type = variable_types[var_key]
+        if statistical_data_type == QUANTITATIVE:
+            variables[var_key] = sample_quantitative(var_config, size, rng, standard_normals.get(var_key), skill, scouter_errors)
+        elif statistical_data_type in (CATEGORICAL, BINARY):
+            # Skill only drives binary variables; categorical values have no natural "better" choice
+            variables[var_key] = sample_choices(var_config, size, rng,
+                                                team_skill if statistical_data_type == BINARY else None, teams,
+                                                scouter_errors)
+        else:
+            raise ValueError(f"Invalid statistical data type '{statistical_data_type}'.")
+    return variables
+
+
+# ===========================
+# GENERATION
+# ===========================
+
+def _batch_columns(generation_config, variable_types, robot_positions, model, schedule, first_match_number, rng):
+    """Columns of the entries of the given schedule rows (see generate_batch), drawn with rng."""
+    teams_per_match = generation_config["data_quantity"]["teams_per_match"]
+    num_matches = len(schedule)
+    teams = schedule.ravel()
+
+    positions = np.empty(teams_per_match, dtype=object)
+    positions[:] = robot_positions[:teams_per_match]
+    scouter_names = np.empty(len(generation_config["scouter_names"]), dtype=object)
+    scouter_names[:] = generation_config["scouter_names"]
+    scouter_indices = sample_scouter_indices(generation_config["scouter_names"], num_matches, teams_per_match, rng).ravel()
+
+    return {
+        "matchNumber": np.repeat(np.arange(first_match_number, first_match_number + num_matches), teams_per_match),
+        "robotTeam": teams,
+        "robotPosition": np.tile(positions, num_matches),
+        "scouterName": scouter_names[scouter_indices],
+        "variables": sample_variables(generation_config, variable_types, model, teams, scouter_indices, rng)
+    }
+
+
+def generate_batch(generation_config, variable_types, robot_positions, seed=None, schedule=None,
+                   scheduler=BALANCED_SCHEDULER):
+    """
+    Generates a whole dataset column by column: the schedule and the team/scouter model first,
+    then every variable for all rows at once with a numpy Generator. The same seed always gives
+    the same data.
+
+    :param generation_config: Data generation config (see config/data_generation_config.json).
+    :param variable_types: Dict of flattened variable name -> statistical data type.
+    :param robot_positions: Robot position of each slot in a match.
+    :param schedule: Optional int array (matches, teams_per_match) of team numbers to use.
+    :param scheduler: Scheduler building the schedule when none is given (see SCHEDULERS).
+    :return: Dict of column name -> array with one row per entry ("matchNumber", "robotTeam",
+             "robotPosition", "scouterName") plus "variables": {variable name: array}.
+    """
+    rng = np.random.default_rng(seed)
+    if schedule is None:
+        schedule = build_schedule(generation_config, rng, scheduler)
+    model = build_generation_model(generation_config, variable_types, rng)
+    return _batch_columns(generation_config, variable_types, robot_positions, model, schedule, 1, rng)
+
+
+# Shared by every chunk of a run; set once per worker process by _init_chunk_worker
+_chunk_state = {}
+
+
+def _init_chunk_worker(generation_config, variable_types, robot_positions, model, encode):
+    _chunk_state.update(generation_config=generation_config, variable_types=variable_types,
+                        robot_positions=robot_positions, model=model, encode=encode)
+
+
+def _generate_chunk(schedule_rows, first_match_number, seed_sequence):
+    state = _chunk_state
+    batch = _batch_columns(state["generation_config"], state["variable_types"], state["robot_positions"],
+                           state["model"], schedule_rows, first_match_number, np.random.default_rng(seed_sequence))
+    return state["encode"](batch) if state["encode"] is not None else batch
+
+
+def generate_chunks(generation_config, variable_types, robot_positions, seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    schedule=None, scheduler=BALANCED_SCHEDULER, workers=1, encode=None):
+    """
+    Generates a dataset as a sequence of batches (see generate_batch) of about chunk_size entries
+    each, rounded down to whole matches. Only the schedule (a small int array) and the model are
+    built up front, so memory stays flat however many entries are generated as long as each chunk
+    is written and dropped before the next one.
+
+    Each chunk is a shard with its own stream, spawned from the seed with np.random.SeedSequence,
+    and every shard shares the same schedule and team/scouter model. With workers > 1 the shards
+    are generated by a process pool, a few ahead of the consumer, and still yielded in match
+    order, so the same seed and chunk_size give the same data whatever the number of workers.
+
+    :param encode: Optional picklable function applied to each batch inside the worker (e.g. to
+                   serialize it, see utils.generation_output); its results are yielded instead.
+    """
+    teams_per_match = generation_config["data_quantity"]["teams_per_match"]
+    matches_per_chunk = max(1, chunk_size // teams_per_match)
+
+    setup_sequence, chunk_root = np.random.SeedSequence(seed).spawn(2)
+    setup_rng = np.random.default_rng(setup_sequence)
+    if schedule is None:
+        schedule = build_schedule(generation_config, setup_rng, scheduler)
+    model = build_generation_model(generation_config, variable_types, setup_rng)
+
+    chunk_starts = range(0, len(schedule), matches_per_chunk)
+    shards = ((schedule[start:start + matches_per_chunk], start + 1, chunk_sequence)
+              for start, chunk_sequence in zip(chunk_starts, chunk_root.spawn(len(chunk_starts))))
+    shared = (generation_config, variable_types, robot_positions, model, encode)
+
+    if workers <= 1:
+        _init_chunk_worker(*shared)
+        for shard in shards:
+            yield _generate_chunk(*shard)
+        return
+
+    # Only a few shards are in flight at a time, so finished chunks don't pile up in memory
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_chunk_worker, initargs=shared) as executor:
+        pending = deque()
+        for shard in shards:
+            pending.append(executor.submit(_generate_chunk, *shard))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def batch_size(batch):
+    return len(batch["matchNumber"])
+
+
+def iter_batch_entries(batch, start=0, stop=None):
+    """Yields rows of a generated batch as entries ({"metadata": ..., "variables": ...})."""
+    stop = batch_size(batch) if stop is None else stop
+    metadata_keys = ["scouterName", "matchNumber", "robotTeam", "robotPosition"]
+    metadata_columns = [batch[key][start:stop].tolist() for key in metadata_keys]
+    variable_keys = list(batch["variables"])
+    variable_columns = [batch["variables"][key][start:stop].tolist() for key in variable_keys]
+
+    for metadata_row, variable_row in zip(zip(*metadata_columns), zip(*variable_columns)):
+        yield {
+            "metadata": dict(zip(metadata_keys, metadata_row)),
+            "variables": dict(zip(variable_keys, variable_row))
+        }
@@ -0,0 +1,158 @@
+import json
+import hashlib
+
+# ===========================
+# CONSTANTS
+# ===========================
+
+ID_FIELD = "_id"
+# Metadata fields identifying one scouting slot: a scouter watching one robot position in one match
+SLOT_FIELDS = ["matchNumber", "robotPosition", "scouterName"]
+
+# Resolution policies
+LAST_WRITE_WINS = "last_write_wins"        # the latest submission replaces earlier ones
+IDENTICAL_COLLAPSE = "identical_collapse"  # exact copies are dropped, differing duplicates are all kept
+CONFLICT_REPORT = "conflict_report"        # exact copies are dropped, differing duplicates keep the first and are reported
+DEDUP_POLICIES = [LAST_WRITE_WINS, IDENTICAL_COLLAPSE, CONFLICT_REPORT]
+DEFAULT_POLICY = LAST_WRITE_WINS
+
+# Actions recorded in the duplicates report
+COLLAPSED = "collapsed"
+REPLACED = "replaced"
+CONFLICT = "conflict"
+
+
+# ===========================
+# KEYS
+# ===========================
+
+def slot_key(entry, slot_fields=SLOT_FIELDS):
+    """(matchNumber, robotPosition, scouterName) of an entry, or None if any of them is missing."""
+    metadata = entry.get("metadata")
+    try:
+        return tuple([metadata[field] for field in slot_fields])
+    except (KeyError, TypeError):
+        return None
+
+
+def content_fingerprint(entry):
+    """Hash of the entry's content, ignoring its _id (a resubmission may get a new one)."""
+    content = {key: value for key, value in entry.items() if key != ID_FIELD}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# ===========================
+# DEDUPLICATION
+# ===========================
+
+class Deduplicator:
+    """
+    Single streaming pass over scouting entries that resolves resubmitted duplicates.
+
+    Kept entries are hash-indexed on _id and on (matchNumber, robotPosition, scouterName), so
+    each incoming entry is checked in O(1). Content is only hashed when a key collides. Kept
+    entries stay in the order of their first submission.
+
+    Usage:
+        deduplicator = Deduplicator(LAST_WRITE_WINS)
+        for entry in entries:
+            deduplicator.add(entry)
+        entries, report = deduplicator.entries(), deduplicator.report
+    """
+
+    def __init__(self, policy=DEFAULT_POLICY, slot_fields=SLOT_FIELDS):
+        if policy not in DEDUP_POLICIES:
+            raise ValueError(f"Invalid dedup policy '{policy}': must be one of {DEDUP_POLICIES}.")
+        self.policy = policy
+        self.slot_fields = slot_fields
+        self.report = []
+        self._kept = []
+        self._fingerprints = {}
+        self._id_index = {}
+        self._slot_index = {}
+        self._position_keys = {}  # position -> [(index, key)] of every key pointing at it
+
+    def _index(self, position, entry_id, key):
+        keys = self._position_keys.setdefault(position, [])
+        if entry_id is not None:
+            self._id_index[entry_id] = position
+            keys.append((self._id_index, entry_id))
+        if key is not None:
+            self._slot_index[key] = position
+            keys.append((self._slot_index, key))
+
+    def _unindex(self, position):
+        """Drops every _id and slot key still pointing at position (the entry there is being replaced)."""
+        for index, key in self._position_keys.pop(position, []):
+            if index.get(key) == position:
+                del index[key]
+
+    def _find(self, entry_id, key):
+        """Returns (position of the kept entry, field it matched on) or (None, None)."""
+        if entry_id is not None and entry_id in self._id_index:
+            return self._id_index[entry_id], ID_FIELD
+        if key is not None and key in self._slot_index:
+            return self._slot_index[key], "slot"
+        return None, None
+
+    def _fingerprint(self, position):
+        if position not in self._fingerprints:
+            self._fingerprints[position] = content_fingerprint(self._kept[position])
+        return self._fingerprints[position]
+
+    def _record(self, action, matched_on, kept, duplicate):
+        self.report.append({
+            "action": action,
+            "policy": self.policy,
+            "matchedOn": matched_on,
+            "key": duplicate.get(ID_FIELD) if matched_on == ID_FIELD else list(slot_key(duplicate, self.slot_fields)),
+            "kept": kept,
+            "duplicate": duplicate
+        })
+
+    def add(self, entry):
+        """Adds one entry and returns the action taken: None (new entry), COLLAPSED, REPLACED or CONFLICT."""
+        entry_id = entry.get(ID_FIELD)
+        key = slot_key(entry, self.slot_fields)
+        position, matched_on = self._find(entry_id, key)
+        if position is None:
+            self._index(len(self._kept), entry_id, key)
+            self._kept.append(entry)
+            return None
+
+        existing = self._kept[position]
+        if content_fingerprint(entry) == self._fingerprint(position):
+            self._index(position, entry_id, key)
+            self._record(COLLAPSED, matched_on, existing, entry)
+            return COLLAPSED
+
+        if self.policy == LAST_WRITE_WINS:
+            # The replaced entry's _id or slot may differ from the new one's; free them for later entries
+            self._unindex(position)
+            self._kept[position] = entry
+            self._fingerprints.pop(position, None)
+            self._index(position, entry_id, key)
+            self._record(REPLACED, matched_on, entry, existing)
+            return REPLACED
+
+        if self.policy == IDENTICAL_COLLAPSE:
+            # Differing duplicates pass through; validation decides what happens to the match
+            self._index(len(self._kept), entry_id, key)
+            self._kept.append(entry)
+        self._record(CONFLICT, matched_on, existing, entry)
+        return CONFLICT
+
+    def entries(self):
+        return list(self._kept)
+
+
+def deduplicate(entries, policy=DEFAULT_POLICY, slot_fields=SLOT_FIELDS):
+    """
+    Resolves duplicate submissions in one pass over an iterable of entries.
+
+    :return: Tuple of (deduplicated entries, duplicates report).
+    """
+    deduplicator = Deduplicator(policy, slot_fields)
+    for entry in entries:
+        deduplicator.add(entry)
+    return deduplicator.entries(), deduplicator.report
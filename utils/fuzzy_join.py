@@ -0,0 +1,124 @@
+from collections import defaultdict
+from utils.join_engine import composite_key
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+# Candidates must agree exactly on these fields; only entries in the same block are compared
+BLOCK_FIELDS = ["matchNumber", "robotPosition"]
+
+# Weight of each fuzzy field in the match score (weights sum to 1)
+SCORE_WEIGHTS = {
+    "scouterName": 0.5,
+    "robotTeam": 0.5
+}
+
+DEFAULT_THRESHOLD = 0.75
+
+
+# ===========================
+# SIMILARITY FUNCTIONS
+# ===========================
+
+def edit_distance(a, b):
+    """Edit distance between two strings, counting an adjacent transposition ("4201" -> "4021") as one edit."""
+    if len(a) < len(b):
+        a, b = b, a
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before_previous[j - 2] + 1)
+            current.append(cost)
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+def name_similarity(a, b):
+    """1.0 for names equal after trimming and lowercasing, decreasing with edit distance."""
+    a = str(a or "").strip().lower()
+    b = str(b or "").strip().lower()
+    if a == b:
+        return 1.0
+    return 1 - edit_distance(a, b) / max(len(a), len(b))
+
+
+def team_similarity(a, b):
+    """
+    Scores team numbers by the better of digit edit distance (4201 vs 4291 is one typo)
+    and numeric closeness (4201 vs 4202 scores 0.5, far-apart numbers score ~0).
+    """
+    if a == b:
+        return 1.0
+    if a is None or b is None:
+        return 0.0
+    digits_a, digits_b = str(a), str(b)
+    digit_score = 1 - edit_distance(digits_a, digits_b) / max(len(digits_a), len(digits_b))
+    try:
+        closeness = 1 / (1 + abs(float(a) - float(b)))
+    except (TypeError, ValueError):
+        closeness = 0.0
+    return max(digit_score, closeness)
+
+
+FIELD_SIMILARITY = {
+    "scouterName": name_similarity,
+    "robotTeam": team_similarity
+}
+
+
+def match_score(left_entry, right_entry, weights=SCORE_WEIGHTS):
+    """Weighted similarity of two entries over the fuzzy metadata fields."""
+    left_metadata = left_entry.get("metadata", {})
+    right_metadata = right_entry.get("metadata", {})
+    return sum(
+        weight * FIELD_SIMILARITY[field](left_metadata.get(field), right_metadata.get(field))
+        for field, weight in weights.items()
+    )
+
+
+# ===========================
+# BLOCKED FUZZY JOIN
+# ===========================
+
+def fuzzy_join(left_entries, right_entries, threshold=DEFAULT_THRESHOLD, block_fields=BLOCK_FIELDS, weights=SCORE_WEIGHTS):
+    """
+    Pairs entries that the exact join could not match. Right entries are hash-indexed on the
+    block fields, and only the few candidates sharing a block are scored, so the cost stays close
+    to the exact join instead of comparing all pairs. Within a block, pairs are assigned greedily
+    by descending score, and each entry is used at most once.
+
+    :param left_entries: Unmatched entries of the probe side.
+    :param right_entries: Unmatched entries of the build side.
+    :param threshold: Minimum score (0-1) for a pair to be accepted.
+    :return: Tuple of (list of (score, left_entry, right_entry), unmatched left list, unmatched right list).
+    """
+    right_blocks = defaultdict(list)
+    for index, entry in enumerate(right_entries):
+        right_blocks[composite_key(entry, block_fields)].append(index)
+
+    candidate_pairs = []
+    for left_index, left_entry in enumerate(left_entries):
+        for right_index in right_blocks.get(composite_key(left_entry, block_fields), []):
+            score = match_score(left_entry, right_entries[right_index], weights)
+            if score >= threshold:
+                candidate_pairs.append((score, left_index, right_index))
+
+    # Highest scores first; ties resolved by input order so results are deterministic
+    candidate_pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+    used_left, used_right = set(), set()
+    matches = []
+    for score, left_index, right_index in candidate_pairs:
+        if left_index in used_left or right_index in used_right:
+            continue
+        used_left.add(left_index)
+        used_right.add(right_index)
+        matches.append((round(score, 4), left_entries[left_index], right_entries[right_index]))
+
+    unmatched_left = [entry for index, entry in enumerate(left_entries) if index not in used_left]
+    unmatched_right = [entry for index, entry in enumerate(right_entries) if index not in used_right]
+    return matches, unmatched_left, unmatched_right
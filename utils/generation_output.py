@@ -0,0 +1,284 @@
+import os
+import json
+import shutil
+import numpy as np
+from functools import partial
+from itertools import chain, repeat
+from utils.json_streaming import JsonArrayWriter
+from utils.data_generation import batch_size
+from utils.raw_export import (WRAPPER_LAYOUT, CONCATENATED_LAYOUT, RAW_LAYOUTS, MATCH_APP_KEY, SUPER_APP_KEY,
+                              raw_export_settings, encode_raw_chunk)
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+JSON_FORMAT = "json"      # one JSON array of entries, like the raw exports (default)
+NDJSON_FORMAT = "ndjson"  # one entry per line; complete lines survive an interrupted run
+NPY_FORMAT = "npy"        # a folder per chunk with one .npy file per column
+# Raw app exports with injected corruption, to load test the preparation scripts (see utils.raw_export)
+OUTPUT_FORMATS = [JSON_FORMAT, NDJSON_FORMAT, NPY_FORMAT] + RAW_LAYOUTS
+
+NPY_MANIFEST_FILENAME = "manifest.json"
+METADATA_COLUMNS = ["scouterName", "matchNumber", "robotTeam", "robotPosition"]
+
+
+# ===========================
+# WRITERS
+# ===========================
+
+def _entry_template(batch, indent=None):
+    """
+    json.dumps of a batch's entry layout (see iter_batch_entries), split where the values go.
+    Every entry of a batch has the same keys, so only the values differ between entries.
+    """
+    placeholder = "\x00"
+    skeleton = {
+        "metadata": dict.fromkeys(METADATA_COLUMNS, placeholder),
+        "variables": dict.fromkeys(batch["variables"], placeholder)
+    }
+    return json.dumps(skeleton, indent=indent).split(json.dumps(placeholder))
+
+
+def _encode_columns(batch):
+    """JSON text of every value of a batch, column by column, in the order of _entry_template."""
+    columns = [batch[key] for key in METADATA_COLUMNS] + list(batch["variables"].values())
+    # One dumps call per column; json escapes control characters in strings, so "\x00" only separates values
+    return [json.dumps(column.tolist(), separators=("\x00", ": "))[1:-1].split("\x00") for column in columns]
+
+
+def _encode_entries(batch, template):
+    """Every entry of a batch as the template pieces with the encoded values in between, as one string."""
+    if batch_size(batch) == 0:
+        return ""
+    parts = [part for piece, column in zip(template, _encode_columns(batch)) for part in (repeat(piece), column)]
+    return "".join(chain.from_iterable(zip(*parts, repeat(template[-1]))))
+
+
+def encode_ndjson_chunk(batch):
+    """NDJSON text of a generated chunk."""
+    template = _entry_template(batch)
+    template[-1] += "\n"
+    return _encode_entries(batch, template)
+
+
+def encode_json_chunk(batch, indent=4):
+    """The entries of a chunk formatted as JsonArrayWriter writes them, without the leading separator."""
+    padding = " " * indent
+    template = [piece.replace("\n", "\n" + padding) for piece in _entry_template(batch, indent)]
+    template[0] = f"\n{padding}" + template[0]
+    template[-1] += ","
+    return _encode_entries(batch, template)[:-1]
+
+
+class NdjsonWriter:
+    """Writes one JSON entry per line, flushed after every chunk."""
+
+    encode = staticmethod(encode_ndjson_chunk)
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.filepath, "w")
+        return self
+
+    def write_encoded(self, text, entries):
+        self._file.write(text)
+        self._file.flush()
+        self.count += entries
+
+    def write_chunk(self, batch):
+        self.write_encoded(self.encode(batch), batch_size(batch))
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._file.close()
+        return False
+
+
+class JsonChunkWriter(JsonArrayWriter):
+    """JsonArrayWriter taking whole generated chunks; the file is only a valid array once closed."""
+
+    encode = staticmethod(encode_json_chunk)
+
+    def write_encoded(self, text, entries):
+        if not entries:
+            return
+        self._file.write(("," if self.count else "") + text)
+        self._file.flush()
+        self.count += entries
+
+    def write_chunk(self, batch):
+        self.write_encoded(self.encode(batch), batch_size(batch))
+
+
+class NpyChunkWriter:
+    """
+    Writes every chunk to <folder>/chunk_00000/<column>.npy (variables under their flattened
+    names). Numeric columns keep their dtype; columns holding strings or mixed fillers are object
+    arrays and need allow_pickle=True to load (see load_npy_chunks). The manifest is rewritten
+    after every chunk, so it only ever lists complete chunks.
+    """
+
+    encode = None  # chunks are saved as they are
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.count = 0
+        self.chunks = []
+
+    def __enter__(self):
+        os.makedirs(self.folder, exist_ok=True)
+        return self
+
+    def write_chunk(self, batch):
+        chunk_name = f"chunk_{len(self.chunks):05d}"
+        chunk_folder = os.path.join(self.folder, chunk_name)
+        os.makedirs(chunk_folder, exist_ok=True)
+
+        columns = {key: batch[key] for key in METADATA_COLUMNS}
+        columns.update(batch["variables"])
+        for key, values in columns.items():
+            np.save(os.path.join(chunk_folder, key + ".npy"), values, allow_pickle=values.dtype == object)
+
+        self.chunks.append({"name": chunk_name, "entries": batch_size(batch)})
+        self.count += batch_size(batch)
+        self._write_manifest(list(batch["variables"]))
+
+    def _write_manifest(self, variable_keys):
+        manifest_path = os.path.join(self.folder, NPY_MANIFEST_FILENAME)
+        temp_path = manifest_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"entries": self.count, "metadata": METADATA_COLUMNS, "variables": variable_keys,
+                       "chunks": self.chunks}, f, indent=4)
+        os.replace(temp_path, manifest_path)
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+class RawExportWriter:
+    """
+    Writes a raw app export (see utils.raw_export). In WRAPPER_LAYOUT the matchApp array is
+    streamed into the output while superApp records go to a side file that is appended when the
+    writer closes; CONCATENATED_LAYOUT only holds matchApp records. `count` is the number of
+    matchApp records written, duplicates included.
+    """
+
+    def __init__(self, filepath, encode, layout=WRAPPER_LAYOUT):
+        self.filepath = filepath
+        self.encode = encode
+        self.layout = layout
+        self.count = 0
+        self._file = None
+        self._super_file = None
+        self._super_count = 0
+
+    def __enter__(self):
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.filepath, "w")
+        if self.layout == WRAPPER_LAYOUT:
+            self._file.write(f'{{\n    "{MATCH_APP_KEY}": [')
+            self._super_file = open(self.filepath + ".superApp.tmp", "w+")
+        return self
+
+    def write_encoded(self, texts, entries):
+        match_text, super_text = texts
+        if self.layout == CONCATENATED_LAYOUT:
+            self._file.write(match_text)
+        else:
+            if match_text:
+                self._file.write(("," if self.count else "") + match_text)
+            if super_text:
+                self._super_file.write(("," if self._super_count else "") + super_text)
+                self._super_count += 1
+        self._file.flush()
+        self.count += entries
+
+    def write_chunk(self, batch):
+        self.write_encoded(*self.encode(batch))
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if self._super_file is not None:
+            self._file.write(f'\n    ],\n    "{SUPER_APP_KEY}": [')
+            self._super_file.seek(0)
+            shutil.copyfileobj(self._super_file, self._file)
+            self._file.write("\n    ]\n}")
+            self._super_file.close()
+            os.remove(self._super_file.name)
+        self._file.close()
+        return False
+
+
+def open_chunk_writer(output, output_format=JSON_FORMAT, generation_config=None, seed=None):
+    """
+    Writer context for output_format: output is a file, or a folder for NPY_FORMAT. Raw layouts
+    read the config's "raw_export" section and derive their corruption from the seed.
+    """
+    if output_format == JSON_FORMAT:
+        return JsonChunkWriter(output)
+    if output_format == NDJSON_FORMAT:
+        return NdjsonWriter(output)
+    if output_format == NPY_FORMAT:
+        return NpyChunkWriter(output)
+    if output_format in RAW_LAYOUTS:
+        encode = partial(encode_raw_chunk, raw_export_settings(generation_config or {}),
+                         np.random.SeedSequence(seed).entropy, output_format)
+        return RawExportWriter(output, encode, output_format)
+    raise ValueError(f"Invalid output format '{output_format}': must be one of {OUTPUT_FORMATS}.")
+
+
+def _encode_with_size(encode, batch):
+    return encode(batch), batch_size(batch)
+
+
+def chunk_encoder(output_format, generation_config=None, seed=None):
+    """
+    Picklable function turning a chunk into what write_chunks writes for output_format, so
+    serialization can run in the generation workers (see utils.data_generation.generate_chunks).
+    None if the format writes chunks as they are.
+    """
+    writer = open_chunk_writer("", output_format, generation_config, seed)
+    if writer.encode is None:
+        return None
+    # Raw layouts report their own record count (duplicates and dropped entries change it)
+    return writer.encode if isinstance(writer, RawExportWriter) else partial(_encode_with_size, writer.encode)
+
+
+def write_chunks(chunks, output, output_format=JSON_FORMAT, generation_config=None, seed=None):
+    """
+    Writes chunks one at a time, in the order given, and returns the number of entries written.
+    Chunks are generated batches, or their encoding by chunk_encoder(output_format, ...) with
+    the same config and seed.
+    """
+    with open_chunk_writer(output, output_format, generation_config, seed) as writer:
+        for chunk in chunks:
+            if isinstance(chunk, tuple):
+                writer.write_encoded(*chunk)
+            else:
+                writer.write_chunk(chunk)
+    return writer.count
+
+
+# ===========================
+# READER
+# ===========================
+
+def load_npy_chunks(folder):
+    """Yields the chunks of an NPY_FORMAT folder as batches (see utils.data_generation.generate_batch)."""
+    with open(os.path.join(folder, NPY_MANIFEST_FILENAME)) as f:
+        manifest = json.load(f)
+
+    for chunk in manifest["chunks"]:
+        chunk_folder = os.path.join(folder, chunk["name"])
+        load = lambda key: np.load(os.path.join(chunk_folder, key + ".npy"), allow_pickle=True)
+        batch = {key: load(key) for key in manifest["metadata"]}
+        batch["variables"] = {key: load(key) for key in manifest["variables"]}
+        yield batch
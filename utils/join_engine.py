@@ -0,0 +1,93 @@
+from collections import defaultdict
+
+# ===========================
+# CONSTANTS
+# ===========================
+
+ONE_TO_ONE = "one_to_one"
+ONE_TO_MANY = "one_to_many"
+JOIN_MODES = [ONE_TO_ONE, ONE_TO_MANY]
+
+# Join events yielded by hash_join
+MATCH = "match"
+UNMATCHED_LEFT = "unmatched_left"
+UNMATCHED_RIGHT = "unmatched_right"
+DUPLICATE_LEFT = "duplicate_left"
+DUPLICATE_RIGHT = "duplicate_right"
+
+
+# ===========================
+# KEYS AND INDEX
+# ===========================
+
+def composite_key(entry, key_fields):
+    """Builds the join key from the entry's metadata, in the fixed order of key_fields."""
+    metadata = entry.get("metadata", {})
+    return tuple(metadata.get(field, None) for field in key_fields)
+
+
+def build_index(entries, key_fields):
+    """Hash index of key -> entries with that key, in input order."""
+    index = defaultdict(list)
+    for entry in entries:
+        index[composite_key(entry, key_fields)].append(entry)
+    return index
+
+
+# ===========================
+# HASH JOIN
+# ===========================
+
+def hash_join(left_entries, right_entries, key_fields, mode=ONE_TO_ONE):
+    """
+    Joins two entry lists on a composite metadata key with one build pass over the right side
+    and one probe pass over the left side (O(n + m)). Results are yielded as they are found.
+
+    Yields (event, key, left_entry, right_entry) tuples, where event is one of:
+      - MATCH: a joined pair.
+      - UNMATCHED_LEFT / UNMATCHED_RIGHT: an entry with no partner (the other side is None).
+      - DUPLICATE_LEFT / DUPLICATE_RIGHT: in one_to_one mode, a repeated key. The first entry
+        with a key is joined and every later one is reported as a duplicate.
+
+    In one_to_many mode every left entry is joined with every right entry sharing its key,
+    and no duplicates are reported.
+
+    :param left_entries: Probe side (any iterable; consumed once).
+    :param right_entries: Build side (indexed in memory).
+    :param key_fields: Ordered list of metadata fields forming the key.
+    :param mode: ONE_TO_ONE or ONE_TO_MANY.
+    """
+    if mode not in JOIN_MODES:
+        raise ValueError(f"Invalid join mode '{mode}': must be one of {JOIN_MODES}.")
+
+    # Build
+    index = build_index(right_entries, key_fields)
+    if mode == ONE_TO_ONE:
+        for key, entries in index.items():
+            for duplicate in entries[1:]:
+                yield DUPLICATE_RIGHT, key, None, duplicate
+
+    # Probe
+    matched_keys = set()
+    for left_entry in left_entries:
+        key = composite_key(left_entry, key_fields)
+        candidates = index.get(key)
+
+        if not candidates:
+            yield UNMATCHED_LEFT, key, left_entry, None
+        elif mode == ONE_TO_ONE:
+            if key in matched_keys:
+                yield DUPLICATE_LEFT, key, left_entry, None
+            else:
+                matched_keys.add(key)
+                yield MATCH, key, left_entry, candidates[0]
+        else:
+            matched_keys.add(key)
+            for right_entry in candidates:
+                yield MATCH, key, left_entry, right_entry
+
+    # Right entries whose key was never probed
+    for key, entries in index.items():
+        if key not in matched_keys:
+            for right_entry in entries if mode == ONE_TO_MANY else entries[:1]:
+                yield UNMATCHED_RIGHT, key, None, right_entry
@@ -0,0 +1,442 @@
+import os
+import re
+import json
+import mmap
+import codecs
+from contextlib import contextmanager
+
+# ===========================
+# STREAMING WRITER
+# ===========================
+
+class JsonArrayWriter:
+    """
+    Writes a JSON array one element at a time, so large outputs never have to be held in memory.
+    With indent=4 the file is byte-identical to json.dump(list, f, indent=4).
+
+    Usage:
+        with JsonArrayWriter("out.json") as writer:
+            for item in items:
+                writer.write(item)
+    """
+
+    def __init__(self, filepath, indent=4):
+        self.filepath = filepath
+        self.indent = indent
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.filepath, "w")
+        self._file.write("[")
+        return self
+
+    def write(self, item):
+        separator = "," if self.count else ""
+        if self.indent is None:
+            self._file.write(separator + json.dumps(item))
+        else:
+            padding = " " * self.indent
+            encoded = json.dumps(item, indent=self.indent).replace("\n", "\n" + padding)
+            self._file.write(f"{separator}\n{padding}{encoded}")
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if self.count and self.indent is not None:
+            self._file.write("\n")
+        self._file.write("]")
+        self._file.close()
+        return False
+
+
+def write_json_array(filepath, items, indent=4):
+    """Streams an iterable of JSON-serializable items into a JSON array file and returns the item count."""
+    with JsonArrayWriter(filepath, indent) as writer:
+        for item in items:
+            writer.write(item)
+    return writer.count
+
+
+
+# ===========================
+# STREAMING READER
+# ===========================
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Where a record may start again after a damaged one: a "{" opening a line, or following a "}"
+RESYNC_PATTERN = re.compile(r"\}[\s,]*(\{)|\n[ \t]*(\{)")
+
+# Errors this close to the end of the buffer may just be a record cut by the chunk boundary
+# (a partial literal, number or \u escape); so is an unterminated string, up to max_string_length
+INCOMPLETE_MARGIN = 6
+
+SEPARATORS = " \t\r\n,\ufeff"
+# What may follow a top-level scalar (a number cut after "." or "e" would otherwise decode short)
+SCALAR_DELIMITERS = SEPARATORS + "]"
+
+# Longest unterminated string buffered while waiting for its closing quote; past this it is damaged
+MAX_STRING_LENGTH = 1 << 20
+
+
+def _byte_length(text):
+    return len(text) if text.isascii() else len(text.encode("utf-8", "surrogateescape"))
+
+
+class JsonRecordReader:
+    """
+    Iterates over the records of a JSON file one at a time, whether the file holds a JSON array,
+    NDJSON, or root objects simply concatenated ("}{", "}\\n{", "}\\r\\n{", ...).
+
+    The file is read in binary chunks and records are decoded incrementally with raw_decode, so
+    memory use is bounded by the largest record rather than the file size. A damaged record does
+    not abort the read: it is skipped up to the next "{" that opens a line or follows a "}", and
+    reported in `damaged` as {"offset", "length", "error"} with byte offsets into the file.
+
+    Usage:
+        reader = JsonRecordReader("raw.json")
+        for record in reader:
+            ...
+        print(reader.count, reader.damaged)
+    """
+
+    def __init__(self, filepath, chunk_size=DEFAULT_CHUNK_SIZE, single_array=False, start_offset=0, prefix=b"",
+                 max_string_length=MAX_STRING_LENGTH):
+        """
+        :param filepath: Path, or a binary file object positioned where reading should start.
+        :param single_array: Stop after the first array closes (used to read one subtree of a larger document).
+        :param start_offset: Byte offset of the starting position, for damaged record reports.
+        :param prefix: Bytes already read from the file that come before what the file object returns.
+        :param max_string_length: Longest unterminated string to keep reading for, so damaged input
+                                  (a lost closing quote) can't pull the rest of the file into memory.
+        """
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+        self.single_array = single_array
+        self.start_offset = start_offset
+        self.prefix = prefix
+        self.max_string_length = max_string_length
+        self.count = 0
+        self.damaged = []
+
+    def __iter__(self):
+        if hasattr(self.filepath, "read"):
+            self._file = self.filepath
+            yield from self._iter_records()
+        else:
+            with open(self.filepath, "rb") as self._file:
+                yield from self._iter_records()
+
+    def _iter_records(self):
+        self.count = 0
+        self.damaged = []
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")("surrogateescape")
+        self._buffer = self._text_decoder.decode(self.prefix)
+        self._position = 0
+        self._buffer_offset = self.start_offset  # byte offset of _buffer[0] in the file
+        self._at_eof = False
+        in_array = False
+
+        self._read_more()
+        while True:
+            # Skip separators between records; array brackets are unwrapped one level
+            buffer, position = self._buffer, self._position
+            while position < len(buffer) and (buffer[position] in SEPARATORS or in_array and buffer[position] == "]"):
+                position += 1
+                if buffer[position - 1] == "]":
+                    in_array = False
+                    if self.single_array:
+                        self._position = position
+                        return
+            self._position = position
+
+            if position == len(buffer):
+                if self._at_eof:
+                    return
+                self._read_more()
+                continue
+            if buffer[position] == "[" and not in_array:
+                in_array = True
+                self._position += 1
+                continue
+
+            try:
+                record, end = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                if not self._at_eof and self._is_incomplete(error):
+                    self._read_more(grow=True)
+                else:
+                    self._skip_damaged(error)
+                continue
+
+            # A scalar is only complete once a delimiter or the end of the file follows it
+            if not isinstance(record, (dict, list)) and (end < len(buffer) or not self._at_eof) \
+                    and (end == len(buffer) or buffer[end] not in SCALAR_DELIMITERS):
+                if self._scalar_may_continue(end):
+                    self._read_more(grow=True)
+                else:
+                    self._skip_damaged(json.JSONDecodeError("Expecting delimiter after value", buffer, end))
+                continue
+
+            self._position = end
+            self.count += 1
+            yield record
+
+    def _read_more(self, grow=False):
+        """
+        Drops the consumed part of the buffer and appends the next chunk of the file. With grow=True
+        (the pending record is incomplete) the read is as large as the pending data, so a record
+        spanning many chunks is decoded O(log n) times instead of once per chunk.
+        """
+        size = max(self.chunk_size, len(self._buffer) - self._position) if grow else self.chunk_size
+        chunk = self._file.read(size)
+        self._at_eof = not chunk
+        consumed = self._buffer[:self._position]
+        self._buffer_offset += _byte_length(consumed)
+        self._buffer = self._buffer[self._position:] + self._text_decoder.decode(chunk, final=self._at_eof)
+        self._position = 0
+
+    def _scalar_may_continue(self, end):
+        """True if the characters after a scalar run to the buffer edge, so the next chunk may extend it."""
+        if self._at_eof:
+            return False
+        buffer = self._buffer
+        while end < len(buffer) and buffer[end] not in SCALAR_DELIMITERS:
+            end += 1
+        return end == len(buffer)
+
+    def _is_incomplete(self, error):
+        """True if a decode error may go away once more of the file is buffered."""
+        if error.msg.startswith("Unterminated string"):
+            return len(self._buffer) - error.pos <= self.max_string_length
+        tail = self._buffer[error.pos:]
+        return len(tail) <= INCOMPLETE_MARGIN or not tail.strip()
+
+    def _skip_damaged(self, error):
+        """Records the damaged record at the current position and advances to the next resync point."""
+        offset = self._buffer_offset + _byte_length(self._buffer[:self._position])
+        error_offset = offset + _byte_length(self._buffer[self._position:error.pos])
+
+        search_from = self._position + 1
+        while True:
+            match = RESYNC_PATTERN.search(self._buffer, search_from)
+            if match or self._at_eof:
+                break
+            # Drop the damaged bytes, keeping any trailing "}" or newline a resync point may start with
+            keep_from = max(self._buffer.rfind("}", search_from), self._buffer.rfind("\n", search_from))
+            self._position = keep_from if keep_from >= 0 else len(self._buffer)
+            self._read_more()
+            search_from = 0
+
+        resync = match.start(1) if match and match.group(1) else match.start(2) if match else len(self._buffer)
+        length = self._buffer_offset + _byte_length(self._buffer[:resync]) - offset
+        self.damaged.append({"offset": offset, "length": length, "error": f"{error.msg} (byte {error_offset})"})
+        self._position = resync
+
+
+def iter_json_records(filepath, chunk_size=DEFAULT_CHUNK_SIZE, damaged=None):
+    """
+    Yields the records of a JSON array, NDJSON or concatenated JSON file (see JsonRecordReader).
+    Damaged records are skipped and, if a list is given, appended to `damaged`.
+    """
+    reader = JsonRecordReader(filepath, chunk_size)
+    yield from reader
+    if damaged is not None:
+        damaged.extend(reader.damaged)
+
+
+# ===========================
+# SELECTIVE SUBTREE READER
+# ===========================
+
+STREAM_MODE = "stream"
+MMAP_MODE = "mmap"
+READ_MODES = [STREAM_MODE, MMAP_MODE]
+
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Everything up to the next bracket: complete strings and any other bytes, in a single regex call
+_SKIP_RUN = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+_WHITESPACE = b" \t\r\n"
+_QUOTE = ord('"')
+_OPENERS = b"{["
+
+
+class _ByteScanner:
+    """
+    Walks the raw bytes of a JSON document and finds where values end without decoding them.
+    Works over a memory map (the whole file is addressable) or over a growing buffer of chunks,
+    in which case everything before `mark` (or before `pos` when no value is being kept) is dropped.
+    """
+
+    def __init__(self, buffer, infile=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.buffer = buffer
+        self.infile = infile
+        self.chunk_size = chunk_size
+        self.offset = 0  # byte offset of buffer[0] in the file
+        self.pos = 0
+        self.mark = None
+
+    def fill(self):
+        """Reads the next chunk; returns False at end of file."""
+        if self.infile is None:
+            return False
+        keep_from = self.pos if self.mark is None else self.mark
+        chunk = self.infile.read(max(self.chunk_size, len(self.buffer) - keep_from))
+        if not chunk:
+            return False
+        del self.buffer[:keep_from]
+        self.offset += keep_from
+        self.pos -= keep_from
+        if self.mark is not None:
+            self.mark -= keep_from
+        self.buffer += chunk
+        return True
+
+    def _unexpected_end(self):
+        return ValueError(f"Unexpected end of JSON document at byte {self.offset + self.pos}")
+
+    def peek(self):
+        while self.pos >= len(self.buffer):
+            if not self.fill():
+                raise self._unexpected_end()
+        return self.buffer[self.pos]
+
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def expect(self, allowed):
+        self.skip_whitespace()
+        char = self.peek()
+        if char not in allowed:
+            raise ValueError(f"Expected one of {allowed!r} at byte {self.offset + self.pos}, found {bytes([char])!r}")
+        self.pos += 1
+        return char
+
+    def skip_value(self):
+        """Advances past the value at the current position."""
+        self.skip_whitespace()
+        first = self.peek()
+
+        if first == _QUOTE:
+            while (match := _STRING.match(self.buffer, self.pos)) is None:
+                if not self.fill():
+                    raise self._unexpected_end()
+            self.pos = match.end()
+
+        elif first in _OPENERS:
+            depth = 0
+            while True:
+                self.pos = _SKIP_RUN.match(self.buffer, self.pos).end()
+                # Stopped at a bracket, or at a string cut by the end of the buffer
+                if self.pos == len(self.buffer) or self.buffer[self.pos] == _QUOTE:
+                    if not self.fill():
+                        raise self._unexpected_end()
+                    continue
+                depth += 1 if self.buffer[self.pos] in _OPENERS else -1
+                self.pos += 1
+                if depth == 0:
+                    return
+
+        else:
+            while (match := _SCALAR_END.search(self.buffer, self.pos)) is None:
+                self.pos = len(self.buffer)
+                if not self.fill():
+                    return
+            self.pos = match.start()
+
+    def decode_value(self):
+        """Decodes the value at the current position and advances past it."""
+        self.skip_whitespace()
+        self.mark = self.pos
+        self.skip_value()
+        value = json.loads(self.buffer[self.mark:self.pos])
+        self.mark = None
+        return value
+
+    def find_key(self, key):
+        """Walks the top-level object up to the value of key, skipping other values. Returns False if absent."""
+        self.expect(b"{")
+        self.skip_whitespace()
+        if self.peek() == ord("}"):
+            return False
+        while True:
+            self.skip_whitespace()
+            current_key = self.decode_value()
+            self.expect(b":")
+            if current_key == key:
+                self.skip_whitespace()
+                return True
+            self.skip_value()
+            if self.expect(b",}") == ord("}"):
+                return False
+
+    def array_reader(self):
+        """JsonRecordReader over the array at the current position, decoding its elements with raw_decode."""
+        if self.peek() != ord("["):
+            raise ValueError(f"Expected an array at byte {self.offset + self.pos}")
+        if self.infile is None:
+            self.buffer.seek(self.pos)
+            return JsonRecordReader(self.buffer, self.chunk_size, single_array=True, start_offset=self.pos)
+        return JsonRecordReader(self.infile, self.chunk_size, single_array=True,
+                                start_offset=self.offset + self.pos, prefix=bytes(self.buffer[self.pos:]))
+
+
+@contextmanager
+def _open_scanner(filepath, mode=STREAM_MODE, chunk_size=DEFAULT_CHUNK_SIZE):
+    if mode not in READ_MODES:
+        raise ValueError(f"Invalid read mode '{mode}': must be one of {READ_MODES}.")
+    with open(filepath, "rb") as infile:
+        if mode == STREAM_MODE:
+            yield _ByteScanner(bytearray(), infile, chunk_size)
+            return
+        if os.fstat(infile.fileno()).st_size == 0:
+            raise ValueError(f"{filepath} is empty")
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield _ByteScanner(mapped, chunk_size=chunk_size)
+
+
+def has_top_level_key(filepath, key, mode=STREAM_MODE):
+    """True if the file holds a JSON object with key at its top level."""
+    try:
+        with _open_scanner(filepath, mode) as scanner:
+            return scanner.find_key(key)
+    except ValueError:
+        return False
+
+
+def iter_subtree_items(filepath, key, mode=STREAM_MODE, chunk_size=DEFAULT_CHUNK_SIZE, damaged=None):
+    """
+    Yields the elements of the array stored under one top-level key (e.g. "matchApp") of a JSON
+    object file. Other top-level values are skipped by scanning their bytes, without being built.
+    Yields nothing if the key is absent. Damaged elements are skipped as in JsonRecordReader and,
+    if a list is given, appended to `damaged`.
+
+    :param mode: STREAM_MODE reads the file in chunks (memory bounded by the largest element);
+                 MMAP_MODE memory-maps it and lets the OS page it in.
+    """
+    with _open_scanner(filepath, mode, chunk_size) as scanner:
+        if not scanner.find_key(key):
+            return
+        reader = scanner.array_reader()
+        yield from reader
+        if damaged is not None:
+            damaged.extend(reader.damaged)
+
+
+def load_subtree(filepath, key, default=None, mode=STREAM_MODE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Decodes only the value under one top-level key of a JSON object file, or returns default if it is absent."""
+    with _open_scanner(filepath, mode, chunk_size) as scanner:
+        if not scanner.find_key(key):
+            return default
+        if scanner.peek() == ord("["):
+            return list(scanner.array_reader())
+        return scanner.decode_value()
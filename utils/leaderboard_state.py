@@ -0,0 +1,259 @@
+import os
+import json
+import hashlib
+from collections import defaultdict
+from utils.scouter_leaderboard import (
+    ALLIANCES,
+    TELE_CORAL_KEYS,
+    AUTO_CORAL_KEYS,
+    DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT,
+    entry_alliance,
+    entry_coral_counts,
+    extract_tba_counts,
+    match_penalties,
+    relative_penalty,
+    save_leaderboard_outputs
+)
+
+# ===========================
+# CONSTANTS
+# ===========================
+
+STATE_VERSION = 1
+STATE_FILE_NAME = "leaderboard_state.json"
+
+
+# ===========================
+# STATE PERSISTENCE
+# ===========================
+
+def new_leaderboard_state(event_key, year, attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT):
+    """Returns an empty leaderboard state for an event."""
+    return {
+        "version": STATE_VERSION,
+        "event_key": event_key,
+        "year": year,
+        "attributes_testing_for_count": attributes_testing_for_count,
+        "matches": {},
+        "tba_counts": {},
+        "penalties": {},
+        "total_entries": {},
+        "relative_penalties": {}
+    }
+
+
+def load_leaderboard_state(state_path, event_key, year, attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT):
+    """
+    Loads the persisted leaderboard state, starting fresh if the file is missing
+    or belongs to a different event.
+    """
+    if os.path.exists(state_path):
+        with open(state_path, "r") as f:
+            state = json.load(f)
+        if (state.get("version") == STATE_VERSION
+                and state.get("event_key") == event_key
+                and state.get("year") == year
+                and state.get("attributes_testing_for_count") == attributes_testing_for_count):
+            return state
+    return new_leaderboard_state(event_key, year, attributes_testing_for_count)
+
+
+def save_leaderboard_state(state_path, state):
+    """Atomically writes the leaderboard state so an interrupted run never leaves a partial file."""
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(temp_path, state_path)
+
+
+# ===========================
+# PER-MATCH HELPERS
+# ===========================
+
+def group_entries_by_match(scouting_data):
+    """Groups scouting entries by match number (as a string), skipping entries without one."""
+    grouped = defaultdict(list)
+    for entry in scouting_data:
+        match_num = entry.get("metadata", {}).get("matchNumber")
+        if match_num is None:
+            continue
+        grouped[str(match_num)].append(entry)
+    return grouped
+
+
+def match_fingerprint(entries):
+    """Hashes only the fields the leaderboard depends on, so unrelated edits don't trigger reprocessing."""
+    relevant = []
+    for entry in entries:
+        metadata = entry.get("metadata", {})
+        vars_dict = entry.get("variables", {})
+        relevant.append([
+            metadata.get("scouterName", "Unknown"),
+            metadata.get("robotPosition", ""),
+            [vars_dict.get(key, 0) for key in TELE_CORAL_KEYS + AUTO_CORAL_KEYS]
+        ])
+    relevant.sort(key=lambda item: json.dumps(item))
+    return hashlib.sha1(json.dumps(relevant).encode("utf-8")).hexdigest()
+
+
+def summarize_match(entries):
+    """
+    Builds the per-alliance coral counts, contributing scouters and entry counts for one match.
+
+    :param entries: Scouting entries belonging to a single match.
+    :return: Tuple of (alliances dict, entries-per-scouter dict).
+    """
+    alliances = {
+        alliance: {"teleCoralCount": 0, "autoCoralCount": 0, "scouters": set()}
+        for alliance in ALLIANCES
+    }
+    entry_counts = defaultdict(int)
+
+    for entry in entries:
+        alliance = entry_alliance(entry)
+        scouter = entry.get("metadata", {}).get("scouterName", "Unknown")
+        tele_count, auto_count = entry_coral_counts(entry)
+
+        alliances[alliance]["teleCoralCount"] += tele_count
+        alliances[alliance]["autoCoralCount"] += auto_count
+        alliances[alliance]["scouters"].add(scouter)
+        entry_counts[scouter] += 1
+
+    for alliance in ALLIANCES:
+        alliances[alliance]["scouters"] = sorted(alliances[alliance]["scouters"])
+
+    return alliances, dict(entry_counts)
+
+
+# ===========================
+# INCREMENTAL UPDATE
+# ===========================
+
+def _apply_counts(totals, counts, sign, touched):
+    for scouter, count in counts.items():
+        totals[scouter] = totals.get(scouter, 0) + sign * count
+        if totals[scouter] == 0:
+            del totals[scouter]
+        touched.add(scouter)
+
+
+def _retract_match(state, match_key, touched):
+    record = state["matches"].pop(match_key, None)
+    if record is None:
+        return
+    _apply_counts(state["total_entries"], record["entries"], -1, touched)
+    _apply_counts(state["penalties"], record["penalties"], -1, touched)
+
+
+def update_leaderboard_state(state, scouting_data, fetch_match):
+    """
+    Brings the leaderboard state up to date with the current scouting data.
+
+    Only matches that are newly scouted, whose scouting entries changed, or that had no
+    TBA result yet are (re)processed; everything else is reused from the state.
+
+    :param state: Leaderboard state from load_leaderboard_state (updated in place).
+    :param scouting_data: List of cleaned scouting entries.
+    :param fetch_match: Callable taking a match number and returning the TBA match dict.
+    :return: Dict with the lists of processed, pending and removed match keys.
+    """
+    grouped = group_entries_by_match(scouting_data)
+    touched = set()
+    processed, pending, removed = [], [], []
+
+    # Matches that disappeared from the scouting data (e.g. voided during cleaning)
+    for match_key in [key for key in state["matches"] if key not in grouped]:
+        _retract_match(state, match_key, touched)
+        removed.append(match_key)
+
+    for match_key, entries in grouped.items():
+        fingerprint = match_fingerprint(entries)
+        record = state["matches"].get(match_key)
+        if record is not None and record["fingerprint"] == fingerprint and record["status"] == "processed":
+            continue
+
+        _retract_match(state, match_key, touched)
+        alliances, entry_counts = summarize_match(entries)
+
+        tba_counts = state["tba_counts"].get(match_key)
+        if tba_counts is None:
+            try:
+                match_num = int(match_key)
+            except ValueError:
+                match_num = match_key
+            print(f"Processing match {match_num}...")
+            try:
+                tba_counts = extract_tba_counts(fetch_match(match_num))
+            except Exception as e:
+                print(f"Error retrieving TBA match data for match {match_num}: {e}")
+                tba_counts = None
+            if tba_counts is not None:
+                state["tba_counts"][match_key] = tba_counts
+
+        if tba_counts is None:
+            penalties = {}
+            status = "pending"
+            pending.append(match_key)
+        else:
+            alliance_scouters = {alliance: alliances[alliance]["scouters"] for alliance in ALLIANCES}
+            penalties = match_penalties(match_key, alliances, alliance_scouters, tba_counts)
+            status = "processed"
+            processed.append(match_key)
+
+        state["matches"][match_key] = {
+            "fingerprint": fingerprint,
+            "status": status,
+            "alliances": alliances,
+            "entries": entry_counts,
+            "penalties": penalties
+        }
+        _apply_counts(state["total_entries"], entry_counts, 1, touched)
+        _apply_counts(state["penalties"], penalties, 1, touched)
+
+    # Update relative penalties in place, only for scouters whose counts changed
+    attributes = state["attributes_testing_for_count"]
+    for scouter in touched:
+        entry_count = state["total_entries"].get(scouter, 0)
+        if entry_count == 0:
+            state["relative_penalties"].pop(scouter, None)
+        else:
+            state["relative_penalties"][scouter] = relative_penalty(state["penalties"].get(scouter, 0), entry_count, attributes)
+
+    return {"processed": processed, "pending": pending, "removed": removed}
+
+
+def alliance_summary_from_state(state):
+    """Rebuilds the alliance summary output (coral counts per match and alliance) from the state."""
+    return {
+        match_key: {
+            alliance: {
+                "teleCoralCount": record["alliances"][alliance]["teleCoralCount"],
+                "autoCoralCount": record["alliances"][alliance]["autoCoralCount"]
+            }
+            for alliance in ["blue", "red"]
+        }
+        for match_key, record in state["matches"].items()
+    }
+
+
+def run_incremental_update(scouting_data, fetch_match, output_dir, event_key, year,
+                           attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT):
+    """
+    Updates the leaderboard state persisted in output_dir and rewrites the leaderboard outputs.
+
+    :return: Tuple of (updated state, dict with the lists of processed, pending and removed match keys).
+    """
+    state_path = os.path.join(output_dir, STATE_FILE_NAME)
+    state = load_leaderboard_state(state_path, event_key, year, attributes_testing_for_count)
+    changes = update_leaderboard_state(state, scouting_data, fetch_match)
+    save_leaderboard_state(state_path, state)
+
+    save_leaderboard_outputs({
+        "alliance_summary": alliance_summary_from_state(state),
+        "penalties": state["penalties"],
+        "relative_penalties": state["relative_penalties"]
+    }, output_dir)
+    return state, changes
@@ -0,0 +1,153 @@
+from operator import itemgetter
+import numpy as np
+import pandas as pd
+
+# ===========================
+# CONSTANTS
+# ===========================
+
+REQUIRED_METADATA_KEYS = ["scouterName", "matchNumber", "robotTeam", "robotPosition"]
+TEAMS_PER_MATCH = 6
+
+# Per-match reason codes (bit flags, combined with |)
+REASON_OK = 0
+REASON_WRONG_TEAM_COUNT = 1
+REASON_DUPLICATE_TEAM = 2
+REASON_DUPLICATE_POSITION = 4
+
+REASON_DESCRIPTIONS = {
+    REASON_WRONG_TEAM_COUNT: "wrong team count",
+    REASON_DUPLICATE_TEAM: "duplicate team",
+    REASON_DUPLICATE_POSITION: "duplicate position"
+}
+
+
+# ===========================
+# COLUMN EXTRACTION
+# ===========================
+
+def missing_metadata_reason(entry):
+    """Returns why an entry lacks required metadata, or None if it has all of it."""
+    if "metadata" not in entry:
+        return "Missing metadata"
+    metadata = entry["metadata"]
+    missing_keys = [key for key in REQUIRED_METADATA_KEYS if key not in metadata]
+    if missing_keys:
+        return f"Missing metadata keys: {', '.join(missing_keys)}"
+    return None
+
+
+def extract_metadata_columns(data):
+    """
+    Pulls the match, team and position of every entry with complete metadata into columns.
+
+    :return: Tuple of (entry indices, match column, team column, position column, {index: reason} for skipped entries).
+    """
+    get_keys = itemgetter(*REQUIRED_METADATA_KEYS)
+    try:
+        # Fast path: every entry is complete
+        rows = [get_keys(entry["metadata"]) for entry in data]
+        indices = np.arange(len(rows), dtype=np.int64)
+        skipped = {}
+    except (KeyError, TypeError):
+        rows, indices, skipped = [], [], {}
+        for index, entry in enumerate(data):
+            reason = missing_metadata_reason(entry)
+            if reason is not None:
+                skipped[index] = reason
+                continue
+            rows.append(get_keys(entry["metadata"]))
+            indices.append(index)
+        indices = np.array(indices, dtype=np.int64)
+
+    matches = [row[1] for row in rows]
+    teams = [row[2] for row in rows]
+    positions = [row[3] for row in rows]
+    return indices, matches, teams, positions, skipped
+
+
+# ===========================
+# VECTORIZED CHECKS
+# ===========================
+
+def _factorize(values):
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=False)
+    return codes.astype(np.int64), uniques
+
+
+def check_match_integrity(data, teams_per_match=TEAMS_PER_MATCH):
+    """
+    Checks every match for the expected number of teams and for duplicate teams or positions,
+    using grouped counts and duplicate masks over the metadata columns.
+
+    :param data: List of raw scouting entries (not modified).
+    :return: Dict with
+        "match_numbers": match numbers in order of first appearance,
+        "entry_counts": entries per match,
+        "reason_codes": per-match bit flags (REASON_* constants, 0 = valid),
+        "entry_indices", "entry_match_codes": position in data and match of each checked entry,
+        "duplicate_team", "duplicate_position": per-entry masks (True for every repeat after the first),
+        "skipped": {index: reason} for entries missing required metadata.
+    """
+    indices, matches, teams, positions, skipped = extract_metadata_columns(data)
+    match_codes, match_numbers = _factorize(matches)
+    team_codes, team_values = _factorize(teams)
+    position_codes, position_values = _factorize(positions)
+
+    n_matches = len(match_numbers)
+    entry_counts = np.bincount(match_codes, minlength=n_matches)
+
+    # Duplicate masks over (matchNumber, robotTeam) and (matchNumber, robotPosition)
+    duplicate_team = pd.Series(match_codes * max(len(team_values), 1) + team_codes).duplicated().to_numpy()
+    duplicate_position = pd.Series(match_codes * max(len(position_values), 1) + position_codes).duplicated().to_numpy()
+
+    reason_codes = np.where(entry_counts != teams_per_match, REASON_WRONG_TEAM_COUNT, REASON_OK).astype(np.int64)
+    entry_flags = duplicate_team * REASON_DUPLICATE_TEAM | duplicate_position * REASON_DUPLICATE_POSITION
+    np.bitwise_or.at(reason_codes, match_codes, entry_flags.astype(np.int64))
+
+    return {
+        "match_numbers": list(match_numbers),
+        "entry_counts": entry_counts,
+        "reason_codes": reason_codes,
+        "entry_indices": indices,
+        "entry_match_codes": match_codes,
+        "duplicate_team": duplicate_team,
+        "duplicate_position": duplicate_position,
+        "skipped": skipped
+    }
+
+
+def describe_reason_code(code):
+    """Short human readable form of a per-match reason code, e.g. 'wrong team count, duplicate team'."""
+    if code == REASON_OK:
+        return "valid"
+    return ", ".join(description for flag, description in REASON_DESCRIPTIONS.items() if code & flag)
+
+
+def removal_reasons(data, integrity, teams_per_match=TEAMS_PER_MATCH):
+    """
+    Expands the reason codes of invalid matches into the detailed removal reason messages,
+    in the same order the per-entry checks report them.
+
+    :return: Dict of match code -> list of reason strings, for invalid matches only.
+    """
+    reasons = {}
+    match_numbers = integrity["match_numbers"]
+    for match_code in np.flatnonzero(integrity["reason_codes"]):
+        if integrity["reason_codes"][match_code] & REASON_WRONG_TEAM_COUNT:
+            reasons[match_code] = [
+                f"Match {match_numbers[match_code]} does not have exactly {teams_per_match} teams "
+                f"(found {integrity['entry_counts'][match_code]})"
+            ]
+        else:
+            reasons[match_code] = []
+
+    flagged = np.flatnonzero(integrity["duplicate_team"] | integrity["duplicate_position"])
+    for row in flagged:
+        match_code = integrity["entry_match_codes"][row]
+        metadata = data[integrity["entry_indices"][row]]["metadata"]
+        if integrity["duplicate_team"][row]:
+            reasons[match_code].append(f"Duplicate team {metadata['robotTeam']} in match {match_numbers[match_code]}")
+        if integrity["duplicate_position"][row]:
+            reasons[match_code].append(f"Duplicate position {metadata['robotPosition']} in match {match_numbers[match_code]}")
+    return reasons
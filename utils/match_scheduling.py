@@ -0,0 +1,319 @@
+import numpy as np
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+# Defaults for the "schedule" section of the data generation config
+DEFAULT_SCHEDULE_CONFIG = {
+    "min_turnaround_matches": 3,   # matches a team sits out between two of its matches
+    "max_partner_repeats": 1,      # times two teams may play on the same alliance
+    "max_opponent_repeats": 2      # times two teams may play against each other
+}
+
+# Times the repeat limits are raised before the turnaround constraint is dropped
+RELAX_STEPS_BEFORE_TURNAROUND = 6
+
+# Trailing matches repaired once the schedule is built (see MatchScheduler._repair_last_matches)
+REPAIRED_LAST_MATCHES = 3
+
+
+# ===========================
+# BUCKET QUEUE
+# ===========================
+
+class MatchCountQueue:
+    """
+    Bucket queue of teams keyed by matches played. Bucket k holds the teams that played k matches
+    in the order they last played, so walking the buckets from the lowest count yields the teams
+    that are furthest behind, longest rested first. Moving a team to the next bucket is O(1)
+    (dicts keep insertion order and delete in O(1)).
+    """
+
+    def __init__(self, teams):
+        self.buckets = [dict.fromkeys(teams)]
+        self.counts = {team: 0 for team in teams}
+        self.lowest = 0
+
+    def __iter__(self):
+        for bucket in self.buckets[self.lowest:]:
+            yield from bucket
+
+    def played(self, team):
+        count = self.counts[team]
+        del self.buckets[count][team]
+        if count + 1 == len(self.buckets):
+            self.buckets.append({})
+        self.buckets[count + 1][team] = None
+        self.counts[team] = count + 1
+        while not self.buckets[self.lowest]:
+            self.lowest += 1
+
+    def min_count(self):
+        return self.lowest
+
+
+# ===========================
+# SCHEDULER
+# ===========================
+
+def _pair(team_a, team_b):
+    return (team_a, team_b) if team_a < team_b else (team_b, team_a)
+
+
+class MatchScheduler:
+    """
+    Greedy qualification schedule builder. Every match takes the teams with the fewest matches
+    played (from a MatchCountQueue) that satisfy, in order of importance:
+      - a minimum turnaround: a team sits out `min_turnaround_matches` matches between matches,
+      - partner limit: two teams share an alliance at most `max_partner_repeats` times,
+      - opponent limit: two teams face each other at most `max_opponent_repeats` times.
+    When no teams satisfy every constraint (small events), the opponent and partner limits are
+    raised step by step, and the turnaround is given up last. Alliances are then oriented red/blue
+    so each team's red and blue appearances stay balanced.
+    """
+
+    def __init__(self, teams, teams_per_match=6, min_turnaround_matches=3, max_partner_repeats=1,
+                 max_opponent_repeats=2, rng=None):
+        if teams_per_match % 2:
+            raise ValueError(f"teams_per_match ({teams_per_match}) must be even to form two alliances.")
+        if teams_per_match > len(teams):
+            raise ValueError(f"teams_per_match ({teams_per_match}) cannot be greater than total teams ({len(teams)}).")
+
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.alliance_size = teams_per_match // 2
+        # Keep at least two matches worth of teams eligible, or the same groups would repeat forever
+        self.min_turnaround = max(0, min(min_turnaround_matches, len(teams) // teams_per_match - 2))
+        self.max_partner_repeats = max_partner_repeats
+        self.max_opponent_repeats = max_opponent_repeats
+
+        order = [teams[index] for index in self.rng.permutation(len(teams))]
+        self.queue = MatchCountQueue(order)
+        self.last_match = {team: -(self.min_turnaround + 1) for team in teams}
+        self.red_balance = {team: 0 for team in teams}  # red appearances - blue appearances
+        self.partners = {}
+        self.opponents = {}
+        self.matches = []
+        self.targets = None  # matches each team should play, set by build
+        self.unfinished = 0  # teams below their target
+
+    def _fill(self, match_index, check_turnaround, partner_limit, opponent_limit, capped):
+        """
+        Picks two alliances greedily from the queue; returns them, or None if they can't be filled.
+        When capped, teams that reached their target are skipped.
+        """
+        alliances = ([], [])
+        for team in self.queue:
+            if capped and self.queue.counts[team] >= self.targets[team]:
+                continue
+            if check_turnaround and match_index - self.last_match[team] <= self.min_turnaround:
+                continue
+            # Side 0 usually ends up red: teams that played blue more often try it first
+            balance = self.red_balance[team]
+            sides = (0, 1) if balance < 0 else (1, 0) if balance > 0 else \
+                sorted((0, 1), key=lambda side: len(alliances[side]))
+            for side in sides:
+                own, other = alliances[side], alliances[1 - side]
+                if len(own) == self.alliance_size:
+                    continue
+                if any(self.partners.get(_pair(team, partner), 0) >= partner_limit for partner in own):
+                    continue
+                if any(self.opponents.get(_pair(team, opponent), 0) >= opponent_limit for opponent in other):
+                    continue
+                own.append(team)
+                break
+            if len(alliances[0]) == len(alliances[1]) == self.alliance_size:
+                return alliances
+        return None
+
+    def next_match(self):
+        match_index = len(self.matches)
+        # Teams that reached their target sit out, unless too few teams are left to fill a match
+        capped = self.targets is not None and self.unfinished >= 2 * self.alliance_size
+        # Small events can't meet the repeat limits; raise them one step at a time, opponents first.
+        # If a few steps don't help, the turnaround is given up as well.
+        alliances, relax = None, 0
+        while alliances is None:
+            check_turnaround = relax < RELAX_STEPS_BEFORE_TURNAROUND
+            steps = relax if check_turnaround else relax - RELAX_STEPS_BEFORE_TURNAROUND
+            partner_limit = self.max_partner_repeats + steps // 2
+            opponent_limit = self.max_opponent_repeats + (steps + 1) // 2
+            alliances = self._fill(match_index, check_turnaround, partner_limit, opponent_limit, capped)
+            relax += 1
+
+        first, second = alliances
+        # Red goes to the alliance whose teams played blue more often
+        if sum(self.red_balance[team] for team in first) > sum(self.red_balance[team] for team in second):
+            first, second = second, first
+        red, blue = list(first), list(second)
+        self.rng.shuffle(red)
+        self.rng.shuffle(blue)
+
+        for own, other, balance in ((red, blue, 1), (blue, red, -1)):
+            for index, team in enumerate(own):
+                self.red_balance[team] += balance
+                self.last_match[team] = match_index
+                for partner in own[index + 1:]:
+                    key = _pair(team, partner)
+                    self.partners[key] = self.partners.get(key, 0) + 1
+                if balance == 1:
+                    for opponent in other:
+                        key = _pair(team, opponent)
+                        self.opponents[key] = self.opponents.get(key, 0) + 1
+                self.queue.played(team)
+                if self.targets is not None and self.queue.counts[team] == self.targets[team]:
+                    self.unfinished -= 1
+
+        match = red + blue
+        self.matches.append(match)
+        return match
+
+    def build(self, matches_per_team):
+        """
+        Adds matches until every team has played matches_per_team; returns all matches (red first,
+        then blue). When the number of teams times matches_per_team isn't a multiple of
+        teams_per_match, a few teams play one more match to fill the last one, like the loop
+        generator and round_robin_schedule.
+        """
+        # The teams playing one more are picked up front, so every match but the last can't run over
+        teams_per_match = 2 * self.alliance_size
+        extra_slots = -len(self.last_match) * matches_per_team % teams_per_match
+        self.targets = {team: matches_per_team + (index < extra_slots) for index, team in enumerate(self.queue)}
+        self.unfinished = len(self.targets)
+        while self.queue.min_count() < matches_per_team:
+            self.next_match()
+        self._repair_last_matches()
+        return self.matches
+
+    # ----- repair of the last matches -----
+
+    def _slot_pairs(self, match, slot, team):
+        """Partner and opponent pairs `team` would have if it played in `slot` of `match`."""
+        red = slot < self.alliance_size
+        own = match[:self.alliance_size] if red else match[self.alliance_size:]
+        other = match[self.alliance_size:] if red else match[:self.alliance_size]
+        partners = [_pair(team, partner) for index, partner in enumerate(own) if index != slot % self.alliance_size]
+        return partners, [_pair(team, opponent) for opponent in other]
+
+    def _turnaround_breaks(self, match_indices):
+        """Gaps between a team's (sorted) matches that are shorter than the turnaround."""
+        return sum(later - earlier <= self.min_turnaround for earlier, later in zip(match_indices, match_indices[1:]))
+
+    def _has_violation(self, match_index, slot, team_matches):
+        team = self.matches[match_index][slot]
+        partners, opponents = self._slot_pairs(self.matches[match_index], slot, team)
+        previous = [index for index in team_matches[team] if index < match_index]
+        return (previous and match_index - previous[-1] <= self.min_turnaround) or \
+            any(self.partners[pair] > self.max_partner_repeats for pair in partners) or \
+            any(self.opponents[pair] > self.max_opponent_repeats for pair in opponents)
+
+    def _swap_gains(self, match_a, slot_a, match_b, slot_b, team_matches, moved):
+        """
+        What a swap improves (negative: worsens): the turnaround breaks of each of the two teams, then
+        the partner and the opponent repeats over the limits. Repeats count squared, so a swap can't
+        trade a few small excesses for one larger one.
+        """
+        team_a, team_b = self.matches[match_a][slot_a], self.matches[match_b][slot_b]
+        gains = [self._turnaround_breaks(team_matches[team]) - self._turnaround_breaks(moved[team])
+                 for team in (team_a, team_b)]
+        for pair_index, (counts, limit) in enumerate(((self.partners, self.max_partner_repeats),
+                                                      (self.opponents, self.max_opponent_repeats))):
+            changes = {}
+            for match, slot, old, new in ((match_a, slot_a, team_a, team_b), (match_b, slot_b, team_b, team_a)):
+                for pair in self._slot_pairs(self.matches[match], slot, old)[pair_index]:
+                    changes[pair] = changes.get(pair, 0) - 1
+                for pair in self._slot_pairs(self.matches[match], slot, new)[pair_index]:
+                    changes[pair] = changes.get(pair, 0) + 1
+            gains.append(sum(max(0, counts.get(pair, 0) - limit) ** 2 - max(0, counts.get(pair, 0) + change - limit) ** 2
+                             for pair, change in changes.items()))
+        return gains
+
+    def _swap(self, match_a, slot_a, match_b, slot_b):
+        """Swaps the teams of two slots, updating the partner and opponent counts."""
+        team_a, team_b = self.matches[match_a][slot_a], self.matches[match_b][slot_b]
+        for match, slot, old, new in ((match_a, slot_a, team_a, team_b), (match_b, slot_b, team_b, team_a)):
+            old_partners, old_opponents = self._slot_pairs(self.matches[match], slot, old)
+            new_partners, new_opponents = self._slot_pairs(self.matches[match], slot, new)
+            for counts, removed, added in ((self.partners, old_partners, new_partners),
+                                           (self.opponents, old_opponents, new_opponents)):
+                for pair in removed:
+                    counts[pair] -= 1
+                for pair in added:
+                    counts[pair] = counts.get(pair, 0) + 1
+        self.matches[match_a][slot_a], self.matches[match_b][slot_b] = team_b, team_a
+
+    def _repair_last_matches(self):
+        """
+        The last matches take whichever teams still need matches, so that's where the turnaround and
+        the limits had to give. Swaps their teams with teams of the same color in earlier matches
+        when that removes a turnaround break or a repeat over the limits and makes none of them
+        worse. Match counts and red/blue appearances don't change.
+        """
+        team_matches = {}
+        for index, match in enumerate(self.matches):
+            for team in match:
+                team_matches.setdefault(team, []).append(index)
+
+        for match_a in range(max(0, len(self.matches) - REPAIRED_LAST_MATCHES), len(self.matches)):
+            for slot_a in range(2 * self.alliance_size):
+                if not self._has_violation(match_a, slot_a, team_matches):
+                    continue
+                red = slot_a < self.alliance_size
+                slots = range(self.alliance_size) if red else range(self.alliance_size, 2 * self.alliance_size)
+                for match_b, slot_b in ((match_b, slot_b) for match_b in range(len(self.matches)) for slot_b in slots):
+                    team_a, team_b = self.matches[match_a][slot_a], self.matches[match_b][slot_b]
+                    if team_b in self.matches[match_a] or team_a in self.matches[match_b]:
+                        continue
+                    moved = {
+                        team_a: sorted([index for index in team_matches[team_a] if index != match_a] + [match_b]),
+                        team_b: sorted([index for index in team_matches[team_b] if index != match_b] + [match_a])
+                    }
+                    gains = self._swap_gains(match_a, slot_a, match_b, slot_b, team_matches, moved)
+                    if min(gains) >= 0 and max(gains) > 0:
+                        self._swap(match_a, slot_a, match_b, slot_b)
+                        team_matches.update(moved)
+                        break
+
+
+def schedule_matches(num_teams, matches_per_team, teams_per_match=6, rng=None, **schedule_config):
+    """
+    Builds a qualification schedule for teams 1..num_teams.
+
+    :param schedule_config: Overrides of DEFAULT_SCHEDULE_CONFIG.
+    :return: int array of shape (matches, teams_per_match); the first half of each row is red.
+    """
+    config = {**DEFAULT_SCHEDULE_CONFIG, **schedule_config}
+    scheduler = MatchScheduler(list(range(1, num_teams + 1)), teams_per_match, rng=rng, **config)
+    return np.array(scheduler.build(matches_per_team), dtype=np.int64).reshape(-1, teams_per_match)
+
+
+def schedule_statistics(schedule):
+    """Summary of a schedule's quality: repeat pairings, turnaround and red/blue balance."""
+    teams_per_match = schedule.shape[1]
+    alliance_size = teams_per_match // 2
+    partners, opponents, last_match = {}, {}, {}
+    red_balance, gaps = {}, []
+
+    for match_index, match in enumerate(schedule.tolist()):
+        red, blue = match[:alliance_size], match[alliance_size:]
+        for own, other, balance in ((red, blue, 1), (blue, red, -1)):
+            for index, team in enumerate(own):
+                if team in last_match:
+                    gaps.append(match_index - last_match[team] - 1)
+                last_match[team] = match_index
+                red_balance[team] = red_balance.get(team, 0) + balance
+                for partner in own[index + 1:]:
+                    key = _pair(team, partner)
+                    partners[key] = partners.get(key, 0) + 1
+                if balance == 1:
+                    for opponent in other:
+                        key = _pair(team, opponent)
+                        opponents[key] = opponents.get(key, 0) + 1
+
+    return {
+        "matches": len(schedule),
+        "max_partner_repeats": max(partners.values(), default=0),
+        "max_opponent_repeats": max(opponents.values(), default=0),
+        "min_turnaround_matches": min(gaps, default=0),
+        "max_red_blue_imbalance": max((abs(balance) for balance in red_balance.values()), default=0)
+    }
@@ -0,0 +1,61 @@
+import pandas as pd
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+LONG_TABLE_COLUMNS = ["team", "match", "variable", "value"]
+
+
+# ===========================
+# LONG-FORMAT TABLE
+# ===========================
+
+def build_long_table(team_data):
+    """
+    Builds one long-format table from team-based match data ({team: {"matches": [entries]}}):
+    a row per team, match and numeric variable value. Booleans and non-numeric values (categorical
+    variables, fillers) are left out. "team" and "variable" are categoricals, with teams kept in
+    the order of team_data so charts list them the way the rest of the pipeline does.
+
+    :return: DataFrame with the LONG_TABLE_COLUMNS.
+    """
+    teams, matches, variables, values = [], [], [], []
+    for team, data in team_data.items():
+        team = str(team)
+        for entry in data.get("matches", []):
+            match = entry.get("metadata", {}).get("matchNumber")
+            for variable, value in entry.get("variables", {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    teams.append(team)
+                    matches.append(match)
+                    variables.append(variable)
+                    values.append(value)
+
+    return pd.DataFrame({
+        "team": pd.Categorical(teams, categories=[str(team) for team in team_data]),
+        "match": pd.array(matches, dtype="Int64"),
+        "variable": pd.Categorical(variables),
+        "value": pd.array(values, dtype="float64"),
+    }, columns=LONG_TABLE_COLUMNS)
+
+
+def split_by_variable(table):
+    """Variable -> its rows of the long table, split in a single pass."""
+    return {variable: rows for variable, rows in table.groupby("variable", observed=True)}
+
+
+# ===========================
+# CHART DATA
+# ===========================
+
+def team_distribution(variable_rows, variable):
+    """Boxplot / violin plot data of one variable: {"variable", "groups": {team: [values]}}."""
+    groups = variable_rows.groupby("team", observed=True)["value"]
+    return {"variable": variable, "groups": {team: values.tolist() for team, values in groups}}
+
+
+def value_distribution(rows_by_variable, variables):
+    """Histogram data of every match value of variables: {"variables": {variable: [values]}}."""
+    return {"variables": {variable: rows_by_variable[variable]["value"].tolist()
+                          for variable in variables if variable in rows_by_variable}}
@@ -0,0 +1,161 @@
+import os
+import json
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.logging import log_message
+from utils.scouter_leaderboard import (
+    DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT,
+    create_tba_client,
+    make_match_fetcher,
+    compute_relative_penalties
+)
+from utils.leaderboard_state import run_incremental_update
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+EVENTS_DATA_DIR = os.path.join("data", "events")
+EVENTS_OUTPUT_DIR = os.path.join("outputs", "events")
+SEASON_OUTPUT_DIR = os.path.join("outputs", "season", "scouter_leaderboard")
+
+STATISTICS_SCRIPT = os.path.join("data_analysis_scripts", "03_data_analysis_and_statistics_aggregation.py")
+
+
+# ===========================
+# EVENT PARTITIONS
+# ===========================
+
+def event_year(event_key):
+    """Returns the season year encoded at the start of a TBA event key (e.g. 2025caph -> 2025)."""
+    return int(event_key[:4])
+
+
+def event_paths(event_key, data_dir=EVENTS_DATA_DIR, output_dir=EVENTS_OUTPUT_DIR):
+    """Returns the partitioned input and output paths for a single event."""
+    event_data_dir = os.path.join(data_dir, event_key)
+    event_output_dir = os.path.join(output_dir, event_key)
+    return {
+        "scouting_file": os.path.join(event_data_dir, "processed", "cleaned_match_data.json"),
+        "team_based_file": os.path.join(event_data_dir, "processed", "team_based_match_data.json"),
+        "leaderboard_dir": os.path.join(event_output_dir, "scouter_leaderboard"),
+        "team_performance_file": os.path.join(event_output_dir, "team_data", "team_performance_data.json")
+    }
+
+
+# ===========================
+# PER-EVENT WORK
+# ===========================
+
+def run_event_analysis(scouting_data, paths):
+    """Groups an event's entries by team and aggregates team statistics into the event's partition."""
+    from utils.script_loader import load_script
+
+    team_data = {}
+    for entry in scouting_data:
+        team_data.setdefault(entry["metadata"]["robotTeam"], {"matches": []})["matches"].append(entry)
+
+    statistics = load_script(STATISTICS_SCRIPT)
+    team_performance_data = statistics.calculate_team_performance_data(team_data)
+
+    for path, data in [(paths["team_based_file"], team_data),
+                       (paths["team_performance_file"], statistics.convert_to_serializable(team_performance_data))]:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+
+def run_event(event_key, run_analysis=False, attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT,
+              data_dir=EVENTS_DATA_DIR, output_dir=EVENTS_OUTPUT_DIR):
+    """
+    Runs the leaderboard (and optionally the team analysis) for one event in its own partition.
+    Intended to be called inside a worker process, so it never raises; failures are returned.
+
+    :return: Dict with the event's penalties and entry counts, or the error that stopped it.
+    """
+    try:
+        paths = event_paths(event_key, data_dir, output_dir)
+        with open(paths["scouting_file"], "r") as f:
+            scouting_data = json.load(f)
+
+        tba = create_tba_client()
+        state, changes = run_incremental_update(
+            scouting_data,
+            make_match_fetcher(tba, event_key, event_year(event_key)),
+            paths["leaderboard_dir"],
+            event_key,
+            event_year(event_key),
+            attributes_testing_for_count
+        )
+
+        if run_analysis:
+            run_event_analysis(scouting_data, paths)
+
+        return {
+            "event_key": event_key,
+            "status": "ok",
+            "penalties": state["penalties"],
+            "total_entries": state["total_entries"],
+            "pending_matches": changes["pending"]
+        }
+    except Exception as e:
+        return {"event_key": event_key, "status": "failed", "error": f"{e}\n{traceback.format_exc()}"}
+
+
+# ===========================
+# SEASON MERGE
+# ===========================
+
+def merge_season_leaderboard(event_results, attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT):
+    """
+    Merges per-event penalty and entry counts into a season-wide scouter leaderboard.
+
+    :param event_results: Results from run_event, in any order.
+    :return: Dict with season "penalties", "total_entries", "relative_penalties" and contributing "events".
+    """
+    penalties = {}
+    total_entries = {}
+    events = []
+
+    # Sort so the merged output doesn't depend on worker completion order
+    for result in sorted(event_results, key=lambda r: r["event_key"]):
+        if result["status"] != "ok":
+            continue
+        events.append(result["event_key"])
+        for scouter, count in result["penalties"].items():
+            penalties[scouter] = penalties.get(scouter, 0) + count
+        for scouter, count in result["total_entries"].items():
+            total_entries[scouter] = total_entries.get(scouter, 0) + count
+
+    return {
+        "events": events,
+        "penalties": penalties,
+        "total_entries": total_entries,
+        "relative_penalties": compute_relative_penalties(penalties, total_entries, attributes_testing_for_count)
+    }
+
+
+def run_events(event_keys, max_workers=None, run_analysis=False,
+               attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT,
+               data_dir=EVENTS_DATA_DIR, output_dir=EVENTS_OUTPUT_DIR):
+    """
+    Processes events in parallel with a process pool and merges the season leaderboard.
+
+    :return: Tuple of (per-event results sorted by event key, season leaderboard).
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_event, event_key, run_analysis, attributes_testing_for_count, data_dir, output_dir): event_key
+            for event_key in dict.fromkeys(event_keys)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            if result["status"] == "ok":
+                log_message("INFO", f"Event {result['event_key']} processed ({len(result['pending_matches'])} matches waiting on TBA).")
+            else:
+                log_message("ERROR", f"Event {result['event_key']} failed: {result['error']}")
+            results.append(result)
+
+    results.sort(key=lambda r: r["event_key"])
+    return results, merge_season_leaderboard(results, attributes_testing_for_count)
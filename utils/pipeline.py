@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.logging import log_message
+from utils.script_loader import load_script
+from utils.artifact_store import artifact_key, ARTIFACT_STORE_DIR
+from utils.watcher import (
+    LAR_DATA_RAW_PATH, RAW_MATCH_DATA_PATH, FIXED_MATCH_DATA_PATH, FORMATTED_MATCH_DATA_PATH,
+    CLEANED_MATCH_DATA_PATH, TEAM_BASED_MATCH_DATA_PATH, TEAM_PERFORMANCE_DATA_PATH_JSON,
+    TEAM_PERFORMANCE_DATA_PATH_CSV, VISUALIZATIONS_DIR, EXPECTED_DATA_STRUCTURE_PATH, LEADERBOARD_OUTPUT_DIR,
+    RAW_PREPARATION_CODE, LIST_STRUCTURE_FIX_SCRIPT, CLEANING_SCRIPT, TEAM_RESTRUCTURING_SCRIPT,
+    STATISTICS_SCRIPT, VISUALIZATIONS_SCRIPT, CHART_RENDERING_CODE, MATCH_TABLE_CODE, JSON_STREAMING_CODE
+)
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+PIPELINE_STATE_PATH = os.path.join(ARTIFACT_STORE_DIR, "pipeline_state.json")
+LEADERBOARD_STATE_CODE = os.path.join("utils", "leaderboard_state.py")
+DEFAULT_WORKERS = 2
+
+# Stage statuses
+OK = "ok"
+UP_TO_DATE = "up to date"
+SKIPPED = "skipped"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+
+# ===========================
+# STAGE FUNCTIONS
+# ===========================
+# Every run function takes (context, results), where results holds the in-memory result of each
+# dependency, and returns the stage's own result. Outputs are still written to disk, so a later
+# run can skip the stage and lazily load its result with the stage's "load" function instead.
+
+def _load_json(path):
+    def load():
+        with open(path, "r") as f:
+            return json.load(f)
+    return load
+
+
+def _run_raw_preparation(context, results):
+    from utils.raw_preparation import format_raw_export
+    from utils.json_streaming import write_json_array
+
+    entries, damaged = format_raw_export(LAR_DATA_RAW_PATH, EXPECTED_DATA_STRUCTURE_PATH)
+    for record in damaged:
+        log_message("WARNING", f"Skipped damaged raw record at byte {record['offset']}: {record['error']}")
+    write_json_array(FORMATTED_MATCH_DATA_PATH, entries)
+    return entries
+
+
+def _run_list_structure_fix(context, results):
+    load_script(LIST_STRUCTURE_FIX_SCRIPT).save_fixed_json(RAW_MATCH_DATA_PATH, FIXED_MATCH_DATA_PATH)
+
+
+def _run_cleaning(context, results):
+    cleaning = load_script(CLEANING_SCRIPT)
+    cleaned_data, warnings, voided_entries = cleaning.clean_entries(results["raw_preparation"])
+    cleaning.save_cleaned_data(cleaned_data, CLEANED_MATCH_DATA_PATH)
+    log_message("INFO", f"Cleaned {len(cleaned_data)} entries ({len(warnings)} warnings, {len(voided_entries)} voided)")
+    return cleaned_data
+
+
+def _run_team_restructuring(context, results):
+    restructuring = load_script(TEAM_RESTRUCTURING_SCRIPT)
+    team_data = restructuring.group_matches_by_team(results["cleaning"])
+    restructuring.save_team_based_data(team_data, TEAM_BASED_MATCH_DATA_PATH)
+    # Match the JSON round trip of the file, so downstream results don't depend on whether this stage was skipped
+    return {str(team): data for team, data in team_data.items()}
+
+
+def _run_statistics(context, results):
+    statistics = load_script(STATISTICS_SCRIPT)
+    team_performance_data = statistics.calculate_team_performance_data(results["team_restructuring"])
+    statistics.save_team_performance_data(team_performance_data, TEAM_PERFORMANCE_DATA_PATH_JSON,
+                                          TEAM_PERFORMANCE_DATA_PATH_CSV)
+    return statistics.convert_to_serializable(team_performance_data)
+
+
+def _run_visualizations(context, results):
+    load_script(VISUALIZATIONS_SCRIPT).generate_visualizations(results["statistics"], VISUALIZATIONS_DIR,
+                                                               team_data=results["team_restructuring"])
+
+
+def _run_leaderboard(context, results):
+    from utils.leaderboard_state import run_incremental_update
+
+    if context.get("fetch_match") is None:
+        log_message("WARNING", "No result provider configured, skipping leaderboard update.")
+        return SKIPPED
+    run_incremental_update(results["cleaning"], context["fetch_match"], LEADERBOARD_OUTPUT_DIR,
+                           context["event_key"], context["year"])
+
+
+# Stages as a DAG. "deps" are the stages whose in-memory results a stage consumes, "inputs" the files
+# it reads that no other stage produces. A stage is skipped when neither its inputs, configs and code
+# nor the keys of its dependencies changed since its last successful run and its outputs still exist.
+# "always" stages (the leaderboard, which also depends on new match results) run on every invocation.
+PIPELINE_DAG = [
+    {"name": "raw_preparation", "deps": [], "inputs": [LAR_DATA_RAW_PATH], "outputs": [FORMATTED_MATCH_DATA_PATH],
+     "configs": [EXPECTED_DATA_STRUCTURE_PATH], "code": [RAW_PREPARATION_CODE, JSON_STREAMING_CODE],
+     "run": _run_raw_preparation, "load": _load_json(FORMATTED_MATCH_DATA_PATH)},
+    {"name": "fix_list_structure", "deps": [], "inputs": [RAW_MATCH_DATA_PATH], "outputs": [FIXED_MATCH_DATA_PATH],
+     "code": [LIST_STRUCTURE_FIX_SCRIPT, JSON_STREAMING_CODE],
+     "run": _run_list_structure_fix, "load": None},
+    {"name": "cleaning", "deps": ["raw_preparation"], "inputs": [], "outputs": [CLEANED_MATCH_DATA_PATH],
+     "configs": [EXPECTED_DATA_STRUCTURE_PATH], "code": [CLEANING_SCRIPT],
+     "run": _run_cleaning, "load": _load_json(CLEANED_MATCH_DATA_PATH)},
+    {"name": "team_restructuring", "deps": ["cleaning"], "inputs": [], "outputs": [TEAM_BASED_MATCH_DATA_PATH],
+     "code": [TEAM_RESTRUCTURING_SCRIPT],
+     "run": _run_team_restructuring, "load": _load_json(TEAM_BASED_MATCH_DATA_PATH)},
+    {"name": "statistics", "deps": ["team_restructuring"], "inputs": [],
+     "outputs": [TEAM_PERFORMANCE_DATA_PATH_JSON, TEAM_PERFORMANCE_DATA_PATH_CSV],
+     "configs": [EXPECTED_DATA_STRUCTURE_PATH], "code": [STATISTICS_SCRIPT],
+     "run": _run_statistics, "load": _load_json(TEAM_PERFORMANCE_DATA_PATH_JSON)},
+    {"name": "visualizations", "deps": ["statistics", "team_restructuring"], "inputs": [], "outputs": [VISUALIZATIONS_DIR],
+     "code": [VISUALIZATIONS_SCRIPT, CHART_RENDERING_CODE, MATCH_TABLE_CODE],
+     "run": _run_visualizations, "load": None},
+    {"name": "leaderboard", "deps": ["cleaning"], "inputs": [], "outputs": [], "always": True,
+     "code": [LEADERBOARD_STATE_CODE],
+     "run": _run_leaderboard, "load": None},
+]
+
+
+def validate_dag(stages):
+    """Checks that every dependency is declared earlier in the list, which also rules out cycles."""
+    seen = set()
+    for stage in stages:
+        unknown = [dep for dep in stage["deps"] if dep not in seen]
+        if unknown:
+            raise ValueError(f"Stage '{stage['name']}' depends on {unknown}, which are not declared before it.")
+        seen.add(stage["name"])
+
+
+# ===========================
+# STATE
+# ===========================
+
+def load_pipeline_state(state_path=PIPELINE_STATE_PATH):
+    """Keys of the last successful run of every stage."""
+    try:
+        with open(state_path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"stages": {}}
+
+
+def save_pipeline_state(state, state_path=PIPELINE_STATE_PATH):
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=4)
+    os.replace(tmp_path, state_path)
+
+
+# ===========================
+# RUNNER
+# ===========================
+
+_NOT_LOADED = object()
+
+
+class PipelineRunner:
+    """
+    Runs the pipeline DAG in this (warm) process. Stages hand their results to their dependents in
+    memory, unchanged stages are skipped, and stages whose dependencies are done run in parallel on
+    a thread pool (e.g. visualizations and the leaderboard). Skip decisions and lazy loading of
+    skipped results happen on the calling thread; only stage bodies run on the pool.
+    """
+
+    def __init__(self, context=None, stages=PIPELINE_DAG, state_path=PIPELINE_STATE_PATH,
+                 workers=DEFAULT_WORKERS, force=False):
+        validate_dag(stages)
+        self.context = context or {}
+        self.stages = stages
+        self.state_path = state_path
+        self.workers = workers
+        self.force = force
+
+    def stage_key(self, stage, keys):
+        return artifact_key(stage["name"], stage["inputs"], stage.get("configs", []), stage.get("code", []),
+                            params={"deps": {dep: keys[dep] for dep in stage["deps"]}})
+
+    def _is_up_to_date(self, stage, key, state):
+        if self.force or stage.get("always"):
+            return False
+        recorded = state["stages"].get(stage["name"], {})
+        return recorded.get("key") == key and all(os.path.exists(path) for path in stage["outputs"])
+
+    def _dependency_results(self, stage, results, by_name):
+        """Results of a stage's dependencies, loading those of skipped stages from their outputs."""
+        for dep in stage["deps"]:
+            if results[dep] is _NOT_LOADED:
+                load = by_name[dep]["load"]
+                results[dep] = load() if load is not None else None
+        return {dep: results[dep] for dep in stage["deps"]}
+
+    def run(self):
+        """
+        Runs every stage that needs it.
+
+        :return: List of {"name", "status", "seconds"} in completion order.
+        """
+        state = load_pipeline_state(self.state_path)
+        by_name = {stage["name"]: stage for stage in self.stages}
+        pending = list(self.stages)
+        statuses, keys, results, summary = {}, {}, {}, []
+        running = {}
+
+        def finish(stage, status, seconds=0.0):
+            statuses[stage["name"]] = status
+            summary.append({"name": stage["name"], "status": status, "seconds": round(seconds, 4)})
+            log_message("ERROR" if status == FAILED else "INFO", f"Stage {stage['name']}: {status}"
+                        + (f" in {seconds:.2f}s" if seconds else ""))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while pending or running:
+                for stage in list(pending):
+                    if not all(dep in statuses for dep in stage["deps"]):
+                        continue
+                    pending.remove(stage)
+
+                    if any(statuses[dep] in (FAILED, BLOCKED, SKIPPED) for dep in stage["deps"]):
+                        finish(stage, BLOCKED)
+                        continue
+                    missing = [path for path in stage["inputs"] if not os.path.exists(path)]
+                    if missing:
+                        log_message("WARNING", f"Skipping stage {stage['name']}, missing inputs {missing}.")
+                        finish(stage, SKIPPED)
+                        continue
+
+                    keys[stage["name"]] = self.stage_key(stage, keys)
+                    if self._is_up_to_date(stage, keys[stage["name"]], state):
+                        results[stage["name"]] = _NOT_LOADED
+                        finish(stage, UP_TO_DATE)
+                        continue
+
+                    try:
+                        dep_results = self._dependency_results(stage, results, by_name)
+                    except Exception as e:
+                        log_message("ERROR", f"Could not load the inputs of stage {stage['name']}: {e}")
+                        finish(stage, FAILED)
+                        continue
+                    future = executor.submit(stage["run"], self.context, dep_results)
+                    running[future] = (stage, time.time())
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, started = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        log_message("ERROR", f"Stage {stage['name']} failed: {e}")
+                        print(traceback.format_exc())
+                        finish(stage, FAILED, time.time() - started)
+                        continue
+
+                    if result is SKIPPED:
+                        finish(stage, SKIPPED, time.time() - started)
+                        continue
+                    results[stage["name"]] = result
+                    if not stage.get("always"):
+                        state["stages"][stage["name"]] = {"key": keys[stage["name"]], "finished": time.time()}
+                        save_pipeline_state(state, self.state_path)
+                    finish(stage, OK, time.time() - started)
+
+        return summary
+
+
+def run_pipeline(context=None, workers=DEFAULT_WORKERS, force=False):
+    return PipelineRunner(context, workers=workers, force=force).run()
@@ -0,0 +1,128 @@
+import json
+import numpy as np
+from utils.data_generation import iter_batch_entries
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+MATCH_APP_KEY = "matchApp"
+SUPER_APP_KEY = "superApp"
+
+# Raw layouts
+WRAPPER_LAYOUT = "raw"                    # {"matchApp": [...], "superApp": [...]}, like lar_data_raw.json
+CONCATENATED_LAYOUT = "raw_concatenated"  # matchApp entries as root objects one after another, like raw_match_data.json
+RAW_LAYOUTS = [WRAPPER_LAYOUT, CONCATENATED_LAYOUT]
+
+# Defaults for the "raw_export" section of the data generation config
+DEFAULT_RAW_EXPORT_CONFIG = {
+    "super_app": True,
+    "corruption": {
+        "duplicate_chance": 0.01,          # entries submitted twice
+        "edited_duplicate_share": 0.5,     # of those, resubmissions with a new _id and an edited value
+        "missing_position_chance": 0.005,  # entries never submitted, leaving their match short of a robot
+        "broken_separator_chance": 0.0     # entries cut before their closing brace, running into the next one
+    }
+}
+
+# What separates root objects in a concatenated export; all of them are accepted by JsonRecordReader
+CONCATENATED_SEPARATORS = ["\n", "", "\r\n", " \n"]
+
+# SeedSequence spawn key of the corruption streams, apart from the generation streams (0 and 1)
+RAW_EXPORT_STREAM = 2
+
+SUPER_APP_RATING_RANGE = (1, 5)
+
+
+def raw_export_settings(generation_config):
+    """The config's "raw_export" section over DEFAULT_RAW_EXPORT_CONFIG."""
+    section = generation_config.get("raw_export", {})
+    return {
+        "super_app": section.get("super_app", DEFAULT_RAW_EXPORT_CONFIG["super_app"]),
+        "corruption": {**DEFAULT_RAW_EXPORT_CONFIG["corruption"], **section.get("corruption", {})}
+    }
+
+
+# ===========================
+# RECORDS
+# ===========================
+
+def _object_ids(rng, count):
+    """Random 24 hex digit ids, shaped like the app database's ObjectIds."""
+    encoded = rng.bytes(12 * count).hex()
+    return [encoded[index:index + 24] for index in range(0, len(encoded), 24)]
+
+
+def _edited(record, rng):
+    """A resubmission of record: new _id, one variable changed."""
+    edited = dict(record, _id=_object_ids(rng, 1)[0])
+    keys = [key for key in record if key not in ("_id", "metadata")]
+    if keys:
+        key = keys[rng.integers(len(keys))]
+        value = edited[key]
+        edited[key] = (not value) if isinstance(value, bool) else \
+            value + 1 if isinstance(value, (int, float)) else f"{value}_edited"
+    return edited
+
+
+def raw_chunk_records(batch, settings, rng):
+    """
+    The raw matchApp and superApp records of a generated chunk. matchApp records keep their
+    metadata object, variables sit at the top level under their flat keys ("autoCoral.L1"), and
+    every record has an _id. Corruption from settings["corruption"] is applied to matchApp:
+    dropped entries, exact and edited duplicates (placed at the end of the chunk, as later
+    resubmissions) and indices of records whose closing brace is cut.
+
+    :return: Tuple of (matchApp records, superApp records, set of broken matchApp record indices).
+    """
+    corruption = settings["corruption"]
+    entries = list(iter_batch_entries(batch))
+    ids = _object_ids(rng, 2 * len(entries))
+
+    match_records, super_records = [], []
+    kept = rng.random(len(entries)) >= corruption["missing_position_chance"]
+    ratings = rng.integers(SUPER_APP_RATING_RANGE[0], SUPER_APP_RATING_RANGE[1] + 1, (len(entries), 2))
+    for index, entry in enumerate(entries):
+        if kept[index]:
+            match_records.append({"_id": ids[index], "metadata": entry["metadata"], **entry["variables"]})
+        if settings["super_app"]:
+            super_records.append({"_id": ids[len(entries) + index], "metadata": dict(entry["metadata"]),
+                                  "driverSkill": int(ratings[index, 0]), "defenseRating": int(ratings[index, 1])})
+
+    duplicated = np.flatnonzero(rng.random(len(match_records)) < corruption["duplicate_chance"])
+    edited = rng.random(len(duplicated)) < corruption["edited_duplicate_share"]
+    for index, is_edited in zip(duplicated.tolist(), edited.tolist()):
+        record = match_records[index]
+        match_records.append(_edited(record, rng) if is_edited else dict(record))
+
+    broken = set(np.flatnonzero(rng.random(len(match_records)) < corruption["broken_separator_chance"]).tolist())
+    return match_records, super_records, broken
+
+
+def _record_texts(records, broken=()):
+    for index, record in enumerate(records):
+        text = json.dumps(record)
+        yield text[:-1] if index in broken else text
+
+
+def encode_raw_chunk(settings, entropy, layout, batch):
+    """
+    Serializes the raw records of a chunk for RawExportWriter. The corruption stream is derived from
+    the run's seed entropy and the chunk's first match, so it does not depend on the worker count.
+
+    :return: ((matchApp text, superApp text), number of matchApp records).
+    """
+    first_match = int(batch["matchNumber"][0]) if len(batch["matchNumber"]) else 0
+    rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(RAW_EXPORT_STREAM, first_match)))
+    match_records, super_records, broken = raw_chunk_records(batch, settings, rng)
+
+    if layout == CONCATENATED_LAYOUT:
+        separators = rng.choice(len(CONCATENATED_SEPARATORS), len(match_records))
+        match_text = "".join(CONCATENATED_SEPARATORS[separator] + text
+                             for separator, text in zip(separators.tolist(), _record_texts(match_records, broken)))
+        return (match_text, ""), len(match_records)
+
+    padding = "\n        "
+    match_text = ",".join(padding + text for text in _record_texts(match_records, broken))
+    super_text = ",".join(padding + text for text in _record_texts(super_records))
+    return (match_text, super_text), len(match_records)
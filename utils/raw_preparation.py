@@ -0,0 +1,157 @@
+import json
+from utils.json_streaming import JsonRecordReader, JsonArrayWriter, has_top_level_key, iter_subtree_items
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+EXPECTED_DATA_STRUCTURE_PATH = "config/expected_data_structure.json"
+RAW_EXPORT_PATH = "data/raw/lar_data_raw.json"
+FORMATTED_MATCH_DATA_PATH = "data/raw/formatted_match_data.json"
+
+MATCH_APP_KEY = "matchApp"
+SCHEMA_SECTIONS = ["metadata", "variables"]
+
+_MISSING = object()
+
+
+# ===========================
+# SCHEMA
+# ===========================
+
+def is_schema_leaf(node):
+    """A schema leaf describes one field, e.g. {"statistical_data_type": "quantitative"}."""
+    return isinstance(node, dict) and "statistical_data_type" in node
+
+
+def compile_schema(expected_structure):
+    """
+    Flattens the nested expected data structure once into the list of fields to extract.
+
+    :return: Dict of section -> list of (path tuple, dotted key) for every leaf field, in schema order,
+             e.g. "variables" -> [(("autoCoral", "L1"), "autoCoral.L1"), ..., (("climb",), "climb")].
+    """
+    compiled = {}
+    for section in SCHEMA_SECTIONS:
+        fields = []
+        stack = [((), expected_structure.get(section, {}))]
+        while stack:
+            path, node = stack.pop()
+            if path and is_schema_leaf(node):
+                fields.append((path, ".".join(path)))
+            elif isinstance(node, dict):
+                stack.extend(((*path, key), child) for key, child in reversed(list(node.items())))
+        compiled[section] = fields
+    return compiled
+
+
+def load_compiled_schema(filepath=EXPECTED_DATA_STRUCTURE_PATH):
+    with open(filepath, "r") as f:
+        return compile_schema(json.load(f))
+
+
+# ===========================
+# RECORD TRANSFORMATIONS
+# ===========================
+
+def _lookup(source, path):
+    for key in path:
+        if not isinstance(source, dict) or key not in source:
+            return _MISSING
+        source = source[key]
+    return source
+
+
+def _field_value(entry, section, path, dotted):
+    """Finds a field nested ("autoCoral": {"L1": ...}) or dotted ("autoCoral.L1"), under its section or at the top level."""
+    section_data = entry.get(section)
+    for source in (section_data, entry) if isinstance(section_data, dict) else (entry,):
+        value = _lookup(source, path)
+        if value is _MISSING:
+            value = source.get(dotted, _MISSING)
+        if value is not _MISSING:
+            return value
+    return entry.get(f"{section}.{dotted}", _MISSING)
+
+
+def format_entry(entry, schema):
+    """
+    Regroups one raw entry so every schema field sits at its nested place under "metadata" or "variables".
+    Fields missing from the entry are left out; "_id" is preserved.
+    """
+    formatted_entry = {section: {} for section in SCHEMA_SECTIONS}
+
+    for section, fields in schema.items():
+        for path, dotted in fields:
+            value = _field_value(entry, section, path, dotted)
+            if value is _MISSING:
+                continue
+            target = formatted_entry[section]
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+
+    if "_id" in entry:
+        formatted_entry["_id"] = entry["_id"]
+
+    return formatted_entry
+
+
+def iter_match_app_entries(records, app_key=MATCH_APP_KEY):
+    """
+    Yields the scouting entries of raw export records. A record wrapping the apps
+    ({"matchApp": [...], "superApp": [...]}) contributes its matchApp entries; any other
+    record is taken to be an entry itself.
+    """
+    for record in records:
+        if isinstance(record, dict) and app_key in record:
+            yield from record[app_key]
+        elif isinstance(record, dict):
+            yield record
+
+
+# ===========================
+# FUSED PREPARATION
+# ===========================
+
+def iter_formatted_entries(input_path, schema, damaged=None):
+    """
+    Streams the formatted entries of a raw export. For an app export wrapper only the matchApp
+    subtree is decoded; any other layout is read record by record. Damaged records are skipped
+    and, if a list is given, appended to `damaged`.
+    """
+    if has_top_level_key(input_path, MATCH_APP_KEY):
+        entries = iter_subtree_items(input_path, MATCH_APP_KEY, damaged=damaged)
+        for entry in entries:
+            yield format_entry(entry, schema)
+        return
+
+    reader = JsonRecordReader(input_path)
+    for entry in iter_match_app_entries(reader):
+        yield format_entry(entry, schema)
+    if damaged is not None:
+        damaged.extend(reader.damaged)
+
+
+def format_raw_export(input_path=RAW_EXPORT_PATH, expected_structure_path=EXPECTED_DATA_STRUCTURE_PATH):
+    """In-memory version of prepare_raw_data. Returns (formatted entries, damaged records)."""
+    damaged = []
+    entries = list(iter_formatted_entries(input_path, load_compiled_schema(expected_structure_path), damaged))
+    return entries, damaged
+
+
+def prepare_raw_data(input_path=RAW_EXPORT_PATH, output_path=FORMATTED_MATCH_DATA_PATH,
+                     expected_structure_path=EXPECTED_DATA_STRUCTURE_PATH):
+    """
+    Runs matchApp extraction, list structure fixing and nesting fixing in one pass:
+    the raw export is streamed record by record and every entry is formatted and written
+    straight to the formatted output, without intermediate files.
+
+    :return: Dict with the number of "entries" written and the "damaged" records skipped.
+    """
+    damaged = []
+    with JsonArrayWriter(output_path) as writer:
+        for entry in iter_formatted_entries(input_path, load_compiled_schema(expected_structure_path), damaged):
+            writer.write(entry)
+
+    return {"entries": writer.count, "damaged": damaged}
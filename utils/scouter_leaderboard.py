@@ -0,0 +1,271 @@
+import os
+import json
+import math
+from collections import defaultdict
+
+# ===========================
+# CONSTANTS
+# ===========================
+
+ALLIANCES = ["red", "blue"]
+TELE_CORAL_KEYS = ["teleCoral.L1", "teleCoral.L2", "teleCoral.L3", "teleCoral.L4"]
+AUTO_CORAL_KEYS = ["autoCoral.L1", "autoCoral.L2", "autoCoral.L3", "autoCoral.L4"]
+
+# Our alliance summary key -> TBA score_breakdown key (TBA provides teleCoral data under "teleopCoralCount")
+COMPARED_ATTRIBUTES = {
+    "autoCoralCount": "autoCoralCount",
+    "teleCoralCount": "teleopCoralCount"
+}
+
+DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT = len(COMPARED_ATTRIBUTES)
+
+SUMMARY_FILE_NAME = "summary_alliance_data.json"  # Aggregated metrics from scouting data
+PENALTIES_FILE_NAME = "scouter_penalties.json"  # Raw penalty counts
+RELATIVE_FILE_NAME = "scouter_penalties_relative.json"  # Relative percentages & confidence intervals
+
+
+# ===========================
+# TBA CLIENT
+# ===========================
+
+def create_tba_client(tba_key=None):
+    """
+    Creates a TBA client, reading the key from the TBA_KEY environment variable if not given.
+
+    :raises ValueError: If no TBA key is available.
+    """
+    import tbapy
+
+    tba_key = tba_key or os.getenv("TBA_KEY")
+    if not tba_key:
+        raise ValueError("Please set the TBA_KEY environment variable.")
+    return tbapy.TBA(tba_key)
+
+
+def make_match_fetcher(tba, event_key, year):
+    """Returns a callable that fetches a qualification match of the event by number."""
+    def fetch_match(match_num):
+        return tba.match(year=year, event=event_key, number=match_num)
+    return fetch_match
+
+
+# ===========================
+# ALLIANCE SUMMARY
+# ===========================
+
+def _as_count(value):
+    if isinstance(value, bool):
+        return 1 if value else 0
+    return value
+
+
+def entry_alliance(entry):
+    """Returns 'red' or 'blue' for a scouting entry based on its robot position."""
+    pos = entry.get("metadata", {}).get("robotPosition", "").lower()
+    return "red" if "red" in pos else "blue"
+
+
+def entry_coral_counts(entry):
+    """Returns (teleCoralCount, autoCoralCount) summed over all levels for a single scouting entry."""
+    vars_dict = entry.get("variables", {})
+    tele_count = sum(_as_count(vars_dict.get(key, 0)) for key in TELE_CORAL_KEYS)
+    auto_count = sum(_as_count(vars_dict.get(key, 0)) for key in AUTO_CORAL_KEYS)
+    return tele_count, auto_count
+
+
+def build_alliance_summary(scouting_data):
+    """
+    Aggregates scouting entries into coral counts per match and alliance.
+
+    :param scouting_data: List of cleaned scouting entries.
+    :return: Dict keyed by match number (as a string), with "blue" and "red" sub-dicts holding
+             "teleCoralCount" and "autoCoralCount" sums for that alliance in that match.
+    """
+    alliance_summary = {}
+
+    for entry in scouting_data:
+        match_num = entry.get("metadata", {}).get("matchNumber")
+        if match_num is None:
+            continue
+        match_key = str(match_num)
+        tele_count, auto_count = entry_coral_counts(entry)
+
+        if match_key not in alliance_summary:
+            alliance_summary[match_key] = {
+                "blue": {"teleCoralCount": 0, "autoCoralCount": 0},
+                "red": {"teleCoralCount": 0, "autoCoralCount": 0}
+            }
+        alliance = entry_alliance(entry)
+        alliance_summary[match_key][alliance]["teleCoralCount"] += tele_count
+        alliance_summary[match_key][alliance]["autoCoralCount"] += auto_count
+
+    return alliance_summary
+
+
+def group_alliance_scouters(scouting_data):
+    """Returns the set of scouters that contributed to each alliance, keyed by match number (as a string)."""
+    match_alliance_scouters = defaultdict(lambda: {"red": set(), "blue": set()})
+    for entry in scouting_data:
+        metadata = entry.get("metadata", {})
+        match_num = metadata.get("matchNumber")
+        if match_num is None:
+            continue
+        scouter = metadata.get("scouterName", "Unknown")
+        match_alliance_scouters[str(match_num)][entry_alliance(entry)].add(scouter)
+    return match_alliance_scouters
+
+
+def count_entries(scouting_data):
+    """Counts the scouting entries submitted by each scouter."""
+    total_entries = defaultdict(int)
+    for entry in scouting_data:
+        scouter = entry.get("metadata", {}).get("scouterName", "Unknown")
+        total_entries[scouter] += 1
+    return dict(total_entries)
+
+
+# ===========================
+# PENALTY COMPUTATIONS
+# ===========================
+
+def extract_tba_counts(tba_match):
+    """
+    Extracts the compared attributes from a TBA match.
+
+    :return: Dict keyed by alliance, or None if the match has no score breakdown yet.
+    """
+    if not tba_match:
+        return None
+    tba_score = tba_match.get("score_breakdown")
+    if not tba_score:
+        return None
+    return {
+        alliance: {tba_key: tba_score.get(alliance, {}).get(tba_key) for tba_key in COMPARED_ATTRIBUTES.values()}
+        for alliance in ALLIANCES
+    }
+
+
+def match_penalties(match_num, our_alliance, alliance_scouters, tba_counts):
+    """
+    Compares one match against TBA. Every scouter of an alliance receives one penalty per mismatching attribute.
+
+    :param match_num: Match number, used for logging.
+    :param our_alliance: Alliance summary for the match (see build_alliance_summary).
+    :param alliance_scouters: Dict of alliance -> scouters that contributed to it.
+    :param tba_counts: Output of extract_tba_counts for the match.
+    :return: Dict of scouter -> penalties in this match.
+    """
+    penalties = defaultdict(int)
+    for alliance in ["blue", "red"]:
+        for our_key, tba_key in COMPARED_ATTRIBUTES.items():
+            our_value = our_alliance.get(alliance, {}).get(our_key, 0)
+            tba_value = tba_counts.get(alliance, {}).get(tba_key)
+            if tba_value is not None and our_value != tba_value:
+                for scouter in alliance_scouters.get(alliance, []):
+                    penalties[scouter] += 1
+                print(f"Mismatch in match {match_num} {alliance.upper()} {our_key}: scouting = {our_value}, TBA = {tba_value}")
+    return dict(penalties)
+
+
+def compute_penalties(alliance_summary, match_alliance_scouters, fetch_match):
+    """
+    Cross-references every match in the alliance summary with TBA and counts penalties per scouter.
+
+    :param alliance_summary: Output of build_alliance_summary.
+    :param match_alliance_scouters: Output of group_alliance_scouters.
+    :param fetch_match: Callable taking a match number and returning the TBA match dict.
+    :return: Dict of scouter -> total penalty count.
+    """
+    penalties = defaultdict(int)
+
+    for match_key, our_alliance in alliance_summary.items():
+        try:
+            match_num = int(match_key)
+        except ValueError:
+            match_num = match_key
+
+        print(f"Processing match {match_num}...")
+        try:
+            tba_counts = extract_tba_counts(fetch_match(match_num))
+        except Exception as e:
+            print(f"Error retrieving TBA match data for match {match_num}: {e}")
+            continue
+        if tba_counts is None:
+            print(f"No TBA score breakdown for match {match_num} yet, skipping.")
+            continue
+
+        scouters = match_alliance_scouters.get(match_key, {})
+        for scouter, count in match_penalties(match_num, our_alliance, scouters, tba_counts).items():
+            penalties[scouter] += count
+
+    return dict(penalties)
+
+
+# ===========================
+# RELATIVE PENALTY AND 95% CONFIDENCE INTERVAL CALCULATIONS
+# ===========================
+
+def relative_penalty(penalty_count, entry_count, attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT):
+    """Computes the penalty rate and its 95% confidence interval for a single scouter."""
+    max_possible = entry_count * attributes_testing_for_count
+    p = penalty_count / max_possible if max_possible > 0 else 0
+    se = math.sqrt(p * (1 - p) / max_possible) if max_possible > 0 else 0
+    ci_lower = max(0, p - 1.96 * se)
+    ci_upper = min(1, p + 1.96 * se)
+    return {
+        "total_entries": entry_count,
+        "max_possible": max_possible,
+        "penalties": penalty_count,
+        "penalty_percent": p * 100,
+        "ci_lower_percent": ci_lower * 100,
+        "ci_upper_percent": ci_upper * 100
+    }
+
+
+def compute_relative_penalties(penalties, total_entries, attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT):
+    """Computes relative penalties with confidence intervals for every scouter with entries."""
+    return {
+        scouter: relative_penalty(penalties.get(scouter, 0), count, attributes_testing_for_count)
+        for scouter, count in total_entries.items()
+    }
+
+
+# ===========================
+# FULL LEADERBOARD
+# ===========================
+
+def build_leaderboard(scouting_data, fetch_match, attributes_testing_for_count=DEFAULT_ATTRIBUTES_TESTING_FOR_COUNT):
+    """
+    Runs the full leaderboard computation on in-memory scouting data.
+
+    :param scouting_data: List of cleaned scouting entries.
+    :param fetch_match: Callable taking a match number and returning the TBA match dict.
+    :param attributes_testing_for_count: Number of attributes compared per entry.
+    :return: Dict with "alliance_summary", "penalties", "total_entries" and "relative_penalties".
+    """
+    alliance_summary = build_alliance_summary(scouting_data)
+    match_alliance_scouters = group_alliance_scouters(scouting_data)
+    penalties = compute_penalties(alliance_summary, match_alliance_scouters, fetch_match)
+    total_entries = count_entries(scouting_data)
+
+    return {
+        "alliance_summary": alliance_summary,
+        "penalties": penalties,
+        "total_entries": total_entries,
+        "relative_penalties": compute_relative_penalties(penalties, total_entries, attributes_testing_for_count)
+    }
+
+
+def save_leaderboard_outputs(leaderboard, output_dir):
+    """Writes the alliance summary, raw penalties and relative penalties to the output directory."""
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = [
+        (SUMMARY_FILE_NAME, leaderboard["alliance_summary"], "Alliance summary"),
+        (PENALTIES_FILE_NAME, leaderboard["penalties"], "Scouter penalties"),
+        (RELATIVE_FILE_NAME, leaderboard["relative_penalties"], "Scouter relative penalties with confidence intervals")
+    ]
+    for file_name, data, label in outputs:
+        path = os.path.join(output_dir, file_name)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+        print(f"{label} saved to {path}")
@@ -0,0 +1,62 @@
+import os
+import threading
+import functools
+import importlib.util
+from utils.artifact_store import file_hash
+
+# Repository root, so scripts resolve regardless of the current working directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_loaded_scripts = {}
+_load_lock = threading.RLock()
+
+
+def load_script(relative_path):
+    """
+    Imports a pipeline script by file path and caches it until the script's content changes, so a
+    long running process (e.g. the watcher) picks up edited scripts on their next run.
+    Numbered scripts (e.g. "03_data_analysis_and_statistics_aggregation.py") are not valid
+    module names, so they can't be imported with a regular import statement.
+
+    :param relative_path: Path of the script relative to the repository root.
+    :return: The imported module.
+    """
+    script_path = os.path.join(REPO_ROOT, relative_path)
+    version = file_hash(script_path)
+
+    # Locked so stages running on parallel threads never execute a script's module code twice
+    with _load_lock:
+        if relative_path in _loaded_scripts:
+            loaded_version, module = _loaded_scripts[relative_path]
+            if loaded_version == version:
+                return module
+
+        module_name = "pipeline_" + os.path.splitext(os.path.basename(relative_path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        _loaded_scripts[relative_path] = (version, module)
+        return module
+
+
+def cached_until_changed(path):
+    """
+    Caches the result of a function without arguments until the content of `path` changes, e.g. a
+    config file loaded once per process that may still be edited while the watcher runs.
+    """
+    def decorator(function):
+        cache = {}
+
+        @functools.wraps(function)
+        def wrapper():
+            version = file_hash(path)
+            with _load_lock:
+                if cache.get("version", object()) != version:
+                    cache["value"] = function()
+                    cache["version"] = version
+                return cache["value"]
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
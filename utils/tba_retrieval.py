@@ -0,0 +1,165 @@
+import os
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.logging import log_message
+
+# ===========================
+# CONSTANTS
+# ===========================
+
+MATCH_KEY_PATTERN = re.compile(r"_(qm)(\d+)$")
+
+
+# ===========================
+# MATCH SELECTION
+# ===========================
+
+def parse_match_range(text):
+    """
+    Parses a match selection such as "1-40" or "1,3,7-9" into a sorted list of match numbers.
+
+    :raises ValueError: If the selection is malformed.
+    """
+    match_numbers = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+            if start > end:
+                raise ValueError(f"Invalid match range '{part}': start is after end.")
+            match_numbers.update(range(start, end + 1))
+        else:
+            match_numbers.add(int(part))
+    return sorted(match_numbers)
+
+
+def list_event_match_numbers(tba, event_key):
+    """Returns the sorted qualification match numbers TBA knows about for an event."""
+    match_numbers = []
+    for match_key in tba.event_matches(event_key, keys=True):
+        found = MATCH_KEY_PATTERN.search(match_key)
+        if found:
+            match_numbers.append(int(found.group(2)))
+    return sorted(match_numbers)
+
+
+# ===========================
+# NDJSON CHECKPOINT
+# ===========================
+
+def index_path_for(ndjson_path):
+    return ndjson_path + ".index.json"
+
+
+def read_completed_matches(ndjson_path):
+    """
+    Returns the match numbers already saved in the NDJSON output.
+    A partially written last line (from an interrupted run) is truncated away so appends stay valid.
+    """
+    completed = set()
+    if not os.path.exists(ndjson_path):
+        return completed
+
+    valid_end = 0
+    with open(ndjson_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                completed.add(json.loads(line)["match_number"])
+            except (ValueError, KeyError):
+                break
+            valid_end += len(line)
+
+    if valid_end != os.path.getsize(ndjson_path):
+        log_message("WARNING", f"Truncating damaged tail of {ndjson_path} at byte {valid_end}")
+        with open(ndjson_path, "r+b") as f:
+            f.truncate(valid_end)
+    return completed
+
+
+def build_ndjson_index(ndjson_path):
+    """
+    Builds a {match_number: [byte_offset, byte_length]} index over the NDJSON output and saves it
+    next to it, so later stages can seek straight to a single match.
+    """
+    index = {}
+    offset = 0
+    with open(ndjson_path, "rb") as f:
+        for line in f:
+            index[str(json.loads(line)["match_number"])] = [offset, len(line)]
+            offset += len(line)
+
+    with open(index_path_for(ndjson_path), "w") as f:
+        json.dump(index, f)
+    return index
+
+
+def read_indexed_match(ndjson_path, index, match_number):
+    """Reads a single match record from the NDJSON output using its index, or None if missing."""
+    location = index.get(str(match_number))
+    if location is None:
+        return None
+    offset, length = location
+    with open(ndjson_path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+# ===========================
+# BULK RETRIEVAL
+# ===========================
+
+def _fetch_with_retries(tba, event_key, year, match_number, retries):
+    last_error = None
+    for _ in range(retries + 1):
+        try:
+            return tba.match(year=year, event=event_key, number=match_number)
+        except Exception as e:
+            last_error = e
+    raise last_error
+
+
+def fetch_match_range(tba, event_key, year, match_numbers, ndjson_path, max_workers=8, retries=2):
+    """
+    Fetches full TBA match data with bounded concurrency, appending one compact JSON line per
+    finished match. Matches already in the output are skipped, so a failed run can be resumed.
+    Matches without a score breakdown yet are not saved and will be fetched again next run.
+
+    :return: Dict with "fetched", "skipped", "unplayed" and "failed" (match number -> error) entries.
+    """
+    os.makedirs(os.path.dirname(ndjson_path) or ".", exist_ok=True)
+    completed = read_completed_matches(ndjson_path)
+    remaining = [number for number in match_numbers if number not in completed]
+    summary = {"fetched": [], "skipped": sorted(set(match_numbers) & completed), "unplayed": [], "failed": {}}
+
+    with open(ndjson_path, "a") as outfile, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_fetch_with_retries, tba, event_key, year, number, retries): number
+            for number in remaining
+        }
+        for future in as_completed(futures):
+            number = futures[future]
+            try:
+                tba_match = future.result()
+            except Exception as e:
+                summary["failed"][number] = str(e)
+                log_message("ERROR", f"Failed to retrieve match {number}: {e}")
+                continue
+
+            if not tba_match or not tba_match.get("score_breakdown"):
+                summary["unplayed"].append(number)
+                continue
+
+            record = {"match_number": number, "key": tba_match.get("key"), "match": tba_match}
+            outfile.write(json.dumps(record, separators=(",", ":")) + "\n")
+            outfile.flush()
+            summary["fetched"].append(number)
+
+    summary["fetched"].sort()
+    summary["unplayed"].sort()
+    build_ndjson_index(ndjson_path)
+    return summary
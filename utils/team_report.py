@@ -0,0 +1,226 @@
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+# matplotlib and pypdf are only imported where pages are rendered and merged
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+DEFAULT_REPORT_WORKERS = min(4, os.cpu_count() or 1)
+PAGE_SIZE = (8.5, 11)  # inches, one letter page per team
+
+# Per-match variables summarized on each page (flat keys, as in the team-based match data)
+CORAL_LEVELS = ["L1", "L2", "L3", "L4"]
+CORAL_PHASES = {"Auto": "autoCoral", "Tele": "teleCoral"}
+ALGAE_ACTIONS = ["netRobot", "processor", "remove"]
+ALGAE_PHASES = {"Auto": "autoAlgae", "Tele": "teleAlgae"}
+CLIMB_VARIABLE = "climb"
+DEFAULT_CLIMB_VALUES = ["park", "none", "deep", "shallow", "failed"]
+
+PHASE_COLORS = {"Auto": "tab:orange", "Tele": "tab:blue"}
+
+
+# ===========================
+# TEAM SUMMARIES
+# ===========================
+
+def _number(value):
+    """Numeric value of a match variable, or None for missing, boolean and non-numeric values."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value):
+        return value
+    return None
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else 0
+
+
+def team_summary(matches, climb_values=DEFAULT_CLIMB_VALUES):
+    """
+    Everything a team's report page shows, from its per-match entries: mean coral per level and
+    mean algae per action for each phase, the count of each climb value, and the coral and algae
+    totals of every match (in match order) for the trends.
+    """
+    matches = sorted(matches, key=lambda entry: _number(entry.get("metadata", {}).get("matchNumber")) or 0)
+    rows = [entry.get("variables", {}) for entry in matches]
+
+    def phase_means(phases, keys):
+        return {phase: [_mean(_number(row.get(f"{prefix}.{key}")) for row in rows) for key in keys]
+                for phase, prefix in phases.items()}
+
+    def match_totals(phases, keys):
+        return [sum(_number(row.get(f"{prefix}.{key}")) or 0 for prefix in phases.values() for key in keys)
+                for row in rows]
+
+    climbs = [row.get(CLIMB_VARIABLE) for row in rows]
+    return {
+        "coral": phase_means(CORAL_PHASES, CORAL_LEVELS),
+        "algae": phase_means(ALGAE_PHASES, ALGAE_ACTIONS),
+        "climb": [climbs.count(value) for value in climb_values],
+        "trend": {
+            "matches": [entry.get("metadata", {}).get("matchNumber") for entry in matches],
+            "coral": match_totals(CORAL_PHASES, CORAL_LEVELS),
+            "algae": match_totals(ALGAE_PHASES, ALGAE_ACTIONS),
+        },
+    }
+
+
+# ===========================
+# PAGE TEMPLATE
+# ===========================
+
+class TeamReportTemplate:
+    """
+    A report page built once: every axis, bar and line is created up front, and update() only
+    swaps their data for the next team, so no figure is rebuilt while pages are written.
+    """
+
+    def __init__(self, climb_values=DEFAULT_CLIMB_VALUES):
+        import numpy as np
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.climb_values = list(climb_values)
+        self.fig = Figure(figsize=PAGE_SIZE)
+        FigureCanvasAgg(self.fig)
+        self.title = self.fig.suptitle("", fontsize=16, fontweight="bold")
+        grid = self.fig.add_gridspec(3, 2, height_ratios=[1, 1, 1.2], hspace=0.45, wspace=0.3)
+
+        self.coral_ax = self.fig.add_subplot(grid[0, :])
+        self.coral_bars = self._phase_bars(self.coral_ax, CORAL_LEVELS, "Coral by Level (mean per match)")
+        self.algae_ax = self.fig.add_subplot(grid[1, 0])
+        self.algae_bars = self._phase_bars(self.algae_ax, ALGAE_ACTIONS, "Algae (mean per match)")
+
+        self.climb_ax = self.fig.add_subplot(grid[1, 1])
+        self.climb_bars = self.climb_ax.bar(np.arange(len(self.climb_values)), np.zeros(len(self.climb_values)),
+                                            color="tab:green", edgecolor="black")
+        self.climb_ax.set_xticks(np.arange(len(self.climb_values)))
+        self.climb_ax.set_xticklabels(self.climb_values, rotation=30, ha="right")
+        self.climb_ax.set_title("Climb Distribution")
+        self.climb_ax.set_ylabel("Matches")
+
+        self.trend_ax = self.fig.add_subplot(grid[2, :])
+        self.coral_line, = self.trend_ax.plot([], [], "o-", color="tab:purple", label="Coral")
+        self.algae_line, = self.trend_ax.plot([], [], "s-", color="tab:cyan", label="Algae")
+        self.trend_ax.set_title("Trends (total per match)")
+        self.trend_ax.set_xlabel("Match Number")
+        self.trend_ax.set_ylabel("Total")
+        self.trend_ax.legend(loc="upper left")
+        self.trend_ax.grid(True, linestyle="--", alpha=0.7)
+
+    @staticmethod
+    def _phase_bars(ax, keys, title):
+        import numpy as np
+
+        positions = np.arange(len(keys))
+        width = 0.8 / len(PHASE_COLORS)
+        bars = {}
+        for index, (phase, color) in enumerate(PHASE_COLORS.items()):
+            bars[phase] = ax.bar(positions - 0.4 + width * (index + 0.5), np.zeros(len(keys)), width,
+                                 label=phase, color=color, edgecolor="black")
+        ax.set_xticks(positions)
+        ax.set_xticklabels(keys)
+        ax.set_title(title)
+        ax.legend(loc="upper left")
+        ax.grid(axis="y", linestyle="--", alpha=0.7)
+        ax.set_axisbelow(True)
+        return bars
+
+    @staticmethod
+    def _set_heights(ax, containers, heights):
+        highest = 0
+        for container, values in zip(containers, heights):
+            for bar, value in zip(container, values):
+                bar.set_height(value)
+                highest = max(highest, value)
+        ax.set_ylim(0, highest * 1.3 or 1)  # headroom for the legend
+
+    def update(self, team, summary):
+        """Points every artist at team's summary (see team_summary)."""
+        self.title.set_text(f"Team {team}")
+        self._set_heights(self.coral_ax, self.coral_bars.values(), summary["coral"].values())
+        self._set_heights(self.algae_ax, self.algae_bars.values(), summary["algae"].values())
+        self._set_heights(self.climb_ax, [self.climb_bars], [summary["climb"]])
+
+        trend = summary["trend"]
+        self.coral_line.set_data(trend["matches"], trend["coral"])
+        self.algae_line.set_data(trend["matches"], trend["algae"])
+        self.trend_ax.relim()
+        self.trend_ax.autoscale_view()
+
+
+# ===========================
+# RENDERING
+# ===========================
+
+def render_team_pages(team_data, output_path, climb_values=DEFAULT_CLIMB_VALUES):
+    """Writes one page per team of team_data, in order, to a single PDF. Returns the number of pages."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    template = TeamReportTemplate(climb_values)
+    with PdfPages(output_path) as pdf:
+        for team, data in team_data.items():
+            template.update(team, team_summary(data.get("matches", []), climb_values))
+            pdf.savefig(template.fig)
+    return len(team_data)
+
+
+def team_ranges(teams, parts):
+    """Splits teams into at most `parts` contiguous ranges of near equal size."""
+    parts = max(1, min(parts, len(teams)))
+    size, extra = divmod(len(teams), parts)
+    ranges, start = [], 0
+    for index in range(parts):
+        end = start + size + (index < extra)
+        ranges.append(teams[start:end])
+        start = end
+    return ranges
+
+
+def merge_pdfs(part_paths, output_path):
+    """Concatenates the pages of part_paths, in order, into output_path."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for part_path in part_paths:
+        writer.append(part_path)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        writer.write(f)
+    os.replace(tmp_path, output_path)
+
+
+def render_team_reports(team_data, output_path, climb_values=DEFAULT_CLIMB_VALUES, workers=DEFAULT_REPORT_WORKERS):
+    """
+    Writes the team report PDF: a page per team, in the order of team_data. With several workers
+    each renders a contiguous range of teams to its own part file, and the parts are merged in
+    order; with a single worker the pages are rendered straight into the output.
+
+    :return: Number of pages written.
+    """
+    teams = list(team_data)
+    if workers <= 1 or len(teams) <= 1:
+        return render_team_pages(team_data, output_path, climb_values)
+
+    ranges = team_ranges(teams, workers)
+    part_paths = [f"{output_path}.part{index}" for index in range(len(ranges))]
+    try:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(render_team_pages, {team: team_data[team] for team in team_range}, part_path,
+                                       climb_values)
+                       for team_range, part_path in zip(ranges, part_paths)]
+            pages = sum(future.result() for future in futures)
+
+        merge_pdfs(part_paths, output_path)
+    finally:
+        for part_path in part_paths:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+    return pages
@@ -0,0 +1,316 @@
+import os
+import json
+import time
+import inspect
+import traceback
+from datetime import datetime
+from utils.logging import log_message
+from utils.script_loader import load_script
+
+# ===========================
+# CONFIGURATION
+# ===========================
+
+RAW_DIR = os.path.join("data", "raw")
+LATENCY_LOG_PATH = os.path.join("outputs", "watch", "latency_log.ndjson")
+LEADERBOARD_OUTPUT_DIR = os.path.join("outputs", "scouter_leaderboard")
+
+LAR_DATA_RAW_PATH = os.path.join("data", "raw", "lar_data_raw.json")
+RAW_MATCH_DATA_PATH = os.path.join("data", "raw", "raw_match_data.json")
+FIXED_MATCH_DATA_PATH = os.path.join("data", "raw", "fixed_match_data.json")
+FORMATTED_MATCH_DATA_PATH = os.path.join("data", "raw", "formatted_match_data.json")
+CLEANED_MATCH_DATA_PATH = os.path.join("data", "processed", "cleaned_match_data.json")
+TEAM_BASED_MATCH_DATA_PATH = os.path.join("data", "processed", "team_based_match_data.json")
+TEAM_PERFORMANCE_DATA_PATH_JSON = os.path.join("outputs", "team_data", "team_performance_data.json")
+TEAM_PERFORMANCE_DATA_PATH_CSV = os.path.join("outputs", "team_data", "team_performance_data.csv")
+VISUALIZATIONS_DIR = os.path.join("outputs", "visualizations")
+EXPECTED_DATA_STRUCTURE_PATH = os.path.join("config", "expected_data_structure.json")
+
+# How long a changed file must stay unchanged before it is processed (avoids reading half-copied exports)
+SETTLE_SECONDS = 0.2
+
+
+# ===========================
+# STAGE RUNNERS
+# ===========================
+
+def _script_main(relative_path):
+    def run(context):
+        main = load_script(relative_path).main
+        # Scripts with command line options run with their defaults, not the watcher's own arguments
+        exit_code = main([]) if inspect.signature(main).parameters else main()
+        # Scripts log and swallow their own errors; a non-zero exit code is how they report failure
+        if exit_code:
+            raise RuntimeError(f"{relative_path} exited with code {exit_code}")
+    return run
+
+
+def _run_list_structure_fix(context):
+    load_script(LIST_STRUCTURE_FIX_SCRIPT).save_fixed_json(
+        RAW_MATCH_DATA_PATH, FIXED_MATCH_DATA_PATH
+    )
+
+
+def _run_raw_preparation(context):
+    from utils.raw_preparation import prepare_raw_data
+
+    result = prepare_raw_data(LAR_DATA_RAW_PATH, FORMATTED_MATCH_DATA_PATH)
+    for record in result["damaged"]:
+        log_message("WARNING", f"Skipped damaged raw record at byte {record['offset']}: {record['error']}")
+
+
+def _run_leaderboard(context):
+    from utils.leaderboard_state import run_incremental_update
+
+    if context.get("fetch_match") is None:
+        log_message("WARNING", "No result provider configured, skipping leaderboard update.")
+        return
+    with open(CLEANED_MATCH_DATA_PATH, "r") as f:
+        scouting_data = json.load(f)
+    run_incremental_update(scouting_data, context["fetch_match"], LEADERBOARD_OUTPUT_DIR,
+                           context["event_key"], context["year"])
+
+
+RAW_PREPARATION_CODE = os.path.join("utils", "raw_preparation.py")
+LIST_STRUCTURE_FIX_SCRIPT = os.path.join("data_analysis_preperation", "02_json_list_structure_fix.py")
+CLEANING_SCRIPT = os.path.join("data_analysis_scripts", "01_data_cleaning_and_preprocessing.py")
+TEAM_RESTRUCTURING_SCRIPT = os.path.join("data_analysis_scripts", "02_team_based_match_data_restructuring.py")
+STATISTICS_SCRIPT = os.path.join("data_analysis_scripts", "03_data_analysis_and_statistics_aggregation.py")
+VISUALIZATIONS_SCRIPT = os.path.join("data_analysis_scripts", "04_visualizations.py")
+CHART_RENDERING_CODE = os.path.join("utils", "chart_rendering.py")
+MATCH_TABLE_CODE = os.path.join("utils", "match_table.py")
+JSON_STREAMING_CODE = os.path.join("utils", "json_streaming.py")
+
+# Stages in dependency order. A stage runs when any of its inputs changed, and its
+# outputs then count as changed for the stages after it. "configs" and "code" list the
+# files that, besides the inputs, determine a stage's outputs (see utils.artifact_store).
+PIPELINE_STAGES = [
+    {"name": "raw_preparation", "inputs": [LAR_DATA_RAW_PATH], "outputs": [FORMATTED_MATCH_DATA_PATH],
+     "configs": [EXPECTED_DATA_STRUCTURE_PATH], "code": [RAW_PREPARATION_CODE, JSON_STREAMING_CODE],
+     "run": _run_raw_preparation},
+    {"name": "fix_list_structure", "inputs": [RAW_MATCH_DATA_PATH], "outputs": [FIXED_MATCH_DATA_PATH],
+     "code": [LIST_STRUCTURE_FIX_SCRIPT, JSON_STREAMING_CODE],
+     "run": _run_list_structure_fix},
+    {"name": "cleaning", "inputs": [FORMATTED_MATCH_DATA_PATH], "outputs": [CLEANED_MATCH_DATA_PATH],
+     "configs": [EXPECTED_DATA_STRUCTURE_PATH], "code": [CLEANING_SCRIPT],
+     "run": _script_main(CLEANING_SCRIPT)},
+    {"name": "team_restructuring", "inputs": [CLEANED_MATCH_DATA_PATH], "outputs": [TEAM_BASED_MATCH_DATA_PATH],
+     "code": [TEAM_RESTRUCTURING_SCRIPT],
+     "run": _script_main(TEAM_RESTRUCTURING_SCRIPT)},
+    {"name": "statistics", "inputs": [TEAM_BASED_MATCH_DATA_PATH],
+     "outputs": [TEAM_PERFORMANCE_DATA_PATH_JSON, TEAM_PERFORMANCE_DATA_PATH_CSV],
+     "configs": [EXPECTED_DATA_STRUCTURE_PATH], "code": [STATISTICS_SCRIPT],
+     "run": _script_main(STATISTICS_SCRIPT)},
+    {"name": "visualizations", "inputs": [TEAM_PERFORMANCE_DATA_PATH_JSON, TEAM_BASED_MATCH_DATA_PATH],
+     "outputs": [VISUALIZATIONS_DIR], "code": [VISUALIZATIONS_SCRIPT, CHART_RENDERING_CODE, MATCH_TABLE_CODE],
+     "run": _script_main(VISUALIZATIONS_SCRIPT)},
+    {"name": "leaderboard", "inputs": [CLEANED_MATCH_DATA_PATH], "outputs": [], "match_results": True,
+     "run": _run_leaderboard},
+]
+
+
+def is_cacheable(stage):
+    """Stages whose outputs depend only on files can be reused from the artifact store."""
+    return bool(stage["outputs"]) and not stage.get("match_results")
+
+
+# ===========================
+# RESULT PROVIDER
+# ===========================
+
+def tba_finished_matches(tba, event_key):
+    """
+    Returns a callable listing the finished matches of an event as {match_key: result_timestamp}.
+    A match counts as finished once TBA reports a score for it.
+    """
+    def finished_matches():
+        finished = {}
+        for match in tba.event_matches(event_key, simple=True):
+            if match.get("alliances", {}).get("red", {}).get("score", -1) < 0:
+                continue
+            finished[match["key"]] = match.get("post_result_time") or match.get("actual_time") or time.time()
+        return finished
+    return finished_matches
+
+
+# ===========================
+# WATCHER
+# ===========================
+
+class PipelineWatcher:
+    """
+    Long-running watcher that polls the raw data folder and the result provider, and reruns only
+    the affected pipeline stages in this (warm) process. Every update appends a latency record.
+    With an artifact store, a stage whose inputs, configs and code are unchanged restores its
+    stored outputs instead of running.
+    """
+
+    def __init__(self, context=None, match_source=None, stages=PIPELINE_STAGES, raw_dir=RAW_DIR,
+                 latency_log_path=LATENCY_LOG_PATH, poll_interval=1.0, results_poll_interval=15.0,
+                 artifact_store=None):
+        self.context = context or {}
+        self.artifact_store = artifact_store
+        self.match_source = match_source
+        self.stages = stages
+        self.raw_dir = raw_dir
+        self.latency_log_path = latency_log_path
+        self.poll_interval = poll_interval
+        self.results_poll_interval = results_poll_interval
+
+        self.file_snapshot = self._snapshot()
+        self.finished_matches = {}
+        self.last_results_poll = 0.0
+
+    # ----- change detection -----
+
+    def _watched_paths(self):
+        paths = {path for stage in self.stages for path in stage["inputs"]}
+        if os.path.isdir(self.raw_dir):
+            paths.update(os.path.join(self.raw_dir, name) for name in os.listdir(self.raw_dir) if name.endswith(".json"))
+        return paths
+
+    def _snapshot(self):
+        snapshot = {}
+        for path in self._watched_paths():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def detect_file_changes(self):
+        """Returns {path: modification_time} for watched files that are new or changed and have settled."""
+        current = self._snapshot()
+        changed = [path for path, stat in current.items() if self.file_snapshot.get(path) != stat]
+        if not changed:
+            return {}
+
+        time.sleep(SETTLE_SECONDS)
+        settled = self._snapshot()
+        changed_files = {}
+        for path in changed:
+            if settled.get(path) == current[path]:
+                self.file_snapshot[path] = settled[path]
+                changed_files[path] = settled[path][0] / 1e9
+        return changed_files
+
+    def detect_new_matches(self, force=False):
+        """Returns {match_key: result_time} for matches that finished since the last poll."""
+        if self.match_source is None:
+            return {}
+        now = time.time()
+        if not force and now - self.last_results_poll < self.results_poll_interval:
+            return {}
+        self.last_results_poll = now
+
+        try:
+            finished = self.match_source()
+        except Exception as e:
+            log_message("ERROR", f"Failed to poll match results: {e}")
+            return {}
+        new_matches = {key: result_time for key, result_time in finished.items() if key not in self.finished_matches}
+        self.finished_matches.update(finished)
+        return new_matches
+
+    def affected_stages(self, changed_paths, new_matches):
+        """Returns the stages to run, in order, for the given changed files and newly finished matches."""
+        dirty = set(changed_paths)
+        selected = []
+        for stage in self.stages:
+            if dirty.intersection(stage["inputs"]) or (new_matches and stage.get("match_results")):
+                selected.append(stage)
+                dirty.update(stage["outputs"])
+        return selected
+
+    # ----- update -----
+
+    def run_update(self, changed_files, new_matches):
+        """Runs the affected stages and records the end-to-end latency of the update."""
+        detected_at = time.time()
+        stages = self.affected_stages(changed_files, new_matches)
+        unrecognized = [path for path in changed_files if not any(path in stage["inputs"] for stage in self.stages)]
+        if unrecognized:
+            log_message("WARNING", f"New raw files not used by any stage: {unrecognized}")
+        if not stages:
+            return None
+
+        log_message("INFO", f"Update triggered by files {sorted(changed_files)} and matches {sorted(new_matches)}: "
+                            f"running {[stage['name'] for stage in stages]}")
+        stage_timings = []
+        for stage in stages:
+            stage_start = time.time()
+            status = "ok"
+            try:
+                if self.artifact_store is not None and is_cacheable(stage):
+                    cached = self.artifact_store.run_cached(
+                        stage["name"], lambda: stage["run"](self.context), stage["inputs"], stage["outputs"],
+                        stage.get("configs", []), stage.get("code", [])
+                    )
+                    status = "cached" if cached else "ok"
+                else:
+                    stage["run"](self.context)
+            except Exception as e:
+                status = "failed"
+                log_message("ERROR", f"Stage {stage['name']} failed: {e}")
+                print(traceback.format_exc())
+            stage_timings.append({"name": stage["name"], "status": status, "seconds": round(time.time() - stage_start, 4)})
+
+        finished_at = time.time()
+        source_time = min(list(changed_files.values()) + list(new_matches.values()))
+        record = {
+            "detected_at": datetime.fromtimestamp(detected_at).isoformat(),
+            "trigger": {"files": sorted(changed_files), "matches": sorted(new_matches)},
+            "stages": stage_timings,
+            "processing_seconds": round(finished_at - detected_at, 4),
+            "end_to_end_seconds": round(finished_at - source_time, 4)
+        }
+        self._record_latency(record)
+        log_message("INFO", f"Update finished in {record['processing_seconds']}s "
+                            f"({record['end_to_end_seconds']}s since the triggering change)")
+
+        # Our own outputs are inputs of later stages; don't treat them as new changes next poll. Only
+        # their entries are refreshed: a raw export that landed while the stages ran is still new.
+        self._refresh_snapshot(path for stage in stages for path in stage["outputs"])
+        return record
+
+    def _refresh_snapshot(self, paths):
+        watched = self._watched_paths()
+        for path in paths:
+            if path not in watched:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self.file_snapshot.pop(path, None)
+                continue
+            self.file_snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def _record_latency(self, record):
+        os.makedirs(os.path.dirname(self.latency_log_path), exist_ok=True)
+        with open(self.latency_log_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def poll_once(self, force_results=False):
+        changed_files = self.detect_file_changes()
+        new_matches = self.detect_new_matches(force_results)
+        if changed_files or new_matches:
+            return self.run_update(changed_files, new_matches)
+        return None
+
+    def run_forever(self, run_on_start=False):
+        """Polls until interrupted. Already finished matches at startup only count as new with run_on_start."""
+        if run_on_start:
+            self.file_snapshot = {}
+            self.poll_once(force_results=True)
+        else:
+            self.detect_new_matches(force=True)
+
+        log_message("INFO", f"Watching {self.raw_dir} every {self.poll_interval}s"
+                            + (f" and match results every {self.results_poll_interval}s" if self.match_source else ""))
+        try:
+            while True:
+                self.poll_once()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            log_message("INFO", "Watcher stopped.")